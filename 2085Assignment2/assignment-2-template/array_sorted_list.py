@@ -3,17 +3,26 @@
     Items to store should be of time ListItem.
 """
 
+from __future__ import annotations
 from referential_array import ArrayR
 from sorted_list import *
-from typing import TypeVar, Generic
+from typing import TypeVar, Generic, Iterator
 T = TypeVar('T')
 
 __author__ = 'Maria Garcia de la Banda and Brendon Taylor. Modified by Alexey Ignatiev and Graeme Gange'
 __docformat__ = 'reStructuredText'
 
 class ArraySortedList(SortedList[T]):
-    """ SortedList ADT implemented with arrays. """
+    """ SortedList ADT implemented with arrays.
+
+    The array is always kept in increasing order of keys. The order attribute is the orientation in
+    which the list is indexed: when it is "decreasing", index 0 is the last element of the array.
+    Reversing the list only flips this flag.
+    """
     MIN_CAPACITY = 1
+    # up to this many items with tied keys, from_items replays add() on a Python list, which is cheaper
+    # than its O(n log n) bookkeeping for a team of a few pokemons
+    REPLAY_LIMIT = 16
 
     def __init__(self, max_capacity: int) -> None:
         """ ArraySortedList object initialiser. """
@@ -26,28 +35,124 @@ class ArraySortedList(SortedList[T]):
         self.array = ArrayR(size)
         self.order = "increasing"
 
+    @classmethod
+    def from_items(cls, items: list[ListItem], order: str = "increasing") -> ArraySortedList:
+        """ Creates a list holding the items, in the same positions as adding them one by one to an
+            increasing list would, and indexed in the given order, in O(n log n).
+            Among equal keys, add() places an item at the first position of their run that its binary
+            search probes. That probe only depends on how many items were added before it, and how many
+            of them have a smaller or the same key, so the offset in the run of every item is found
+            without building the list. The rank of every item in its run then follows from the offsets,
+            and the items are sorted once by key and rank.
+        """
+        keys = sorted({item.key for item in items})
+        if len(keys) == len(items):
+            return cls._from_ordered(sorted(items, key=lambda item: item.key), order)
+        if len(items) <= cls.REPLAY_LIMIT:
+            ordered = []
+            for item in items:
+                ordered.insert(_index_for_key(ordered, len(ordered), item.key), item)
+            return cls._from_ordered(ordered, order)
+
+        key_index = {key: index for index, key in enumerate(keys)}
+        key_counts = _FenwickTree(len(keys))    # number of items added so far with each key
+        run_offsets = [[] for _ in keys]        # offset in the run of its key where add() puts each item
+        added_to_run = []                       # (index of the key, number of items added to its run before) of each item
+        for added, item in enumerate(items):
+            index = key_index[item.key]
+            smaller = key_counts.prefix_sum(index)
+            added_to_run.append((index, len(run_offsets[index])))
+            run_offsets[index].append(_run_offset(added, smaller, key_counts.prefix_sum(index + 1) - smaller))
+            key_counts.add(index, 1)
+
+        run_ranks = [_run_ranks(offsets) for offsets in run_offsets]
+        ranks = [run_ranks[index][position] for index, position in added_to_run]
+        return cls._from_ordered([items[i] for i in sorted(range(len(items)), key=lambda i: (items[i].key, ranks[i]))], order)
+
+    @classmethod
+    def _from_ordered(cls, ordered: list[ListItem], order: str) -> ArraySortedList:
+        """ Creates a list holding the items of ordered, already in increasing order, with one block copy. """
+        sorted_list = cls(len(ordered))
+        sorted_list.array.copy_block(0, ordered, 0, len(ordered))
+        sorted_list.length = len(ordered)
+        sorted_list.order = order
+        return sorted_list
+
+    @classmethod
+    def merge(cls, first: ArraySortedList, second: ArraySortedList) -> ArraySortedList:
+        """ Creates a list holding the items of both lists in linear time, indexed in the order of
+            first. Among equal keys, the items of first are kept in front of those of second in the
+            increasing order.
+        """
+        merged = cls(len(first) + len(second))
+        i = j = 0
+        while i < len(first) or j < len(second):
+            if j == len(second) or (i < len(first) and first.array[i].key <= second.array[j].key):
+                merged.array[i + j] = first.array[i]
+                i += 1
+            else:
+                merged.array[i + j] = second.array[j]
+                j += 1
+        merged.length = i + j
+        merged.order = first.order
+        return merged
+
     def reset(self):
         """ Reset the list. """
         SortedList.__init__(self)
 
+    def reset_from(self, items: list[ListItem], order: str = "increasing") -> None:
+        """ Empties the list, then holds the items, given in index order for the given order, and is
+            indexed in that order. The list only grows if the items do not fit.
+        :raises ValueError: if the items are not sorted for the order
+        :complexity: O(n) where n is the number of items
+        """
+        ordered = items if order == "increasing" else items[::-1]
+        if any(ordered[i].key > ordered[i + 1].key for i in range(len(ordered) - 1)):
+            raise ValueError('Items should be given in sorted order')
+        if len(ordered) > len(self.array):
+            self.array.release()
+            self.array = ArrayR(len(ordered))
+        self.array.copy_block(0, ordered, 0, len(ordered))
+        self.length = len(ordered)
+        self.order = order
+
+    def _position(self, index: int) -> int:
+        """ Position in the array of the element at a given index of the list. """
+        if self.order == "increasing":
+            return index
+        return self.length - 1 - index
+
     def __getitem__(self, index: int) -> ListItem:
         """ Magic method. Return the element at a given position. """
-        return self.array[index]
+        if self.order == "increasing":
+            return self.array[index]
+        return self.array[self.length - 1 - index]
+
+    def __iter__(self) -> Iterator[ListItem]:
+        """ Iterates over the elements from index 0 onwards, without changing the list.
+        :pre: the list does not change during the iteration
+        """
+        array = self.array
+        positions = range(self.length) if self.order == "increasing" else range(self.length - 1, -1, -1)
+        for position in positions:
+            yield array[position]
 
     def __setitem__(self, index: int, item: T) -> None:
         """ Magic method. Insert the item at a given position,
             if possible (!). Shift the following elements to the right.
         """
-        if self.is_empty() or \
-                (index == 0 and item.key <= self[index].key) or \
-                (index == len(self) and self[index - 1].key <= item.key) or \
-                (index > 0 and self[index - 1].key <= item.key <= self[index].key):
+        # the position in the array in front of which the item goes
+        position = index if self.order == "increasing" else len(self) - index
+        if 0 <= position <= len(self) and \
+                (position == 0 or self.array[position - 1].key <= item.key) and \
+                (position == len(self) or item.key <= self.array[position].key):
 
             if self.is_full():
                 self._resize()
 
-            self._shuffle_right(index)
-            self.array[index] = item
+            self._shuffle_right(position)
+            self.array[position] = item
         else:
             # the list isn't empty and the item's position is wrong wrt. its neighbourghs
             raise IndexError('Element should be inserted in sorted order')
@@ -60,23 +165,21 @@ class ArraySortedList(SortedList[T]):
         return False
 
     def _shuffle_right(self, index: int) -> None:
-        """ Shuffle items to the right up to a given position. """
-        for i in range(len(self), index, -1):
-            self.array[i] = self.array[i - 1]
+        """ Shuffle items to the right up to a given position, as one block move. """
+        self.array.move_block(index + 1, index, len(self) - index)
 
     def _shuffle_left(self, index: int) -> None:
-        """ Shuffle items starting at a given position to the left. """
-        for i in range(index, len(self)):
-            self.array[i] = self.array[i + 1]
+        """ Shuffle items starting at a given position to the left, as one block move. """
+        self.array.move_block(index, index + 1, len(self) - index)
 
     def _resize(self) -> None:
         """ Resize the list. """
         # doubling the size of our list
         new_array = ArrayR(2 * len(self.array))
 
-        # copying the contents
-        for i in range(self.length):
-            new_array[i] = self.array[i]
+        # copying the contents in one block
+        new_array.copy_block(0, self.array, 0, self.length)
+        self.array.release()
 
         # referring to the new array
         self.array = new_array
@@ -85,16 +188,17 @@ class ArraySortedList(SortedList[T]):
         """ Delete item at a given position. """
         if index >= len(self):
             raise IndexError('No such index in the list')
-        item = self.array[index]
+        position = self._position(index)
+        item = self.array[position]
         self.length -= 1
-        self._shuffle_left(index)
+        self._shuffle_left(position)
         return item
 
     def index(self, item: ListItem) -> int:
         """ Find the position of a given item in the list. """
         pos = self._index_to_add(item)
-        if pos < len(self) and self[pos] == item:
-            return pos
+        if pos < len(self) and self.array[pos] == item:
+            return self._position(pos)
         raise ValueError('item not in list')
 
     def is_full(self):
@@ -105,95 +209,138 @@ class ArraySortedList(SortedList[T]):
         """ Add new element to the list. """
         if self.is_full():
             self._resize()
-        
+
         if self.order == "decreasing":
-            self.increasing_order()
             self.add_pokemon_decreasing(item)
-        
+
         else:
             # find where to place it
             position = self._index_to_add(item)
 
-            self[position] = item
+            self._shuffle_right(position)
+            self.array[position] = item
             self.length += 1
 
-        if self.order == "decreasing":
-            self.decreasing_order()
-
     def _index_to_add(self, item: ListItem) -> int:
         """ Find the position where the new item should be placed. """
+        return _index_for_key(self.array, len(self), item.key)
 
+    def add_pokemon_decreasing(self, pokemon: ListItem):
+        """ Add a pokemon to the list when it is in decreasing order. It is placed in the array after the
+        elements with the same key, so it is retrieved before them.
+        """
+        # binary search of the first element with a larger key
         low = 0
-        high = len(self) - 1
-
-        while low <= high:
+        high = len(self)
+        while low < high:
             mid = (low + high) // 2
-            if self[mid].key < item.key:
+            if self.array[mid].key <= pokemon.key:
                 low = mid + 1
-            elif self[mid].key > item.key:
-                high = mid - 1
             else:
-                return mid
+                high = mid
 
-        return low
-
-    def add_pokemon_decreasing(self, pokemon: ListItem):
-        """ Add a pokemon to the list when it is in decreasing order"""
-        index = -1
-        for i in range(len(self) - 1, -1, -1):
-            if pokemon.key >= self.array[i].key:
-                index = i
-                break
-        if index == -1 and len(self) == 0:
-            self._shuffle_right(0)
-            self.array[0] = pokemon
-            self.length += 1
+        self._shuffle_right(low)
+        self.array[low] = pokemon
+        self.length += 1
 
-        elif index == -1 and len(self) == 1:
-            self._shuffle_right(0)
-            self.array[0] = pokemon
-            self.length += 1
-        else:
-            self._shuffle_right(index)
-            self.array[index + 1] = pokemon
-            self.length += 1
-    
     def reverse_order(self):
         """ Reverses the current order of the sorted array list"""
         if self.order == "increasing":
             self.order = "decreasing"
-            self.decreasing_order()
         elif self.order == "decreasing":
             self.order = "increasing"
-            self.increasing_order()
 
     def increasing_order(self):
         """Makes sorted list ascending order"""
-        n = len(self)
-        for j in range(n - 1, 0, -1):
-            swapped = False
-            for i in range(j):
-                if self[i].key >= self[i + 1].key:
-                    self.swap(i, i + 1)
-                    swapped = True
-            if not swapped:
-                break
+        self.order = "increasing"
 
     def decreasing_order(self):
         """Makes sorted list descending order"""
-        n = len(self)
-        for j in range(n - 1, 0, -1):
-            swapped = False
-            for i in range(j):
-                if self[i].key <= self[i + 1].key:
-                    self.swap(i, i + 1)
-                    swapped = True
-            if not swapped:
-                break
+        self.order = "decreasing"
+
+
+def _index_for_key(array, length: int, key) -> int:
+    """ Binary search of the position for key in the first length items of array, sorted by increasing key.
+        Returns the position of an item with the same key if there is one.
+    """
+    low = 0
+    high = length - 1
+
+    while low <= high:
+        mid = (low + high) // 2
+        if array[mid].key < key:
+            low = mid + 1
+        elif array[mid].key > key:
+            high = mid - 1
+        else:
+            return mid
 
-    def swap(self, i, j):
-        """ Swaps two adjacent elements"""
-        self.array[i], self.array[j] = self.array[j], self.array[i]
+    return low
 
 
+def _run_offset(length: int, smaller: int, equal: int) -> int:
+    """ Replays the binary search of _index_for_key in a list of length items, of which smaller have a
+        smaller key and the next equal have the same key, and returns the position it finds minus smaller.
+        The search only compares keys, so it is replayed on positions alone.
+    """
+    low = 0
+    high = length - 1
 
+    while low <= high:
+        mid = (low + high) // 2
+        if mid < smaller:
+            low = mid + 1
+        elif mid >= smaller + equal:
+            high = mid - 1
+        else:
+            return mid - smaller
+
+    return low - smaller
+
+
+def _run_ranks(offsets: list[int]) -> list[int]:
+    """ Final positions of items inserted one after the other into a list, item i at position offsets[i].
+        Going backwards, item i gets the free position with offsets[i] free positions before it, as the
+        items inserted later than it are the ones in front of it that were not there yet.
+    """
+    free = _FenwickTree(len(offsets), 1)
+    ranks = [0] * len(offsets)
+    for i in range(len(offsets) - 1, -1, -1):
+        ranks[i] = free.find(offsets[i])
+        free.add(ranks[i], -1)
+    return ranks
+
+
+class _FenwickTree:
+    """ Binary indexed tree of counts, with prefix sums and search by prefix sum in O(log n) """
+
+    def __init__(self, size: int, count: int = 0) -> None:
+        """ Tree of size positions that all hold count """
+        # node i sums the counts of the i & -i positions up to position i - 1
+        self.tree = [count * (i & -i) for i in range(size + 1)]
+
+    def add(self, position: int, delta: int) -> None:
+        """ Adds delta to the count at position """
+        position += 1
+        while position < len(self.tree):
+            self.tree[position] += delta
+            position += position & -position
+
+    def prefix_sum(self, end: int) -> int:
+        """ Sum of the counts before position end """
+        total = 0
+        while end > 0:
+            total += self.tree[end]
+            end -= end & -end
+        return total
+
+    def find(self, count: int) -> int:
+        """ The first position whose prefix sum, itself included, is larger than count """
+        position = 0
+        step = 1 << (len(self.tree) - 1).bit_length()
+        while step:
+            if position + step < len(self.tree) and self.tree[position + step] <= count:
+                position += step
+                count -= self.tree[position]
+            step >>= 1
+        return position
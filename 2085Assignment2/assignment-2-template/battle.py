@@ -7,40 +7,182 @@ until at least one of the teams become empty.
 
 __author__ = "Scaffold by Jackson Goerner, Code by Rachit Bhatia"
 
+import time
+from enum import Enum, auto
 from pokemon_base import PokemonBase
 from random_gen import RandomGen
 from poke_team import Action, PokeTeam, Criterion
 from print_screen import print_game_screen
-from linked_list import LinkedList
+
+# position of each action in the precedence list ATTACK, HEAL, SPECIAL, SWAP.
+# The action further along the list is executed first.
+ACTION_RANK = {
+    Action.ATTACK: 0,
+    Action.HEAL: 1,
+    Action.SPECIAL: 2,
+    Action.SWAP: 3,
+}
+
+def _precedence(action1: Action, action2: Action) -> int:
+    """ Precedence result of two actions: 0 if they are the same, 1 if action1 goes first, 2 if action2 goes first. """
+    if ACTION_RANK[action1] == ACTION_RANK[action2]:
+        return 0
+    elif ACTION_RANK[action1] > ACTION_RANK[action2]:
+        return 1
+    return 2
+
+# 4x4 lookup table built once at import, ACTION_PRECEDENCE[action1][action2] is the precedence result
+ACTION_PRECEDENCE = {action1: {action2: _precedence(action1, action2) for action2 in Action} for action1 in Action}
+
+class LimitPolicy(Enum):
+    """ Result of a battle that is ended early by the turn cap, the time budget or the stall detection of Battle """
+    DRAW = auto()   #the battle is a draw
+    HP = auto()     #the team with more remaining total hp wins, a draw if both have the same
+
+class BattleStats:
+    """ Statistics of a single battle, collected when the Battle is created with collect_stats=True.
+    Index 0 of the per team attributes is team 1 and index 1 is team 2.
+    """
+
+    def __init__(self) -> None:
+        """ Initialises the statistics of a battle that has not started yet
+        :complexity: Best case = Worst case = O(1)
+        """
+        self.result = None      #the winner result (integer 0,1,2) once the battle is over
+        self.turns = 0          #number of turns played
+        self.choices = [[], []]     #action chosen by each team on every turn
+        self.actions = [dict.fromkeys(Action, 0), dict.fromkeys(Action, 0)]    #number of times each team chose each action, counted at the end
+        self.faints = [0, 0]        #number of pokemons of each team that fainted
+        self.evolutions = [0, 0]    #number of pokemons of each team that evolved
+        self.elapsed = 0.0      #wall-clock seconds taken by the battle
+        self.ended_early = None     #"turns", "time" or "stall" if the battle was ended early, None otherwise
+
+    def finish(self, result: int) -> None:
+        """ Records the winner result and counts the actions chosen by each team
+        :complexity: Best case = Worst case = O(T) where T is the number of turns played
+        """
+        self.result = result
+        self.turns = len(self.choices[0])
+        for team in range(2):
+            for action in Action:
+                self.actions[team][action] = self.choices[team].count(action)
+
+    def swaps(self, team: int) -> int:
+        """ Number of SWAP actions chosen by team 1 (team=0) or team 2 (team=1) """
+        return self.actions[team][Action.SWAP]
+
+    def specials(self, team: int) -> int:
+        """ Number of SPECIAL actions chosen by team 1 (team=0) or team 2 (team=1) """
+        return self.actions[team][Action.SPECIAL]
+
+    def heals(self, team: int) -> int:
+        """ Number of HEAL actions chosen by team 1 (team=0) or team 2 (team=1) """
+        return self.actions[team][Action.HEAL]
+
+    def __str__(self) -> str:
+        """ One line summary of the battle
+        :complexity: Best case = Worst case = O(1)
+        """
+        actions = ["/".join(f"{action.name}={count}" for action, count in team_actions.items()) for team_actions in self.actions]
+        return (f"result={self.result} turns={self.turns} actions={actions[0]}|{actions[1]} "
+                f"faints={self.faints[0]}|{self.faints[1]} evolutions={self.evolutions[0]}|{self.evolutions[1]} "
+                f"elapsed={self.elapsed:.6f}s ended_early={self.ended_early}")
+
 
 class Battle:
     
-    def __init__(self, verbosity=0) -> None:
-        pass
+    def __init__(self, verbosity=0, collect_stats: bool = False, max_turns: int | None = None, max_seconds: float | None = None,
+                 stall_turns: int | None = None, limit_policy: LimitPolicy = LimitPolicy.DRAW) -> None:
+        """ Sets up the handler of each action. Subclasses can override the handler methods to change
+        how an action is carried out.
+        :param collect_stats: if True, every battle records a BattleStats in self.last_stats. It is off by
+                              default, so battles only pay for one check per turn.
+        :param max_turns: if given, a battle that has played this many turns and is not over is ended early
+        :param max_seconds: if given, a battle that has taken this many seconds and is not over is ended early
+        :param stall_turns: if given, a battle is ended early once this many turns in a row have not changed
+                            the total hp of either team. With the standard rules both pokemons lose 1 hp every
+                            turn they survive, so only healing back to full hp turn after turn, or rules changed
+                            by a subclass, can stall a battle.
+        :param limit_policy: the result of a battle that is ended early
+        :raises ValueError: if max_turns, max_seconds or stall_turns is given and not positive
+        :complexity: Best case = Worst case = O(1)
+        """
+        for name, limit in (("max_turns", max_turns), ("max_seconds", max_seconds), ("stall_turns", stall_turns)):
+            if limit is not None and limit <= 0:
+                raise ValueError(f"{name} must be positive.")
+        self.collect_stats = collect_stats
+        self.max_turns = max_turns
+        self.max_seconds = max_seconds
+        self.stall_turns = stall_turns
+        self.limit_policy = limit_policy
+        self.last_stats = None
+        self.action_handlers = {
+            Action.ATTACK: self.attack_action,
+            Action.SWAP: self.swap_action,
+            Action.SPECIAL: self.special_action,
+            Action.HEAL: self.heal_action,
+        }
+
+    def attack_action(self, team: PokeTeam, pokemon: PokemonBase, other_pokemon: PokemonBase) -> PokemonBase:
+        """ Attack action for a team: its pokemon attacks the other team's pokemon.
+        :complexity: Best case = Worst case = O(1)
+        :return: the team's pokemon on the field
+        """
+        pokemon.attack(other_pokemon)
+        return pokemon
+
+    def swap_action(self, team: PokeTeam, pokemon: PokemonBase, other_pokemon: PokemonBase) -> PokemonBase:
+        """ Swap action for a team: return its pokemon, then retrieve a pokemon.
+        :complexity: Best case = Worst case = O(R) where R is the complexity of returning and retrieving a pokemon
+        :return: the team's pokemon on the field
+        """
+        team.return_pokemon(pokemon)
+        return team.retrieve_pokemon()
+
+    def special_action(self, team: PokeTeam, pokemon: PokemonBase, other_pokemon: PokemonBase) -> PokemonBase:
+        """ Special action for a team: return its pokemon, call the team's special method, then retrieve a new pokemon.
+        :complexity: Best case = Worst case = O(R + S) where S is the complexity of the team's special method
+        :return: the team's pokemon on the field
+        """
+        team.return_pokemon(pokemon)
+        team.special()
+        return team.retrieve_pokemon()
+
+    def heal_action(self, team: PokeTeam, pokemon: PokemonBase, other_pokemon: PokemonBase) -> PokemonBase | None:
+        """ Heal action for a team: heal its pokemon and reduce the team's number of heals by 1.
+        :complexity: Best case = Worst case = O(1)
+        :return: the team's pokemon on the field, or None without healing if the team has used their max number of heals (3)
+        """
+        if team.num_of_heals == 0:
+            return None
+        pokemon.heal()
+        team.num_of_heals -= 1    #reduce by 1 to account for total heals used by the team
+        return pokemon
 
     def check_action_precedence(self, action1: Action, action2: Action) -> int:
         """ Compares the actions of both teams and checks the precedence order of their actions.
         
-        :param team1: the first poketeam's action
-        :param team2: the second poketeam' action
-        :complexity: Best case = Worst case = O(I) where I is the complexity of getting the index of an item in an LinkedList
+        :param action1: the first poketeam's action
+        :param action2: the second poketeam' action
+        :complexity: Best case = Worst case = O(1), a lookup in the precomputed ACTION_PRECEDENCE table
         :return: an integer which represents the order in which the team actions are executed (integer 0,1,2)
         """
+        return ACTION_PRECEDENCE[action1][action2]
 
-        #arranging the 4 actions in a linked list in the required order of precedence
-        action_list = LinkedList()
-        action_list.insert(0, Action.SWAP)      #SWAP set at head - order of linked list: SWAP
-        action_list.insert(0, Action.SPECIAL)   #SPECIAL set at head - order of linked list: SPECIAL, SWAP
-        action_list.insert(0, Action.HEAL)      #HEAL set at head - order of linked list: HEAL, SPECIAL, SWAP
-        action_list.insert(0, Action.ATTACK)    #ATTACK set at head - order of linked list: ATTACK, HEAL, SPECIAL, SWAP
-
-        #checking the precedence based on the index of the actions stored in the linked list
-        if action_list.index(action1) == action_list.index(action2):
-            return 0
-        elif action_list.index(action1) > action_list.index(action2):
-            return 1
-        elif action_list.index(action1) < action_list.index(action2):
-            return 2
+    def check_action_precedences(self, actions1: list[Action], actions2: list[Action]) -> list[int]:
+        """ Batched version of check_action_precedence for arrays of action pairs.
+
+        :param actions1: the first poketeams' actions
+        :param actions2: the second poketeams' actions, paired by position with actions1
+        :pre: actions1 and actions2 have the same length
+        :raises ValueError: if actions1 and actions2 have different lengths
+        :complexity: Best case = Worst case = O(n) where n is the number of action pairs
+        :return: the precedence result of each pair, in the same order as the inputs
+        """
+        if len(actions1) != len(actions2):
+            raise ValueError("Both action lists must have the same length.")
+        table = ACTION_PRECEDENCE
+        return [table[action1][action2] for action1, action2 in zip(actions1, actions2)]
 
 
     def battle(self, team1: PokeTeam, team2: PokeTeam) -> int:
@@ -54,6 +196,21 @@ class Battle:
         :return: the winner result (integer 0,1,2)
         """
 
+        #statistics of this battle, None unless they are collected
+        stats = None
+        if self.collect_stats:
+            stats = BattleStats()
+            self.last_stats = stats
+
+        #the turn cap, time budget and stall detection are only checked if one of them is set
+        limited = self.max_turns is not None or self.max_seconds is not None or self.stall_turns is not None
+        ended_early = None  #"turns", "time" or "stall" once the battle is ended early
+        turns = 0
+        stalled_turns = 0
+        last_total_hp = None
+        if stats is not None or self.max_seconds is not None:
+            start = time.perf_counter()
+
         #initialising boolean values to see if a team used their max number of heals
         team1_used_max_heal = False
         team2_used_max_heal = False
@@ -75,6 +232,24 @@ class Battle:
         #while loop to manage the whole battle behaviour
         while ((not team1.is_empty()) and (not team2.is_empty())) or both_alive or one_alive:
 
+            #ending the battle early, before the next turn, if it has reached one of the limits
+            if limited:
+                if self.stall_turns is not None:
+                    total_hp = self.total_hp(team1, pokemon1) + self.total_hp(team2, pokemon2)
+                    stalled_turns = stalled_turns + 1 if total_hp == last_total_hp else 0
+                    last_total_hp = total_hp
+
+                if self.max_turns is not None and turns >= self.max_turns:
+                    ended_early = "turns"
+                elif self.max_seconds is not None and time.perf_counter() - start >= self.max_seconds:
+                    ended_early = "time"
+                elif self.stall_turns is not None and stalled_turns >= self.stall_turns:
+                    ended_early = "stall"
+
+                if ended_early is not None:
+                    break
+                turns += 1
+
             #resetting the variables to ensure loop behaviour is only managed by each turn's actions
             both_alive = False  
             one_alive = False   
@@ -90,150 +265,48 @@ class Battle:
             first_team_choice = team1.choose_battle_option(pokemon1, pokemon2)
             second_team_choice = team2.choose_battle_option(pokemon2, pokemon1)
 
+            if stats is not None:
+                stats.choices[0].append(first_team_choice)
+                stats.choices[1].append(second_team_choice)
+
             action_precedence_result = self.check_action_precedence(first_team_choice, second_team_choice)
 
-            #if action precedence == 0, both teams execute the same actions
-            if action_precedence_result == 0:
-                
-                if first_team_choice == Action.SWAP:
-
-                    #swap action for a team: return a pokemon, then retreive a pokemon
-                    team1.return_pokemon(pokemon1)
-                    pokemon1 = team1.retrieve_pokemon()
-                    team2.return_pokemon(pokemon2)
-                    pokemon2 = team2.retrieve_pokemon()
-
-                elif first_team_choice == Action.SPECIAL:
-
-                    #special action for a team: return a pokemon, call team's special method, then retrieve a new pokemon
-                    team1.return_pokemon(pokemon1)
-                    team1.special()
-                    pokemon1 = team1.retrieve_pokemon()
-                    team2.return_pokemon(pokemon2)
-                    team2.special()
-                    pokemon2 = team2.retrieve_pokemon()
-
-                elif first_team_choice == Action.HEAL:
-
-                    #checking if any team has used their max number of heals (3)
-                    if team1.num_of_heals == 0 and team2.num_of_heals == 0:
-                        team1_used_max_heal = True
-                        team2_used_max_heal = True 
-                        break   #break out of the loop once a team has used 3 heals because that team loses
-                    elif team1.num_of_heals == 0:
-                        team1_used_max_heal = True
-                        break
-                    elif team2.num_of_heals == 0:
-                        team2_used_max_heal = True
-                        break
-
-                    #heal action for a team: heal and then reduce the number of heals by 1
-                    pokemon1.heal()
-                    team1.num_of_heals -= 1    #reduce by 1 to account for total heals used by the team
-                    pokemon2.heal()
-                    team2.num_of_heals -= 1
-                    
-                elif first_team_choice == Action.ATTACK:
-                    self.both_attack(pokemon1, pokemon2)  #both teams attack
-               
-
-            #team 1 action is executed first due to higher action precedence
-            #hence, checking for team 1 actions before team 2
-            elif action_precedence_result == 1:
-                if first_team_choice == Action.SWAP:
-                    #swap action for a team: return a pokemon, then retreive a pokemon
-                    team1.return_pokemon(pokemon1)
-                    pokemon1 = team1.retrieve_pokemon()
-
-                elif first_team_choice == Action.SPECIAL:
-                    #special action for a team: return a pokemon, call team's special method, then retrieve a new pokemon
-                    team1.return_pokemon(pokemon1)
-                    team1.special()
-                    pokemon1 = team1.retrieve_pokemon()
-
-                elif first_team_choice == Action.HEAL:
-                    #checking if the team has used their max number of heals (3)
-                    if team1.num_of_heals == 0:
-                        team1_used_max_heal = True
-                        break  #break out of the loop once 3 heals used because team 1 loses
-
-                    pokemon1.heal()
-                    team1.num_of_heals -= 1  #reduce by 1 to account for total heals used by the team
-
-                #attack action for a single team attacking the other
-                elif first_team_choice == Action.ATTACK:
-                    pokemon1.attack(pokemon2)  #calling the attack function to make team 1's pokemon attack team 2's pokemon
-
-                #team 2 actions are checked and executed after team 1
-                if second_team_choice == Action.SWAP:
-                    team2.return_pokemon(pokemon2)
-                    pokemon2 = team2.retrieve_pokemon()
-
-                elif second_team_choice == Action.SPECIAL:
-                    team2.return_pokemon(pokemon2)
-                    team2.special()
-                    pokemon2 = team2.retrieve_pokemon()
-
-                elif second_team_choice == Action.HEAL:
-                    if team2.num_of_heals == 0:
-                        team2_used_max_heal = True
-                        break
-
-                    pokemon2.heal()
-                    team2.num_of_heals -= 1
-
-                elif second_team_choice == Action.ATTACK:
-                    pokemon2.attack(pokemon1)   #calling the attack function to make team 2's pokemon attack team 1's pokemon
-
-
-            #team 2 action is executed first due to higher action precedence
-            #hence, checking for team 2 actions before team 1
+            #if both teams attack, the faster pokemon attacks first
+            if action_precedence_result == 0 and first_team_choice == Action.ATTACK:
+                self.both_attack(pokemon1, pokemon2)
+
+            #if both teams heal, a team that has used their max number of heals (3) loses, checked before either team heals
+            elif action_precedence_result == 0 and first_team_choice == Action.HEAL:
+                team1_used_max_heal = team1.num_of_heals == 0
+                team2_used_max_heal = team2.num_of_heals == 0
+                if team1_used_max_heal or team2_used_max_heal:
+                    break   #break out of the loop, the team that used 3 heals loses
+                self.heal_action(team1, pokemon1, pokemon2)
+                self.heal_action(team2, pokemon2, pokemon1)
+
+            #otherwise the action of each team is executed by its handler, one team after the other.
+            #team 2 goes first when its action has precedence, team 1 goes first otherwise
+            #a handler returns the team's pokemon on the field, or None if the team has used their max number of heals
             elif action_precedence_result == 2:
-                if second_team_choice == Action.SWAP:
-                    team2.return_pokemon(pokemon2)
-                    pokemon2 = team2.retrieve_pokemon()
-
-                elif second_team_choice == Action.SPECIAL:
-                    team2.return_pokemon(pokemon2)
-                    team2.special()
-                    pokemon2 = team2.retrieve_pokemon()
-
-                elif second_team_choice == Action.HEAL:
-                    if team2.num_of_heals == 0:
-                        team2_used_max_heal = True
-                        break
-
-                    pokemon2.heal()
-                    team2.num_of_heals -= 1
-
-                #attack action for a single team attacking the other
-                elif second_team_choice == Action.ATTACK:
-                    pokemon2.attack(pokemon1)   #calling the attack function to make team 2's pokemon attack team 1's pokemon
-
-                #team 1 actions are checked and executed after team 2
-                if first_team_choice == Action.SWAP:
-                    team1.return_pokemon(pokemon1)
-                    pokemon1 = team1.retrieve_pokemon()
-
-
-                elif first_team_choice == Action.SPECIAL:
-                    team1.return_pokemon(pokemon1)
-                    team1.special()
-                    pokemon1 = team1.retrieve_pokemon()
-
-                elif first_team_choice == Action.HEAL:
-                    if team1.num_of_heals == 0:
-                        team1_used_max_heal = True
-                        break
-
-                    pokemon1.heal()
-                    team1.num_of_heals -= 1
-
-                elif first_team_choice == Action.ATTACK:
-                    c = pokemon2.get_hp()
-                    pokemon1.attack(pokemon2)
-                    d = pokemon2.get_hp()
-            
+                pokemon2 = self.action_handlers[second_team_choice](team2, pokemon2, pokemon1)
+                if pokemon2 is None:
+                    team2_used_max_heal = True
+                    break
+                pokemon1 = self.action_handlers[first_team_choice](team1, pokemon1, pokemon2)
+                if pokemon1 is None:
+                    team1_used_max_heal = True
+                    break
+
+            else:
+                pokemon1 = self.action_handlers[first_team_choice](team1, pokemon1, pokemon2)
+                if pokemon1 is None:
+                    team1_used_max_heal = True
+                    break
+                pokemon2 = self.action_handlers[second_team_choice](team2, pokemon2, pokemon1)
+                if pokemon2 is None:
+                    team2_used_max_heal = True
+                    break
+
             #checking level up and evolved versions after battling between the pokemons has finished for the current round
             if (not pokemon1.is_fainted()) and (not pokemon2.is_fainted()):
                 #both pokemons lose 1 hp if they are both alive
@@ -242,6 +315,10 @@ class Battle:
                 if (not pokemon1.is_fainted()) and (not pokemon2.is_fainted()):
                     both_alive = True #setting both_alive to true when both pokemons are alive so that while loop continues
 
+            if stats is not None:
+                stats.faints[0] += pokemon1.is_fainted()
+                stats.faints[1] += pokemon2.is_fainted()
+
             #behaviours for the case where team 1 pokemon faints after the current round
             if pokemon1.is_fainted() and not pokemon2.is_fainted():
                 pokemon2.level_up()     #team 2 pokemon levels up if team 1 pokemon is fainted
@@ -276,17 +353,24 @@ class Battle:
             if not pokemon1.is_fainted():
                 if pokemon1.can_evolve() and pokemon1.should_evolve():  #evolve if pokemon is evolvable and meets requirements to evolve
                     pokemon1 = pokemon1.get_evolved_version() 
+                    if stats is not None:
+                        stats.evolutions[0] += 1
 
             #checking if team 2's pokemon can evolve after the current battle round
             if not pokemon2.is_fainted():
                 if pokemon2.can_evolve() and pokemon2.should_evolve():  #evolve if pokemon is evolvable and meets requirements to evolve
                     pokemon2 = pokemon2.get_evolved_version()
+                    if stats is not None:
+                        stats.evolutions[1] += 1
             
     ####-End of While Loop-####
                 
         ####--Deciding winner of battle--####
 
-        if (team1_used_max_heal and team2_used_max_heal):
+        if ended_early is not None:
+            winner_result = self.limit_result(team1, pokemon1, team2, pokemon2)
+
+        elif (team1_used_max_heal and team2_used_max_heal):
             winner_result = 0   #if both teams have used 3 heals, result is draw
         elif (team2_used_max_heal):
             winner_result = 1   #if team 2 has used 3 heals, team 1 wins
@@ -300,8 +384,49 @@ class Battle:
         elif team1.is_empty() and not team2.is_empty():
             winner_result = 2  #if team 1 is empty, team 2 wins
 
+        if stats is not None:
+            stats.elapsed = time.perf_counter() - start
+            stats.ended_early = ended_early
+            stats.finish(winner_result)
+
         return winner_result
         
+    def total_hp(self, team: PokeTeam, pokemon: PokemonBase) -> int:
+        """ Remaining total hp of a team, counting its pokemon on the field.
+
+        :param team: the poketeam
+        :param pokemon: the team's pokemon on the field, not held by the team
+        :complexity: Best case = Worst case = O(n) where n is the number of pokemons in the team
+        :return: the sum of the hp of the team's pokemons that are not fainted
+        """
+        return sum(team_pokemon.get_hp() for team_pokemon in team) + max(pokemon.get_hp(), 0)
+
+    def limit_result(self, team1: PokeTeam, pokemon1: PokemonBase, team2: PokeTeam, pokemon2: PokemonBase) -> int:
+        """ Decides the winner of a battle that is ended early, following self.limit_policy.
+        The pokemons on the field that are not fainted are returned to their teams.
+
+        :param team1: the first poketeam battling
+        :param pokemon1: team 1's pokemon on the field
+        :param team2: the second poketeam battling
+        :param pokemon2: team 2's pokemon on the field
+        :complexity: Best case = Worst case = O(n) where n is the number of pokemons in both teams
+        :return: the winner result (integer 0,1,2)
+        """
+        team1_hp = self.total_hp(team1, pokemon1)
+        team2_hp = self.total_hp(team2, pokemon2)
+
+        #fainted pokemons were already returned at the end of the turn they fainted
+        if not pokemon1.is_fainted():
+            team1.return_pokemon(pokemon1)
+        if not pokemon2.is_fainted():
+            team2.return_pokemon(pokemon2)
+
+        if self.limit_policy == LimitPolicy.HP and team1_hp > team2_hp:
+            return 1
+        elif self.limit_policy == LimitPolicy.HP and team2_hp > team1_hp:
+            return 2
+        return 0
+
     def both_attack(self, first_pokemon: PokemonBase, second_pokemon: PokemonBase):
         """  Defines the behaviour when both teams attack each other (both teams choose ATTACK action).
 
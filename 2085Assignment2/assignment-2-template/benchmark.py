@@ -0,0 +1,603 @@
+"""
+Micro-benchmarks for the hot paths of the battle simulation.
+
+Run every benchmark with `python benchmark.py`, or only some of them by name,
+e.g. `python benchmark.py turns`.
+"""
+__author__ = "Code by Jun Yu Tan, Shyam Kamalesh Borkar, Rachit Bhatia and Jobin Dan"
+
+import os
+from array import array
+import subprocess
+import sys
+import tempfile
+import time
+
+from battle import Battle
+from bset import BSet
+from leaderboard import LEADERBOARD_SEED, leaderboard
+from matchup import MAX_BATTLES, estimate_matchup
+from matchup_matrix import MatchupMatrix, build_matrix
+from poke_team import Action, Criterion, PokeTeam
+from pokemon import Bulbasaur, Charmander, Eevee, Gastly, Squirtle
+from pokemon_base import StatusEffect
+from array_sorted_list import ArraySortedList
+from sorted_list import ListItem
+from referential_array import ArrayR
+from queue_adt import CircularQueue, PairedCircularQueue
+from random_gen import RandomGen
+import team_store
+from team_store import BatchBattle
+from tournament import Tournament
+
+ROUNDS = 5
+
+
+def best_of(run, rounds: int = ROUNDS) -> float:
+    """ Calls run, which returns the seconds taken by its timed part, and keeps the fastest round """
+    return min(run() for _ in range(rounds))
+
+
+def leaderboard_teams(num_teams: int = 1000) -> list[PokeTeam]:
+    """ Generates the same challenger teams as leaderboard.leaderboard() """
+    RandomGen.set_seed(LEADERBOARD_SEED)
+    return [
+        PokeTeam.random_team(f"Team {x}", RandomGen.randint(0, 2), criterion=Criterion(RandomGen.randint(1, len(Criterion))))
+        for x in range(num_teams)
+    ]
+
+
+def benchmark_team() -> PokeTeam:
+    """ Stand-in for PokeTeam.leaderboard_team(), which has not been chosen yet """
+    return PokeTeam("Leaderboard", [1, 1, 1, 1, 1], 0, PokeTeam.AI.SWAP_ON_SUPER_EFFECTIVE)
+
+
+class CountingBattle(Battle):
+    """ Battle that counts the number of turns played, one precedence check is made per turn """
+
+    def __init__(self, verbosity=0) -> None:
+        Battle.__init__(self, verbosity)
+        self.turns = 0
+
+    def check_action_precedence(self, action1, action2) -> int:
+        self.turns += 1
+        return Battle.check_action_precedence(self, action1, action2)
+
+
+def play_leaderboard(b: Battle, team: PokeTeam, teams: list[PokeTeam]) -> float:
+    """ Plays team against every team in teams and returns the elapsed seconds """
+    RandomGen.set_seed(LEADERBOARD_SEED)
+    start = time.perf_counter()
+    for challenger in teams:
+        b.battle(team, challenger)
+        team.regenerate_team()
+        challenger.regenerate_team()
+    return time.perf_counter() - start
+
+
+def bench_turns(num_teams: int = 1000) -> str:
+    """ Turns per second when playing the leaderboard workload """
+    teams = leaderboard_teams(num_teams)
+    team = benchmark_team()
+    counter = CountingBattle()
+    play_leaderboard(counter, team, teams)
+    # time the real Battle separately so the counting overhead is not measured
+    elapsed = best_of(lambda: play_leaderboard(Battle(), team, teams))
+    return f"{counter.turns} turns in {elapsed:.3f}s, {counter.turns / elapsed:,.0f} turns/s"
+
+
+def bench_battle_stats(num_teams: int = 1000) -> str:
+    """ Overhead of collect_stats on the leaderboard workload, and the longest battle it records """
+    teams = leaderboard_teams(num_teams)
+    team = benchmark_team()
+    plain = best_of(lambda: play_leaderboard(Battle(), team, teams))
+    collected = best_of(lambda: play_leaderboard(Battle(collect_stats=True), team, teams))
+
+    # replay the workload keeping the stats of every battle
+    b = Battle(collect_stats=True)
+    longest = None
+    RandomGen.set_seed(LEADERBOARD_SEED)
+    for challenger in teams:
+        b.battle(team, challenger)
+        if longest is None or b.last_stats.turns > longest[0].turns:
+            longest = (b.last_stats, challenger.team_numbers, challenger.battle_mode)
+        team.regenerate_team()
+        challenger.regenerate_team()
+    stats, team_numbers, battle_mode = longest
+    return (f"{100 * (collected / plain - 1):+.1f}% with stats, longest battle {stats.turns} turns "
+            f"against {team_numbers} in mode {battle_mode}")
+
+
+def bench_matchup(battles: int = 2000) -> str:
+    """ Battles per second of estimate_matchup, and the number it needs for a 2% margin """
+    spec1 = ([1, 1, 1, 1, 1], 0, PokeTeam.AI.SWAP_ON_SUPER_EFFECTIVE, None)
+    spec2 = ([0, 2, 2, 0, 2], 2, PokeTeam.AI.RANDOM, Criterion.HP)
+
+    def run() -> float:
+        start = time.perf_counter()
+        estimate_matchup(spec1, spec2, battles=battles)
+        return time.perf_counter() - start
+
+    elapsed = best_of(run)
+    needed = estimate_matchup(spec1, spec2, battles=MAX_BATTLES, margin=0.02).played()
+    return f"{battles / elapsed:,.0f} battles/s, {needed} battles for a 2% margin"
+
+
+def bench_matrix(repeats: int = 100000, battles: int = 20) -> str:
+    """ Cost of a MatchupMatrix lookup against simulating the pair """
+    specs = [([2 if species == i else 0 for species in range(5)], 0, PokeTeam.AI.ALWAYS_ATTACK, None) for i in range(5)]
+    with tempfile.TemporaryDirectory() as directory:
+        build_matrix(specs, directory, battles=battles)
+        matrix = MatchupMatrix(directory)
+
+        def run() -> float:
+            start = time.perf_counter()
+            for _ in range(repeats // len(specs)):
+                for spec in specs:
+                    matrix.lookup(specs[0], spec)
+            return time.perf_counter() - start
+
+        lookup = best_of(run) / repeats
+        matrix.close()
+
+    def run_simulation() -> float:
+        start = time.perf_counter()
+        estimate_matchup(specs[0], specs[1], battles=battles)
+        return time.perf_counter() - start
+
+    simulate = best_of(run_simulation)
+    return f"{1e9 * lookup:.0f} ns per lookup, {1e6 * simulate:.0f} us to simulate {battles} battles"
+
+
+def bench_precedence(repeats: int = 200000) -> str:
+    """ Cost of a single precedence check """
+    b = Battle()
+    actions = [(a1, a2) for a1 in Action for a2 in Action]
+
+    def run() -> float:
+        start = time.perf_counter()
+        for _ in range(repeats // len(actions)):
+            for a1, a2 in actions:
+                b.check_action_precedence(a1, a2)
+        return time.perf_counter() - start
+
+    return f"{1e9 * best_of(run) / repeats:.0f} ns per check"
+
+
+def bench_effectiveness(repeats: int = 200000) -> str:
+    """ Cost of PokemonBase.get_effective_multiplier """
+    pokemon = [Charmander(), Bulbasaur(), Squirtle(), Gastly(), Eevee()]
+    pairs = [(attacker, defender) for attacker in pokemon for defender in pokemon]
+
+    def run() -> float:
+        start = time.perf_counter()
+        for _ in range(repeats // len(pairs)):
+            for attacker, defender in pairs:
+                attacker.get_effective_multiplier(defender)
+        return time.perf_counter() - start
+
+    return f"{1e9 * best_of(run) / repeats:.0f} ns per multiplier"
+
+
+def bench_attack_turn(repeats: int = 20000) -> str:
+    """ Cost of one both_attack turn between pokemon with random status effects """
+    b = Battle()
+    statuses = list(StatusEffect)
+    species = [Charmander, Bulbasaur, Squirtle, Gastly, Eevee]
+
+    def run() -> float:
+        RandomGen.set_seed(LEADERBOARD_SEED)
+        pairs = []
+        for _ in range(repeats):
+            pair = [species[RandomGen.randint(0, len(species) - 1)]() for _ in range(2)]
+            for pokemon in pair:
+                pokemon.set_status_effect(statuses[RandomGen.randint(0, len(statuses) - 1)])
+            pairs.append(pair)
+        start = time.perf_counter()
+        for first, second in pairs:
+            b.both_attack(first, second)
+        return time.perf_counter() - start
+
+    return f"{1e9 * best_of(run) / repeats:.0f} ns per turn"
+
+
+def bench_stats(repeats: int = 100000) -> str:
+    """ Cost of the stat reads of one attack: the speeds of both pokemon, the attack damage and the defend rule """
+    first, second = Charmander(), Squirtle()
+    first.set_status_effect(StatusEffect.BURN)
+
+    def run() -> float:
+        start = time.perf_counter()
+        for _ in range(repeats):
+            first.get_speed()
+            second.get_speed()
+            second.defend(int(first.get_attack_damage()))
+        return time.perf_counter() - start
+
+    return f"{1e9 * best_of(run) / repeats:.0f} ns per attack"
+
+
+def bench_construct(repeats: int = 100000) -> str:
+    """ Cost of creating a pokemon """
+    species = [Charmander, Bulbasaur, Squirtle, Gastly, Eevee]
+
+    def run() -> float:
+        start = time.perf_counter()
+        for _ in range(repeats // len(species)):
+            for kind in species:
+                kind()
+        return time.perf_counter() - start
+
+    return f"{1e9 * best_of(run) / repeats:.0f} ns per pokemon"
+
+
+def bench_regenerate(num_teams: int = 1000) -> str:
+    """ Cost of PokeTeam.regenerate_team on the leaderboard challenger teams """
+    teams = leaderboard_teams(num_teams)
+
+    def run() -> float:
+        start = time.perf_counter()
+        for team in teams:
+            team.regenerate_team()
+        return time.perf_counter() - start
+
+    return f"{1e6 * best_of(run) / num_teams:.1f} us per team"
+
+
+def bench_batch(num_matches: int = 2000) -> str:
+    """ Matches per second of BatchBattle, with the NumPy column kernel and one match at a time, against
+    Battle.battle on ALWAYS_ATTACK teams
+    """
+    RandomGen.set_seed(LEADERBOARD_SEED)
+    pairs = [[PokeTeam.random_team("Team", RandomGen.randint(0, 2), ai_mode=PokeTeam.AI.ALWAYS_ATTACK,
+                                   criterion=Criterion(RandomGen.randint(1, len(Criterion)))) for _ in range(2)]
+             for _ in range(num_matches)]
+
+    def run_scalar() -> float:
+        for pair in pairs:
+            for team in pair:
+                team.regenerate_team()
+        RandomGen.set_seed(LEADERBOARD_SEED)
+        start = time.perf_counter()
+        for team1, team2 in pairs:
+            Battle().battle(team1, team2)
+        return time.perf_counter() - start
+
+    def run_batch(use_numpy: bool) -> float:
+        RandomGen.set_seed(LEADERBOARD_SEED)
+        start = time.perf_counter()
+        BatchBattle([pair[0] for pair in pairs], [pair[1] for pair in pairs], use_numpy=use_numpy).run()
+        return time.perf_counter() - start
+
+    scalar = best_of(run_scalar)
+    for pair in pairs:
+        for team in pair:
+            team.regenerate_team()
+    columns = best_of(lambda: run_batch(True))
+    one_at_a_time = best_of(lambda: run_batch(False))
+    kernel = "NumPy columns" if team_store.np is not None else "NumPy not installed"
+    return (f"Battle {num_matches / scalar:,.0f} matches/s, BatchBattle ({kernel}) {num_matches / columns:,.0f} matches/s, "
+            f"one match at a time {num_matches / one_at_a_time:,.0f} matches/s")
+
+
+def bench_leaderboard(num_teams: int = 1000) -> str:
+    """ Wall time of leaderboard() in this process and with one worker process per core """
+    workers = os.cpu_count()
+
+    def run(count: int) -> float:
+        start = time.perf_counter()
+        leaderboard(count, benchmark_team(), num_teams)
+        return time.perf_counter() - start
+
+    serial = best_of(lambda: run(1))
+    parallel = best_of(lambda: run(workers))
+    return f"1 process {serial:.3f}s, {workers} workers {parallel:.3f}s, speedup {serial / parallel:.2f}x"
+
+
+def bench_random(count: int = 100000) -> str:
+    """ Cost per number of RandomGen.randint against RandomGen.fill_randint """
+    buffer = array('i', [0] * count)
+
+    def run_scalar() -> float:
+        start = time.perf_counter()
+        for _ in range(count):
+            RandomGen.randint(0, 5)
+        return time.perf_counter() - start
+
+    def run_bulk() -> float:
+        start = time.perf_counter()
+        RandomGen.fill_randint(buffer, 0, 5)
+        return time.perf_counter() - start
+
+    return f"randint {1e9 * best_of(run_scalar) / count:.0f} ns, fill_randint {1e9 * best_of(run_bulk) / count:.0f} ns per number"
+
+
+def bench_alloc(sizes: tuple = (6, 1000, 100000)) -> str:
+    """ Cost of creating an ArrayR of each size, without and with releasing it afterwards """
+    timings = []
+    for size in sizes:
+        repeats = max(10, 100000 // size)
+
+        def run_new() -> float:
+            start = time.perf_counter()
+            for _ in range(repeats):
+                ArrayR(size)
+            return time.perf_counter() - start
+
+        def run_reused() -> float:
+            start = time.perf_counter()
+            for _ in range(repeats):
+                ArrayR(size).release()
+            return time.perf_counter() - start
+
+        timings.append(f"n={size} {1e6 * best_of(run_new) / repeats:.2f} us ({1e6 * best_of(run_reused) / repeats:.2f} us released)")
+    return ", ".join(timings)
+
+
+def bench_shift(size: int = 100000, repeats: int = 20) -> str:
+    """ Cost of inserting and deleting at the front of a sorted list of size items, and of doubling its capacity """
+    items = [ListItem(None, key) for key in range(1, size + 1)]
+
+    def run_shift() -> float:
+        sorted_list = ArraySortedList.from_items(items)
+        sorted_list._resize()  # room for the inserted item
+        start = time.perf_counter()
+        for _ in range(repeats):
+            sorted_list.add(ListItem(None, 0))
+            sorted_list.delete_at_index(0)
+        return time.perf_counter() - start
+
+    def run_resize() -> float:
+        sorted_list = ArraySortedList.from_items(items)
+        start = time.perf_counter()
+        sorted_list._resize()
+        return time.perf_counter() - start
+
+    return f"n={size}: insert+delete at front {1e3 * best_of(run_shift) / repeats:.2f} ms, resize {1e3 * best_of(run_resize):.2f} ms"
+
+
+def bench_sorted_team(repeats: int = 2000) -> str:
+    """ Cost of creating a full battle mode 2 team """
+    criteria = list(Criterion)
+
+    def run() -> float:
+        start = time.perf_counter()
+        for i in range(repeats):
+            PokeTeam("Team", [2, 1, 1, 1, 1], 2, PokeTeam.AI.RANDOM, criteria[i % len(criteria)])
+        return time.perf_counter() - start
+
+    return f"{1e6 * best_of(run) / repeats:.1f} us per team"
+
+
+def bench_sorted(sizes: tuple = (6, 100, 400), repeats: int = 50) -> str:
+    """ Cost of one special() (reverse_order) plus one retrieve and return (delete_at_index, add) on sorted teams of each size """
+    timings = []
+    for size in sizes:
+        RandomGen.set_seed(LEADERBOARD_SEED)
+        keys = [RandomGen.randint(1, 20) for _ in range(size)]
+
+        def run() -> float:
+            team = ArraySortedList(size)
+            for key in keys:
+                team.add(ListItem(None, key))
+            start = time.perf_counter()
+            for _ in range(repeats):
+                team.reverse_order()
+                team.add(team.delete_at_index(0))
+            return time.perf_counter() - start
+
+        timings.append(f"n={size} {1e6 * best_of(run) / repeats:.1f} us")
+    return ", ".join(timings)
+
+
+class FirstTeamWins:
+    """ Stands in for Battle so that only the tournament bookkeeping is timed """
+
+    def battle(self, team1: PokeTeam, team2: PokeTeam) -> int:
+        return 1
+
+
+def bracket(first: int, count: int) -> str:
+    """ Postfix tournament string of a balanced bracket of count teams, named from first onwards """
+    if count == 1:
+        return f"T{first}"
+    half = count // 2
+    return f"{bracket(first, half)} {bracket(first + half, count - half)} +"
+
+
+def bench_tournament(num_teams: int = 1024) -> str:
+    """ Cost per match of advance_tournament on a balanced bracket and on a chain (every team waits for the
+    winner of all the teams after it), with battles that end at once """
+    shapes = {
+        "balanced": bracket(0, num_teams),
+        "chain": " ".join(f"T{x}" for x in range(num_teams)) + " +" * (num_teams - 1),
+    }
+    timings = []
+    for shape, tournament_str in shapes.items():
+
+        def run() -> float:
+            RandomGen.set_seed(LEADERBOARD_SEED)
+            tournament = Tournament(FirstTeamWins())
+            tournament.set_battle_mode(0)
+            tournament.start_tournament(tournament_str)
+            start = time.perf_counter()
+            while tournament.advance_tournament() is not None:
+                pass
+            return time.perf_counter() - start
+
+        timings.append(f"{shape} {1e6 * best_of(run, rounds=3) / (num_teams - 1):.1f} us")
+    return f"{num_teams} teams: " + ", ".join(timings) + " per match"
+
+
+def bench_metas(num_teams: int = 256, repeats: int = 100000) -> str:
+    """ Cost of len() of a BSet of 5 pokemon types and of linked_list_with_metas on a balanced bracket,
+    with battles that end at once """
+    types = BSet.from_iterable([1, 2, 3, 4, 5])
+
+    def run_len() -> float:
+        start = time.perf_counter()
+        for _ in range(repeats):
+            len(types)
+        return time.perf_counter() - start
+
+    def run_metas() -> float:
+        RandomGen.set_seed(LEADERBOARD_SEED)
+        tournament = Tournament(FirstTeamWins())
+        tournament.set_battle_mode(0)
+        tournament.start_tournament(bracket(0, num_teams))
+        start = time.perf_counter()
+        tournament.linked_list_with_metas()
+        return time.perf_counter() - start
+
+    return f"len {1e9 * best_of(run_len) / repeats:.0f} ns, metas of {num_teams} teams {1e3 * best_of(run_metas, rounds=3):.1f} ms"
+
+
+def bench_queue(count: int = 100000, block: int = 1000) -> str:
+    """ Cost per element of passing count elements through a growable queue one at a time and in blocks,
+    and of rotating a tower of teams and lives as two queues served in lockstep and as one paired queue """
+    items = list(range(count))
+    lives = [i % 9 + 2 for i in range(count)]
+
+    def run_single() -> float:
+        start = time.perf_counter()
+        queue = CircularQueue(1, growable=True)
+        for item in items:
+            queue.append(item)
+        while len(queue):
+            queue.serve()
+        return time.perf_counter() - start
+
+    def run_blocks() -> float:
+        start = time.perf_counter()
+        queue = CircularQueue(1, growable=True)
+        for first in range(0, count, block):
+            queue.extend(items[first:first + block])
+        while len(queue):
+            queue.serve_many(min(block, len(queue)))
+        return time.perf_counter() - start
+
+    def run_lockstep() -> float:
+        teams, teams_lives = CircularQueue(count), CircularQueue(count)
+        for item, item_lives in zip(items, lives):
+            teams.append(item)
+            teams_lives.append(item_lives)
+        start = time.perf_counter()
+        for _ in range(count):
+            team, team_lives = teams.serve(), teams_lives.serve()
+            teams.append(team)
+            teams_lives.append(team_lives - 1)
+        return time.perf_counter() - start
+
+    def run_paired() -> float:
+        teams = PairedCircularQueue(count)
+        teams.extend(items, lives)
+        start = time.perf_counter()
+        for _ in range(count):
+            team, team_lives = teams.serve_pair()
+            teams.append(team, team_lives - 1)
+        return time.perf_counter() - start
+
+    per_item = 1e9 / count
+    return (f"one at a time {per_item * best_of(run_single):.0f} ns, blocks of {block} {per_item * best_of(run_blocks):.0f} ns, "
+            f"tower rotation lockstep {per_item * best_of(run_lockstep):.0f} ns, paired {per_item * best_of(run_paired):.0f} ns")
+
+
+def bench_special(repeats: int = 20000) -> str:
+    """ Cost of PokeTeam.special on full teams of 6 in battle modes 0 (stack) and 1 (queue) """
+    timings = []
+    for battle_mode in (0, 1):
+        team = PokeTeam("Team", [2, 1, 1, 1, 1], battle_mode, PokeTeam.AI.RANDOM)
+
+        def run() -> float:
+            start = time.perf_counter()
+            for _ in range(repeats):
+                team.special()
+            return time.perf_counter() - start
+
+        timings.append(f"mode {battle_mode} {1e9 * best_of(run) / repeats:.0f} ns")
+    return ", ".join(timings)
+
+
+def bench_team_str(repeats: int = 5000) -> str:
+    """ Cost of str() of a full team of 6 in each battle mode """
+    timings = []
+    for battle_mode in range(3):
+        team = PokeTeam("Team", [2, 1, 1, 1, 1], battle_mode, PokeTeam.AI.RANDOM, Criterion.HP)
+
+        def run() -> float:
+            start = time.perf_counter()
+            for _ in range(repeats):
+                str(team)
+            return time.perf_counter() - start
+
+        timings.append(f"mode {battle_mode} {1e6 * best_of(run) / repeats:.1f} us")
+    return ", ".join(timings)
+
+
+MEMORY_SCRIPT = """
+import resource
+from abc import ABC
+from typing import Generic, TypeVar
+from pokemon import Bulbasaur, Charmander, Eevee, Gastly, Squirtle
+from pokemon_base import StatusEffect
+
+class DictPokemon(ABC, Generic[TypeVar('T')]):
+    # the layout of a pokemon before __slots__: the same attributes, kept in a __dict__
+    def __init__(self, species):
+        self.level = species.start_level
+        self.start_hp = self.hp = self.max_hp = species.start_hp
+        self.poke_type = species.poke_type
+        self.status = StatusEffect.NONE
+
+species = [Charmander, Bulbasaur, Squirtle, Gastly, Eevee]
+make = (lambda cls: DictPokemon(cls.species)) if {with_dict} else (lambda cls: cls())
+before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+pokemon = [make(species[i % 5]) for i in range({count})]
+print(before, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def bench_memory(count: int = 1000000) -> str:
+    """ Peak RSS of a fresh interpreter holding count pokemon (Linux, ru_maxrss in KiB), with the
+    slotted pokemon classes and with a __dict__ based stand-in of the same attributes
+    """
+    results = []
+    for name, with_dict in (("__slots__", False), ("__dict__", True)):
+        output = subprocess.run([sys.executable, "-c", MEMORY_SCRIPT.format(count=count, with_dict=with_dict)], capture_output=True,
+                                text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+        before, peak = (int(kib) for kib in output.split())
+        # the bytes per pokemon include the 8 byte reference held by the list
+        results.append(f"{name} peak RSS {peak / 1024:.0f} MiB, {1024 * (peak - before) / count:.0f} bytes per pokemon")
+    return f"{count:,} pokemon: " + ", ".join(results)
+
+
+BENCHMARKS = {
+    "turns": bench_turns,
+    "battle_stats": bench_battle_stats,
+    "matchup": bench_matchup,
+    "matrix": bench_matrix,
+    "precedence": bench_precedence,
+    "effectiveness": bench_effectiveness,
+    "attack": bench_attack_turn,
+    "stats": bench_stats,
+    "construct": bench_construct,
+    "regenerate": bench_regenerate,
+    "memory": bench_memory,
+    "batch": bench_batch,
+    "leaderboard": bench_leaderboard,
+    "random": bench_random,
+    "sorted": bench_sorted,
+    "sorted_team": bench_sorted_team,
+    "shift": bench_shift,
+    "alloc": bench_alloc,
+    "tournament": bench_tournament,
+    "metas": bench_metas,
+    "queue": bench_queue,
+    "special": bench_special,
+    "team_str": bench_team_str,
+}
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        print(f"{name}: {BENCHMARKS[name]()}")
@@ -3,6 +3,7 @@
 """
 
 from __future__ import annotations
+from typing import Iterable, Iterator
 from set import Set
 
 class BSet(Set[int]):
@@ -18,6 +19,21 @@ class BSet(Set[int]):
         """ Initialization. """
         Set.__init__(self)
 
+    @classmethod
+    def from_iterable(cls, items: Iterable[int]) -> BSet[int]:
+        """ Creates a set of the given items, setting all their bits in one integer
+        before storing it.
+        :raises TypeError: if an item is not integer or if not positive.
+        """
+        elems = 0
+        for item in items:
+            if not isinstance(item, int) or item <= 0:
+                raise TypeError('Set elements should be integers')
+            elems |= 1 << (item - 1)
+        res = cls()
+        res.elems = elems
+        return res
+
     def clear(self) -> None:
         """ Makes the set empty. """
         self.elems = 0
@@ -35,15 +51,18 @@ class BSet(Set[int]):
         return (self.elems >> (item - 1)) & 1
 
     def __len__(self) -> int:
+        """ Size computation, the number of bits set (a popcount). """
+        return self.elems.bit_count()
+
+    def __iter__(self) -> Iterator[int]:
+        """ Iterates over the elements in increasing order. Each step takes the
+        lowest bit set, so it costs one step per element and not per bit.
         """
-        Size computation. The most expensive operation.
-        Use int.bit_length(your_integer) to calculate the bit length.
-        """
-        res = 0
-        for item in range(1, int.bit_length(self.elems) + 1):
-            if item in self:
-                res += 1
-        return res
+        elems = self.elems
+        while elems:
+            lowest = elems & -elems
+            yield lowest.bit_length()
+            elems ^= lowest
 
     def add(self, item: int) -> None:
         """ Adds an element to the set.
@@ -90,18 +109,25 @@ class BSet(Set[int]):
         res = BSet()
         res.elems = self.elems & ~other.elems
         return res
+
+    def __ior__(self, other: BSet[int]) -> BSet[int]:
+        """ In-place union, self |= other, without creating a new set. """
+        self.elems |= other.elems
+        return self
+
+    def __iand__(self, other: BSet[int]) -> BSet[int]:
+        """ In-place intersection, self &= other, without creating a new set. """
+        self.elems &= other.elems
+        return self
+
+    def __isub__(self, other: BSet[int]) -> BSet[int]:
+        """ In-place difference, self -= other, without creating a new set. """
+        self.elems &= ~other.elems
+        return self
     
     def __str__(self):
         """ Construct a nice string representation. """
-        bit_elems = self.elems
-        out_elems = []
-        current = 0
-        while bit_elems:
-            if bit_elems & (1 << current):
-                out_elems.append(str(current+1))
-                bit_elems &= ~(1 << current)
-            current += 1
-        return '{' + ', '.join(out_elems) + '}'
+        return '{' + ', '.join(str(item) for item in self) + '}'
 
 if __name__ == '__main__':
     s = BSet(3)
@@ -115,4 +141,4 @@ if __name__ == '__main__':
     print(f'T = {t}')
 
     print(f'S union T = {s.union(t)}')
-    print(f'S intersect T = {s.intersection(t)}')
\ No newline at end of file
+    print(f'S intersect T = {s.intersection(t)}')
\ No newline at end of file
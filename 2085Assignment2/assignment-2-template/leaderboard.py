@@ -1,46 +1,148 @@
 """
 Run leaderboard matches against the leaderboard team.
+
+The matches can be played in parallel: the challenger teams are split into one shard per worker
+process, and every shard plays with its own RandomGen stream, split from the leaderboard stream.
+The results then only depend on the seed and the number of workers.
 """
 
+from concurrent.futures import ProcessPoolExecutor
+
 from battle import Battle
 from poke_team import PokeTeam, Criterion
 from random_gen import RandomGen
 
-def leaderboard():    
-    RandomGen.set_seed((1<<16) + 1029348)
+LEADERBOARD_SEED = (1<<16) + 1029348
 
-    leaderboard_team = PokeTeam.leaderboard_team()
-    teams = [
-        PokeTeam.random_team(f"Team {x}", RandomGen.randint(0, 2), criterion=Criterion(RandomGen.randint(1, len(Criterion))))
-        for x in range(1000)
-    ]
 
-    streak = 0
-    max_streak = 0
-    played = 0
-    won = 0
-    draw = 0
-    loss = 0
+class Tally:
+    """ Results of a run of consecutive leaderboard matches. A draw does not break a streak.
+    Besides the longest streak, the wins before the first loss and after the last loss are kept
+    so that the tallies of consecutive runs can be joined into the tally of the whole run.
+    """
+
+    def __init__(self) -> None:
+        """ Initialises an empty tally
+        :complexity: Best and worst case complexity is O(1)
+        """
+        self.won = 0
+        self.lost = 0
+        self.draw = 0
+        self.leading_streak = 0  # wins before the first loss
+        self.streak = 0          # wins since the last loss
+        self.max_streak = 0
+        self.lost_any = False
+
+    def add(self, result: int) -> None:
+        """ Counts the result of a match played by the leaderboard team as team 1
+        :complexity: Best and worst case complexity is O(1)
+        """
+        if result == 0:
+            self.draw += 1
+        elif result == 1:
+            self.won += 1
+            self.streak += 1
+            self.max_streak = max(self.max_streak, self.streak)
+            if not self.lost_any:
+                self.leading_streak += 1
+        elif result == 2:
+            self.lost += 1
+            self.streak = 0
+            self.lost_any = True
+
+    def extend(self, other: 'Tally') -> None:
+        """ Adds the tally of the run of matches played right after this one
+        :complexity: Best and worst case complexity is O(1)
+        """
+        self.max_streak = max(self.max_streak, other.max_streak, self.streak + other.leading_streak)
+        if not self.lost_any:
+            self.leading_streak += other.leading_streak
+        self.streak = other.streak if other.lost_any else self.streak + other.streak
+        self.lost_any = self.lost_any or other.lost_any
+        self.won += other.won
+        self.lost += other.lost
+        self.draw += other.draw
+
+    def played(self) -> int:
+        """ returns the number of matches counted
+        :complexity: Best and worst case complexity is O(1)
+        """
+        return self.won + self.lost + self.draw
+
+
+def team_spec(team: PokeTeam) -> tuple:
+    """ returns the arguments that build a fresh copy of the team. Teams cannot be sent to
+    other processes as their containers hold ctypes arrays, so their specs are sent instead.
+    :complexity: Best and worst case complexity is O(1)
+    """
+    return (team.team_name, team.team_numbers, team.battle_mode, team.ai_type, team.criterion)
+
+
+def play_matches(leaderboard_team: PokeTeam, teams: list[PokeTeam]) -> Tally:
+    """ Plays the leaderboard team against every team, regenerating it after each match
+    :complexity: Best and worst case complexity is O(n * B) where n is the number of teams and B is the complexity of a battle
+    """
+    tally = Tally()
     b = Battle()
     for team in teams:
-        res = b.battle(leaderboard_team, team)
-        if res == 0:
-            draw += 1
-        elif res == 1:
-            won += 1
-            streak += 1
-            max_streak = max(max_streak, streak)
-        elif res == 2:
-            loss += 1
-            streak = 0
-        played += 1
+        tally.add(b.battle(leaderboard_team, team))
         leaderboard_team.regenerate_team()
+    return tally
+
+
+def play_shard(leaderboard_spec: tuple, specs: list[tuple], seed: int) -> Tally:
+    """ Plays a shard of the leaderboard in a worker process with its own seed
+    :complexity: Best and worst case complexity is O(n * B) where n is the number of teams and B is the complexity of a battle
+    """
+    RandomGen.set_seed(seed)
+    return play_matches(PokeTeam(*leaderboard_spec), [PokeTeam(*spec) for spec in specs])
+
+
+def play_parallel(leaderboard_team: PokeTeam, teams: list[PokeTeam], workers: int) -> Tally:
+    """ Splits the teams into one contiguous shard per worker and plays the shards in worker processes.
+    Every shard plays with its own substream split from RandomGen, so the result depends on its seed and on workers.
+    :complexity: Best and worst case complexity is O(n * B / workers) where n is the number of teams and B is the complexity of a battle
+    """
+    seeds = [stream.seed for stream in RandomGen.split(workers)]
+    specs = [team_spec(team) for team in teams]
+    bounds = [len(specs) * shard // workers for shard in range(workers + 1)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(play_shard, team_spec(leaderboard_team), specs[bounds[shard]:bounds[shard + 1]], seeds[shard])
+                   for shard in range(workers)]
+        tally = Tally()
+        for future in futures:
+            tally.extend(future.result())
+    return tally
+
+
+def leaderboard(workers: int = 1, leaderboard_team: PokeTeam = None, num_teams: int = 1000):
+    """ Plays the leaderboard team against num_teams random teams
+    :param workers: the number of worker processes, the matches are played in this process if it is 1
+    :param leaderboard_team: the team to play with, PokeTeam.leaderboard_team() by default
+    :raises ValueError: if workers is smaller than 1
+    """
+    if workers < 1:
+        raise ValueError("At least one worker is needed.")
+    RandomGen.set_seed(LEADERBOARD_SEED)
+
+    if leaderboard_team is None:
+        leaderboard_team = PokeTeam.leaderboard_team()
+    teams = [
+        PokeTeam.random_team(f"Team {x}", RandomGen.randint(0, 2), criterion=Criterion(RandomGen.randint(1, len(Criterion))))
+        for x in range(num_teams)
+    ]
+
+    if workers == 1:
+        tally = play_matches(leaderboard_team, teams)
+    else:
+        tally = play_parallel(leaderboard_team, teams, workers)
 
+    played = tally.played()
     return [
-        {"name": "Percentage Won", "value": f"{100*won/played:.2f}%"},
-        {"name": "Percentage Lost", "value": f"{100*loss/played:.2f}%"},
-        {"name": "Percentage Draw", "value": f"{100*draw/played:.2f}%"},
-        {"name": "Longest Streak", "value": f"{max_streak}"},
+        {"name": "Percentage Won", "value": f"{100*tally.won/played:.2f}%"},
+        {"name": "Percentage Lost", "value": f"{100*tally.lost/played:.2f}%"},
+        {"name": "Percentage Draw", "value": f"{100*tally.draw/played:.2f}%"},
+        {"name": "Longest Streak", "value": f"{tally.max_streak}"},
     ]
 
 if __name__ == "__main__":
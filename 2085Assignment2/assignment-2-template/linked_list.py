@@ -68,3 +68,135 @@ class LinkedList(List[T]):
             new_node.next = previous_node.next
             previous_node.next = new_node
         self.length += 1
+
+
+class IndexedLinkedList(LinkedList[T]):
+    """ List ADT implemented with doubly linked nodes, with two aids to avoid walking the list:
+
+    - a hash map counting each item, so that membership is O(1) and index() of an item that
+      is not in the list fails in O(1). Items must therefore be hashable.
+    - a cursor on the last node reached. A position is reached by walking from the head, the
+      tail or the cursor, whichever is closest, so accessing positions in sequence, or near the
+      last one accessed, costs O(1) per access. index() can also start from a given position.
+    """
+    def __init__(self, dummy_capacity=1) -> None:
+        """ Indexed linked-list object initialiser. """
+        LinkedList.__init__(self, dummy_capacity)
+        self.tail = None
+        self.counts = {}
+        self.cursor = None
+        self.cursor_index = 0
+
+    def clear(self):
+        """ Clear the list. """
+        LinkedList.clear(self)
+        self.tail = None
+        self.counts.clear()
+        self.cursor = None
+
+    def _node_at(self, index: int) -> node.DoublyLinkedNode[T]:
+        """ Get node object at a given position, walking from the closest of the head, tail and cursor,
+        and move the cursor to it. """
+        last = self.length - 1
+        if not (0 <= index <= last):
+            raise ValueError('Index out of bounds')
+        current, position = self.head, 0
+        if last - index < index:
+            current, position = self.tail, last
+        if self.cursor is not None and abs(self.cursor_index - index) < abs(position - index):
+            current, position = self.cursor, self.cursor_index
+        while position < index:
+            current = current.next
+            position += 1
+        while position > index:
+            current = current.previous
+            position -= 1
+        self.cursor, self.cursor_index = current, index
+        return current
+
+    def _count(self, item: T, change: int) -> None:
+        """ Update the number of times the item is in the list. """
+        count = self.counts.get(item, 0) + change
+        if count == 0:
+            del self.counts[item]
+        else:
+            self.counts[item] = count
+
+    def __setitem__(self, index: int, item: T) -> None:
+        """ Magic method. Insert the item at a given position. """
+        node_at_index = self._node_at(index)
+        self._count(node_at_index.item, -1)
+        self._count(item, 1)
+        node_at_index.item = item
+
+    def __getitem__(self, index: int) -> T:
+        """ Magic method. Return the element at a given position. """
+        return self._node_at(index).item
+
+    def __contains__(self, item: T) -> bool:
+        """ Checks if the item is in the list. """
+        return item in self.counts
+
+    def index(self, item: T, start: int = 0) -> int:
+        """ Find the first position of a given item in the list, from the position start onwards. """
+        if item not in self.counts or start >= self.length:
+            raise ValueError('Item is not in list')
+        current = self._node_at(start)
+        position = start
+        while current is not None and current.item != item:
+            current = current.next
+            position += 1
+        if current is None:
+            raise ValueError('Item is not in list')
+        self.cursor, self.cursor_index = current, position
+        return position
+
+    def delete_at_index(self, index: int) -> T:
+        """ Delete item at a given position. """
+        if self.is_empty():
+            raise ValueError('List is empty')
+        removed = self._node_at(index)
+        if removed.previous is None:
+            self.head = removed.next
+        else:
+            removed.previous.next = removed.next
+        if removed.next is None:
+            self.tail = removed.previous
+        else:
+            removed.next.previous = removed.previous
+
+        # the cursor moves to the node that takes the removed position, or to the one before it
+        if removed.next is not None:
+            self.cursor = removed.next
+        elif removed.previous is not None:
+            self.cursor, self.cursor_index = removed.previous, index - 1
+        else:
+            self.cursor = None
+        self.length -= 1
+        self._count(removed.item, -1)
+        return removed.item
+
+    def insert(self, index: int, item: T) -> None:
+        """ Insert an item at a given position. """
+        if not (0 <= index <= self.length):
+            raise ValueError('Index out of bounds')
+        new_node = node.DoublyLinkedNode(item)
+        if index == self.length:
+            new_node.previous = self.tail
+            if self.tail is None:
+                self.head = new_node
+            else:
+                self.tail.next = new_node
+            self.tail = new_node
+        else:
+            next_node = self._node_at(index)
+            new_node.next = next_node
+            new_node.previous = next_node.previous
+            if next_node.previous is None:
+                self.head = new_node
+            else:
+                next_node.previous.next = new_node
+            next_node.previous = new_node
+        self.cursor, self.cursor_index = new_node, index
+        self.length += 1
+        self._count(item, 1)
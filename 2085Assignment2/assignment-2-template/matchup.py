@@ -0,0 +1,194 @@
+"""
+Monte Carlo estimate of the outcome of a matchup between two team configurations.
+
+A team spec is the tuple (team_numbers, battle_mode, ai_type, criterion), the arguments of
+PokeTeam after the team name. Battle i of an estimate is seeded with substream i split from
+the estimate's seed, and both teams are regenerated in place after every battle, so the
+counts only depend on the seed and on the number of battles played, whatever the number of
+worker processes. The estimate can stop early, at the end of a batch of battles, once the
+Wilson score interval of each outcome is within the requested margin.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from math import sqrt
+
+from battle import Battle
+from poke_team import PokeTeam
+from random_gen import RandomGen, RandomStream
+
+MATCHUP_SEED = (1<<16) + 2085
+# substreams of RandomGen.SPLIT_STRIDE numbers that fit in the period of the generator, after which they repeat
+MAX_BATTLES = RandomGen.MOD // RandomGen.SPLIT_STRIDE
+# z score of a 95% confidence interval
+Z_95 = 1.959963984540054
+
+
+def wilson_interval(successes: int, trials: int, z: float = Z_95) -> tuple[float, float]:
+    """ Wilson score interval of a proportion
+    :param successes: the number of trials with the outcome
+    :param trials: the number of trials
+    :param z: the z score of the confidence level
+    :complexity: Best and worst case complexity is O(1)
+    :return: the lower and upper bounds of the interval, (0, 1) if there are no trials
+    """
+    if trials == 0:
+        return (0.0, 1.0)
+    p = successes / trials
+    denominator = 1 + z * z / trials
+    centre = (p + z * z / (2 * trials)) / denominator
+    half_width = z * sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+    return (max(0.0, centre - half_width), min(1.0, centre + half_width))
+
+
+class MatchupEstimate:
+    """ Outcomes of the battles played by team 1 against team 2, and their estimated probabilities """
+
+    def __init__(self, z: float = Z_95) -> None:
+        """ Initialises an estimate with no battles
+        :param z: the z score of the confidence level of the intervals
+        :complexity: Best and worst case complexity is O(1)
+        """
+        self.won = 0
+        self.draw = 0
+        self.lost = 0
+        self.z = z
+
+    def add(self, result: int) -> None:
+        """ Counts the result of a battle, as returned by Battle.battle
+        :complexity: Best and worst case complexity is O(1)
+        """
+        if result == 0:
+            self.draw += 1
+        elif result == 1:
+            self.won += 1
+        elif result == 2:
+            self.lost += 1
+
+    def extend(self, other: 'MatchupEstimate') -> None:
+        """ Adds the battles counted by another estimate of the same matchup
+        :complexity: Best and worst case complexity is O(1)
+        """
+        self.won += other.won
+        self.draw += other.draw
+        self.lost += other.lost
+
+    def played(self) -> int:
+        """ returns the number of battles counted
+        :complexity: Best and worst case complexity is O(1)
+        """
+        return self.won + self.draw + self.lost
+
+    def probabilities(self) -> tuple[float, float, float]:
+        """ returns the estimated probabilities that team 1 wins, draws and loses
+        :raises ValueError: if no battles were counted
+        :complexity: Best and worst case complexity is O(1)
+        """
+        played = self.played()
+        if played == 0:
+            raise ValueError("No battles were played.")
+        return (self.won / played, self.draw / played, self.lost / played)
+
+    def intervals(self) -> tuple[tuple[float, float], tuple[float, float], tuple[float, float]]:
+        """ returns the Wilson score intervals of the probabilities that team 1 wins, draws and loses
+        :complexity: Best and worst case complexity is O(1)
+        """
+        played = self.played()
+        return tuple(wilson_interval(count, played, self.z) for count in (self.won, self.draw, self.lost))
+
+    def margin(self) -> float:
+        """ returns the largest half width of the three intervals
+        :complexity: Best and worst case complexity is O(1)
+        """
+        return max((high - low) / 2 for low, high in self.intervals())
+
+    def __str__(self) -> str:
+        """ Probabilities and intervals of the three outcomes
+        :complexity: Best and worst case complexity is O(1)
+        """
+        if self.played() == 0:
+            return "no battles played"
+        outcomes = []
+        for name, probability, (low, high) in zip(("won", "draw", "lost"), self.probabilities(), self.intervals()):
+            outcomes.append(f"{name} {100*probability:.1f}% [{100*low:.1f}%, {100*high:.1f}%]")
+        return f"{', '.join(outcomes)} over {self.played()} battles"
+
+
+def make_team(name: str, spec: tuple) -> PokeTeam:
+    """ Builds a team from its spec
+    :raises ValueError: if the team would ask for user input
+    :complexity: Best and worst case complexity is O(n) where n is the number of pokemons in the team
+    """
+    team = PokeTeam(name, *spec)
+    if team.ai_type == PokeTeam.AI.USER_INPUT:
+        raise ValueError("Matchups cannot be estimated for USER_INPUT teams.")
+    return team
+
+
+def play_seeds(spec1: tuple, spec2: tuple, seeds: list[int], z: float = Z_95) -> MatchupEstimate:
+    """ Plays one battle per seed between fresh teams built from the specs, regenerating them in place after every battle
+    :complexity: Best and worst case complexity is O(n * B) where n is the number of seeds and B is the complexity of a battle
+    """
+    team1 = make_team("Team 1", spec1)
+    team2 = make_team("Team 2", spec2)
+    estimate = MatchupEstimate(z)
+    b = Battle()
+    for seed in seeds:
+        RandomGen.set_seed(seed)
+        estimate.add(b.battle(team1, team2))
+        team1.regenerate_team()
+        team2.regenerate_team()
+    return estimate
+
+
+def estimate_matchup(spec1: tuple, spec2: tuple, battles: int = 1000, margin: float | None = None, seed: int = MATCHUP_SEED,
+                     batch_size: int = 100, workers: int = 1, z: float = Z_95) -> MatchupEstimate:
+    """ Estimates the probabilities that a team built from spec1 wins, draws and loses against a team built from spec2
+    :param spec1: the spec of team 1, (team_numbers, battle_mode, ai_type, criterion)
+    :param spec2: the spec of team 2
+    :param battles: the largest number of battles to play
+    :param margin: if given, the estimate stops at the end of the first batch after which the half width of
+                   every interval is at most margin
+    :param seed: the seed the battles' substreams are split from
+    :param batch_size: the number of battles played between two checks of the margin
+    :param workers: the number of worker processes, the battles are played in this process if it is 1
+    :param z: the z score of the confidence level of the intervals, 95% by default
+    :raises ValueError: if battles, batch_size or workers is smaller than 1, battles is larger than MAX_BATTLES,
+                        or a team would ask for user input
+    :complexity: Best and worst case complexity is O(n * B / workers) where n is the number of battles played and B is the complexity of a battle
+    """
+    if battles < 1 or batch_size < 1:
+        raise ValueError("At least one battle is needed.")
+    if battles > MAX_BATTLES:
+        raise ValueError(f"At most {MAX_BATTLES} battles can be played before their substreams overlap.")
+    if workers < 1:
+        raise ValueError("At least one worker is needed.")
+    # fail before starting any worker
+    make_team("Team 1", spec1)
+    make_team("Team 2", spec2)
+
+    stream = RandomStream(seed)
+    estimate = MatchupEstimate(z)
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        while estimate.played() < battles:
+            seeds = [substream.seed for substream in stream.split(min(batch_size, battles - estimate.played()))]
+            if executor is None:
+                estimate.extend(play_seeds(spec1, spec2, seeds, z))
+            else:
+                bounds = [len(seeds) * shard // workers for shard in range(workers + 1)]
+                futures = [executor.submit(play_seeds, spec1, spec2, seeds[bounds[shard]:bounds[shard + 1]], z)
+                           for shard in range(workers)]
+                for future in futures:
+                    estimate.extend(future.result())
+
+            if margin is not None and estimate.margin() <= margin:
+                break
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return estimate
+
+
+if __name__ == "__main__":
+    print(estimate_matchup(([1, 1, 1, 1, 1], 0, PokeTeam.AI.SWAP_ON_SUPER_EFFECTIVE, None),
+                           ([0, 2, 2, 0, 2], 1, PokeTeam.AI.ALWAYS_ATTACK, None), margin=0.03))
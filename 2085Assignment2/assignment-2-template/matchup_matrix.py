@@ -0,0 +1,231 @@
+"""
+Precomputed matchup matrix between team configurations, stored on disk and looked up in O(1).
+
+A configuration is a team spec (team_numbers, battle_mode, ai_type, criterion), as in matchup.
+build_matrix plays a fixed number of seeded battles for every ordered pair of configurations
+and writes two files to a directory:
+
+- matrix.bin: the number of battles won and drawn by the row configuration against the column
+  configuration, as unsigned 16 bit integers in native byte order, two per cell, row after row.
+  The number of battles lost is the number of battles per pair minus both.
+- index.json: the configurations of the rows (and columns), in order, and the number of battles per pair.
+
+MatchupMatrix maps matrix.bin into memory, so only the cells that are looked up are read.
+
+Pair p (row * n + column) plays the battles seeded with substreams p * battles to (p + 1) * battles - 1
+split from the seed of the matrix, RandomGen.SPLIT_STRIDE numbers apart as in the leaderboard, so a cell
+does not depend on the number of workers or on the other configurations before it. The period of the
+generator only holds MAX_STREAMS such substreams, which bounds the number of battles of a matrix.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from matchup import MATCHUP_SEED, MatchupEstimate, make_team, play_seeds
+from poke_team import Criterion, PokeTeam
+from random_gen import RandomGen, RandomStream
+
+INDEX_FILE = "index.json"
+DATA_FILE = "matrix.bin"
+# substreams of RandomGen.SPLIT_STRIDE numbers that fit in the period of the generator, after which they repeat
+MAX_STREAMS = RandomGen.MOD // RandomGen.SPLIT_STRIDE
+# the counts are stored on 16 bits
+MAX_BATTLES = (1 << 16) - 1
+
+
+def compositions(max_pokemons: int = 6, species: int = 5) -> list[list[int]]:
+    """ All the team_numbers with between 1 and max_pokemons pokemons, in lexicographic order
+    :complexity: Best and worst case complexity is O(C * species) where C is the number of compositions
+    """
+    result = [[]]
+    for _ in range(species):
+        result = [numbers + [count] for numbers in result for count in range(max_pokemons - sum(numbers) + 1)]
+    return [numbers for numbers in result if sum(numbers) >= 1]
+
+
+def all_specs(max_pokemons: int = 6, battle_modes=(0, 1, 2), ai_types=None) -> list[tuple]:
+    """ Every configuration of the given battle modes and AI types, with every criterion in battle mode 2
+    :param ai_types: the AI types, every type but USER_INPUT by default
+    :complexity: Best and worst case complexity is O(C * M * A * K) where C is the number of compositions,
+                 M the number of battle modes, A the number of AI types and K the number of criteria
+    """
+    if ai_types is None:
+        ai_types = [ai_type for ai_type in PokeTeam.AI if ai_type != PokeTeam.AI.USER_INPUT]
+    specs = []
+    for team_numbers in compositions(max_pokemons):
+        for battle_mode in battle_modes:
+            for ai_type in ai_types:
+                for criterion in (Criterion if battle_mode == 2 else [None]):
+                    specs.append((team_numbers, battle_mode, ai_type, criterion))
+    return specs
+
+
+def spec_key(spec: tuple) -> tuple:
+    """ Hashable key of a configuration. The criterion only counts in battle mode 2.
+    :complexity: Best and worst case complexity is O(1)
+    """
+    team_numbers, battle_mode, ai_type = spec[:3]
+    criterion = spec[3] if len(spec) > 3 and battle_mode == 2 else None
+    return (tuple(team_numbers), battle_mode, ai_type, criterion)
+
+
+def team_key(team: PokeTeam) -> tuple:
+    """ Hashable key of the configuration of a team
+    :complexity: Best and worst case complexity is O(1)
+    """
+    return spec_key((team.team_numbers, team.battle_mode, team.ai_type, team.criterion))
+
+
+def pair_seeds(seed: int, pair: int, battles: int) -> list[int]:
+    """ Seeds of the battles of a pair of configurations
+    :complexity: Best and worst case complexity is O(battles * log(SPLIT_STRIDE) + log(pair))
+    """
+    stream = RandomStream(seed)
+    stream.jump(pair * battles * RandomGen.SPLIT_STRIDE)
+    return [substream.seed for substream in stream.split(battles)]
+
+
+def play_rows(specs: list[tuple], rows: range, battles: int, seed: int) -> array:
+    """ Plays the battles of the given rows of the matrix and returns their cells
+    :complexity: Best and worst case complexity is O(R * n * battles * B) where R is the number of rows,
+                 n the number of configurations and B the complexity of a battle
+    """
+    n = len(specs)
+    cells = array("H")
+    for row in rows:
+        for column in range(n):
+            estimate = play_seeds(specs[row], specs[column], pair_seeds(seed, row * n + column, battles))
+            cells.append(estimate.won)
+            cells.append(estimate.draw)
+    return cells
+
+
+def build_matrix(specs: list[tuple], directory: str, battles: int = 20, seed: int = MATCHUP_SEED, workers: int = 1) -> None:
+    """ Plays every ordered pair of configurations and writes the matrix to the directory
+    :param specs: the configurations, in the order of the rows
+    :param directory: the directory to write index.json and matrix.bin to, created if needed
+    :param battles: the number of battles per pair
+    :param seed: the seed the battles' substreams are split from
+    :param workers: the number of worker processes, the battles are played in this process if it is 1
+    :raises ValueError: if battles is not between 1 and MAX_BATTLES, the matrix needs more than MAX_STREAMS
+                        battles, workers is smaller than 1, a configuration appears twice or would ask for user input
+    :complexity: Best and worst case complexity is O(n^2 * battles * B / workers) where n is the number of
+                 configurations and B the complexity of a battle
+    """
+    if not 1 <= battles <= MAX_BATTLES:
+        raise ValueError(f"The number of battles per pair must be between 1 and {MAX_BATTLES}.")
+    if len(specs) ** 2 * battles > MAX_STREAMS:
+        raise ValueError(f"A matrix can play at most {MAX_STREAMS} battles before their substreams overlap.")
+    if workers < 1:
+        raise ValueError("At least one worker is needed.")
+    if len({spec_key(spec) for spec in specs}) != len(specs):
+        raise ValueError("A configuration appears more than once.")
+    for spec in specs:
+        make_team("Team", spec)
+
+    n = len(specs)
+    if workers == 1:
+        cells = play_rows(specs, range(n), battles, seed)
+    else:
+        bounds = [n * shard // workers for shard in range(workers + 1)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(play_rows, specs, range(bounds[shard], bounds[shard + 1]), battles, seed)
+                       for shard in range(workers)]
+            cells = array("H")
+            for future in futures:
+                cells.extend(future.result())
+
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, DATA_FILE), "wb") as data:
+        cells.tofile(data)
+    index = {
+        "battles": battles,
+        "seed": seed,
+        "byteorder": sys.byteorder,
+        "specs": [[list(team_numbers), battle_mode, ai_type.name, None if criterion is None else criterion.name]
+                  for team_numbers, battle_mode, ai_type, criterion in map(spec_key, specs)],
+    }
+    with open(os.path.join(directory, INDEX_FILE), "w") as index_file:
+        json.dump(index, index_file)
+
+
+class MatchupMatrix:
+    """ Read only view of a matrix written by build_matrix """
+
+    def __init__(self, directory: str) -> None:
+        """ Reads the index and maps the cells of the matrix in the directory into memory
+        :raises ValueError: if the matrix was written with another byte order or does not match its index
+        :complexity: Best and worst case complexity is O(n) where n is the number of configurations
+        """
+        with open(os.path.join(directory, INDEX_FILE)) as index_file:
+            index = json.load(index_file)
+        if index["byteorder"] != sys.byteorder:
+            raise ValueError("The matrix was written with another byte order.")
+        self.battles = index["battles"]
+        self.specs = [(team_numbers, battle_mode, PokeTeam.AI[ai_name], None if criterion_name is None else Criterion[criterion_name])
+                      for team_numbers, battle_mode, ai_name, criterion_name in index["specs"]]
+        self.rows = {spec_key(spec): row for row, spec in enumerate(self.specs)}
+
+        n = len(self.specs)
+        with open(os.path.join(directory, DATA_FILE), "rb") as data:
+            size = os.fstat(data.fileno()).st_size
+            if size != 2 * n * n * array("H").itemsize:
+                raise ValueError("The matrix does not match its index.")
+            self.mapping = mmap.mmap(data.fileno(), 0, access=mmap.ACCESS_READ) if size > 0 else b""
+        self.cells = memoryview(self.mapping).cast("H")
+
+    def __len__(self) -> int:
+        """ returns the number of configurations
+        :complexity: Best and worst case complexity is O(1)
+        """
+        return len(self.specs)
+
+    def __contains__(self, spec: tuple) -> bool:
+        """ checks if the matrix has a row for the configuration
+        :complexity: Best and worst case complexity is O(1)
+        """
+        return spec_key(spec) in self.rows
+
+    def lookup(self, spec1: tuple, spec2: tuple) -> MatchupEstimate:
+        """ Counts of the battles played by spec1 as team 1 against spec2
+        :raises KeyError: if a configuration is not in the matrix
+        :complexity: Best and worst case complexity is O(1)
+        """
+        cell = 2 * (self.rows[spec_key(spec1)] * len(self.specs) + self.rows[spec_key(spec2)])
+        estimate = MatchupEstimate()
+        estimate.won = self.cells[cell]
+        estimate.draw = self.cells[cell + 1]
+        estimate.lost = self.battles - estimate.won - estimate.draw
+        return estimate
+
+    def expected(self, team1: PokeTeam, team2: PokeTeam) -> tuple[float, float, float]:
+        """ Expected probabilities that team1 wins, draws and loses against team2, from their configurations
+        :raises KeyError: if the configuration of a team is not in the matrix
+        :complexity: Best and worst case complexity is O(1)
+        """
+        return self.lookup(team_key(team1), team_key(team2)).probabilities()
+
+    def close(self) -> None:
+        """ Unmaps the matrix, the view cannot be used afterwards
+        :complexity: Best and worst case complexity is O(1)
+        """
+        self.cells.release()
+        if isinstance(self.mapping, mmap.mmap):
+            self.mapping.close()
+
+
+if __name__ == "__main__":
+    directory = sys.argv[1] if len(sys.argv) > 1 else "matchup_matrix"
+    # all the single species teams of up to 3 pokemons, always attacking in battle mode 0
+    specs = [spec for spec in all_specs(max_pokemons=3, battle_modes=(0,), ai_types=[PokeTeam.AI.ALWAYS_ATTACK])
+             if sum(1 for count in spec[0] if count) == 1]
+    build_matrix(specs, directory)
+    matrix = MatchupMatrix(directory)
+    print(f"{len(matrix)} configurations, {matrix.lookup(specs[0], specs[-1])}")
+    matrix.close()
@@ -14,6 +14,14 @@ class Node(Generic[T]):
         self.item = item
         self.next = None
 
+class DoublyLinkedNode(Node[T]):
+    """ Linked node that also has a reference to the previous node. """
+
+    def __init__(self, item: T = None) -> None:
+        """ Node initialiser. """
+        Node.__init__(self, item)
+        self.previous = None
+
 def get_node_at_index(head: Node[T], index: int):
     """ Return the node at a given position. """
     current = head
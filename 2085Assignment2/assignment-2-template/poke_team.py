@@ -9,12 +9,14 @@ __author__ = "Scaffold by Jackson Goerner, Code by Jun Yu Tan and Shyam Kamalesh
 
 
 from enum import Enum, auto
+from typing import Iterator
 from pokemon_base import PokemonBase
 from pokemon import *
 from random_gen import RandomGen
 from array_sorted_list import ArraySortedList
 from queue_adt import CircularQueue
 from stack_adt import  ArrayStack
+from referential_array import ArrayR
 from sorted_list import ListItem
 from pokemon_base import StatusEffect
 
@@ -114,15 +116,9 @@ class PokeTeam:
         random_team_numbers.add(ListItem(None,0))
         random_team_numbers.add(ListItem(None, team_size))
 
-        first_random = RandomGen.randint(0, team_size)
-        second_random = RandomGen.randint(0, team_size)
-        third_random = RandomGen.randint(0, team_size)
-        fourth_random = RandomGen.randint(0, team_size)
-
-        random_team_numbers.add(ListItem(None,first_random))
-        random_team_numbers.add(ListItem(None,second_random))
-        random_team_numbers.add(ListItem(None,third_random))
-        random_team_numbers.add(ListItem(None,fourth_random))
+        # the 4 cut points between the 5 pokemon kinds, drawn in one call
+        for cut in RandomGen.fill_randint([0] * 4, 0, team_size):
+            random_team_numbers.add(ListItem(None, cut))
 
         # array that stores the number of each pokemon
         team_numbers = []
@@ -178,43 +174,36 @@ class PokeTeam:
         return pokemon
 
     def special(self) -> None:
-        """ carries out a special operation on the pokemon team based on the battle mode
-        :complexity: Battle Mode 0 - Best and worst is O(n) where n is the length of the stack
+        """ carries out a special operation on the pokemon team based on the battle mode. The stack and the
+        queue are rearranged in place, in the slots of their arrays, without allocating.
+        :complexity: Battle Mode 0 - Best and worst is O(1)
                      Battle Mode 1 - Best and worst is O(n) where n is the length of the queue
-                     Battle Mode 2 - Best is O(1) when the list is already sorted or the first iteration produces sorting result (Bubble sort)
-                                     Worst is O(n^2) where n is the length of the list (Bubble sort)
+                     Battle Mode 2 - Best and worst is O(1), the list only changes its order
         """
         if self.battle_mode == 0:  # ArrayStack
-            # Swap the first and last pokemon in the stack if the stack'sl lenth is greater than 1
-            if len(self.team) > 1:
-
-                temp_stack = ArrayStack(len(self.team) - 2)
-
-                first_pokemon = self.team.pop()
-
-                while len(self.team) > 1:
-                    temp_stack.push(self.team.pop())
-                
-                last_pokemon = self.team.pop()
-
-                self.team.push(first_pokemon)
-
-                while len(temp_stack) > 0:
-                    self.team.push(temp_stack.pop())
-                
-                self.team.push(last_pokemon)
+            # Swap the first and last pokemon in the stack, the bottom and top slots of its array
+            stack = self.team
+            if len(stack) > 1:
+                top = len(stack) - 1
+                stack.array[0], stack.array[top] = stack.array[top], stack.array[0]
 
 
         if self.battle_mode == 1:  # CircularQueue
-            # swap the first and second halves of the CircularQueue
-            half_number = len(self.team) // 2
-            temp_stack = ArrayStack(half_number)
-
-            for _ in range(half_number):
-                temp_stack.push(self.team.serve())
-            
-            for _ in range(half_number):
-                self.team.append(temp_stack.pop())
+            # move the first half of the CircularQueue, reversed, behind the second half
+            queue = self.team
+            half_number = len(queue) // 2
+            capacity = len(queue.array)
+            for i in range(half_number // 2):
+                first = (queue.front + i) % capacity
+                last = (queue.front + half_number - 1 - i) % capacity
+                queue.array[first], queue.array[last] = queue.array[last], queue.array[first]
+
+            # a queue that fills its array already has the first half behind the second one
+            if len(queue) < capacity:
+                for i in range(half_number):
+                    queue.array[(queue.rear + i) % capacity] = queue.array[(queue.front + i) % capacity]
+            queue.front = (queue.front + half_number) % capacity
+            queue.rear = (queue.rear + half_number) % capacity
 
 
         if self.battle_mode == 2:  # ArraySortedList
@@ -222,43 +211,60 @@ class PokeTeam:
 
 
     def regenerate_team(self) -> None:        
-        """ regenerates the team by building the team back from the team numbers
-        :complexity: Best and worst case complexity is O(S) where S is the complexity
-        of set_team()
+        """ regenerates the team in place, as a fresh set_team() would build it. The pokemon of the roster
+        saved by set_team() are reset (pokemon that evolved go back to their original object) and the
+        existing container is refilled with them, in the saved order, by its reset_from method.
+        :complexity: Best and worst case complexity is O(n) where n is the number of pokemons in the team
         """
-        self.set_team()
+        roster = self.roster.get_block(0, self.num_of_pokemons)
+        for item in roster:
+            if self.battle_mode == 2:  # ArraySortedList, the roster holds the list items
+                item.value.reset()
+            else:
+                item.reset()
+
+        if self.battle_mode == 2:
+            self.team.reset_from(roster, self.roster_order)
+        else:
+            self.team.reset_from(roster)
+
         self.num_of_heals = 3
 
+    def save_roster(self) -> None:
+        """ Saves the items of the container built by set_team(), in the order it iterates in, so that
+        regenerate_team() can restore it
+        :complexity: Best and worst case complexity is O(n) where n is the number of pokemons in the team
+        """
+        container = self.team
+        self.roster = ArrayR(max(1, self.num_of_pokemons))
+        for i, item in enumerate(container):
+            self.roster[i] = item
+        if self.battle_mode == 2:  # ArraySortedList
+            self.roster_order = container.order
+
     def __str__(self) -> str:
         """ magic method that produces the string version of the pokemon team
-        :complexity: Battle Mode 0 - Best and worst is O(n) where n is the length of the stack
-                     Battle Mode 1 - Best and worst is O(n) where n is the length of the queue
-                     Battle Mode 2 - Best and worst is O(n) where n is the length of the array sorted list
+        :complexity: Best and worst is O(n) where n is the number of pokemon in the team
         """
         result = self.team_name + " " + "(" + str(self.battle_mode) + ")" + ": "
+        result += "[" + ", ".join(str(pokemon) for pokemon in self) + "]"
+        return result
 
-        pokemon_str_list = ""
-
-        if self.battle_mode == 0:  # ArrayStack
-            stack_length = len(self.team)
-            for _ in range(stack_length):
-                pokemon_str_list += str(self.team.peek()) + ", "
-                self.team.length -= 1
-            self.team.length = stack_length
-                
-        elif self.battle_mode == 1:  # CircularQueue
-            for _ in range(len(self.team)):
-                pokemon = self.team.serve()
-                pokemon_str_list += str(pokemon) + ", "
-                self.team.append(pokemon)
-
-        elif self.battle_mode == 2:  # ArraySortedList
-            for i in range(len(self.team)):
-                pokemon = self.team[i].value
-                pokemon_str_list += str(pokemon) + ", "
+    def __iter__(self) -> Iterator[PokemonBase]:
+        """ iterates over the pokemon in the order retrieve_pokemon would hand them out, reading the
+        container in place without changing it
+        :pre: the team does not change during the iteration
+        :complexity: Best and worst is O(n) where n is the number of pokemon in the team, O(1) per pokemon
+        """
+        if self.battle_mode == 2:  # ArraySortedList, the pokemon are the values of the list items
+            return (item.value for item in self.team)
+        return iter(self.team)
 
-        result += "[" + pokemon_str_list[0:-2] + "]"
-        return result
+    def snapshot(self) -> list[PokemonBase]:
+        """ returns the pokemon in battle order in a new list, which stays as it is when the team changes
+        :complexity: Best and worst is O(n) where n is the number of pokemon in the team
+        """
+        return list(self)
 
     def is_empty(self):
         """ returns if the pokemon team is empty or not
@@ -315,9 +321,8 @@ class PokeTeam:
             self.team = CircularQueue(self.num_of_pokemons)
             self.fill_team_mode_one()
         elif self.battle_mode == 2: # ArraySortedList
-            self.team = ArraySortedList(self.num_of_pokemons)
             self.fill_team_mode_two()
-            self.team.reverse_order()
+        self.save_roster()
 
     def fill_team_mode_zero(self) -> None:
         """ fills up the pokemon team according to battle mode zero
@@ -363,11 +368,12 @@ class PokeTeam:
                 self.team.append(pokemon)
 
     def fill_team_mode_two(self) -> None:
-        """ fills up the pokemon team according to battle mode two
-        :complexity: Best and worst case complexity is O(n*m) where n is the length of the team/sorted list and
+        """ creates the pokemon team according to battle mode two, loading all the pokemon into the sorted list
+        at once and indexing it in decreasing order
+        :complexity: Best and worst case complexity is O(n*m + n log n) where n is the length of the team/sorted list and
         m is the length of the team numbers
         """
-        
+        items = []
         for i in range(len(self.team_numbers)):
 
             for j in range(self.team_numbers[i]):
@@ -383,13 +389,15 @@ class PokeTeam:
                     pokemon = Eevee()
                     
                 if self.criterion == Criterion.SPD:
-                    self.team.add(ListItem(pokemon, pokemon.get_speed()))
+                    items.append(ListItem(pokemon, pokemon.get_speed()))
                 elif self.criterion == Criterion.HP:
-                    self.team.add(ListItem(pokemon, pokemon.get_hp()))
+                    items.append(ListItem(pokemon, pokemon.get_hp()))
                 elif self.criterion == Criterion.LV:
-                    self.team.add(ListItem(pokemon, pokemon.get_level()))
+                    items.append(ListItem(pokemon, pokemon.get_level()))
                 elif self.criterion == Criterion.DEF:
-                    self.team.add(ListItem(pokemon, pokemon.get_defence()))
+                    items.append(ListItem(pokemon, pokemon.get_defence()))
+
+        self.team = ArraySortedList.from_items(items, "decreasing")
     
     def get_team_numbers(self) -> list[int]:
         """ return the team numbers (list)
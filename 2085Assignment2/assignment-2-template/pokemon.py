@@ -1,735 +1,280 @@
-""" 
-This file provides 10 classes that represent the 10 pokemon in the specifications. 
+"""
+This file provides the table of the 10 pokemon species in the specifications and the 10 classes that represent them.
 
-Each of these 10 pokemon inherit from the pokemon base class to share common functionality but each of them have slight variations in their stat formulas and features.
+Each species only differs in its stat formulas, defence rule and evolution, so these are described as data in
+SPECIES and a single Pokemon class looks its formulas up in that table. The 10 pokemon classes only name their species.
 """
-from pokemon_base import PokemonBase, StatusEffect, PokeType
+from __future__ import annotations
+from pokemon_base import PokemonBase, PokeType, StatusEffect, STATUS_MODIFIERS
 __author__ = "Scaffold by Jackson Goerner, Code by Jun Yu Tan, Shyam Kamalesh Borkar, Rachit Bhatia and Jobin Dan"
-   
-class Charmander(PokemonBase):
-    """ Class for Charmander pokemon. All methods in this class have
-    a best/worst case complexity of O(1).
-    """
-    def __init__(self) -> None:
-        """ Initialise a Charmander object"""
-        self.level = 1
-        self.start_hp = 8 + (1 * self.level)
-        PokemonBase.__init__(self, self.start_hp, PokeType.FIRE)
-    
-    def level_up(self) -> None:
-        """ Level up Charmander"""
-        self.level += 1
-        new_max = 8 + (1 * self.level)
-        self.hp = new_max - (self.max_hp - self.hp)
-        self.max_hp = new_max
-    
-    def get_level(self):
-        """ Get Charmander's level"""
-        return self.level
-
-    def get_speed(self) -> int:
-        """ Get Charmander's speed stat"""
-        speed = 7 + (1 * self.level)
-        if self.status.value == "Paralysis":
-            speed = speed * 0.5 # speed is halved
-        speed = int (speed)
-        return speed
 
-    def get_attack_damage(self) -> int:
-        """ Get Charmander's attack stat"""
-        attack = 6 + (1 * self.level)
-        if self.status.value == "Burn":
-            attack = attack * 0.5 # attack is halved
 
-        return attack
+class StatFormula:
+    """ A stat that depends on the level of the pokemon: base + (per_level * level) // divisor """
 
-    def get_defence(self) -> int:
-        """ Get Charmander's defence pts stat"""
-        defence_pts = 4
-        return defence_pts
+    def __init__(self, base: int, per_level: int = 0, divisor: int = 1) -> None:
+        """ Initialise the formula
+        :param base: the value of the stat before the level is added
+        :param per_level: how much the stat grows per level (before dividing)
+        :param divisor: the level term is floor divided by this value
+        :complexity: Best and worst case complexity is O(1)
+        """
+        self.base = base
+        self.per_level = per_level
+        self.divisor = divisor
 
-    def defend(self, damage:int) -> int:
-        """ Charmander's defend mechanism.
-        :param damage: the other pokemon's effective attack
+    def at(self, level: int) -> int:
+        """ Value of the stat at the given level
+        :complexity: Best and worst case complexity is O(1)
         """
-        if damage > self.get_defence():
-            lost_hp = damage
-        else:
-            lost_hp = damage // 2
-        return lost_hp
-    
-    def get_poke_name(self) -> str:
-        """ Get pokemon's name"""
-        name = "Charmander"
-        return name
-    
-    def should_evolve(self) -> bool:
-        """ Indicates if the pokemon should evolve or not"""
-        should_evolve = False
-        if self.level >= 3:
-            should_evolve = True
-        return should_evolve
+        return self.base + (self.per_level * level) // self.divisor
 
-    def can_evolve(self) -> bool:
-        """ Indicates if the pokemon is capable of evolving"""
-        can_evolve = True
-        return can_evolve
 
-    def get_evolved_version(self) -> PokemonBase:
-        """ Returns the evolved version of Charmander"""
-        hp_difference = self.max_hp - self.hp
-        charizard = Charizard()
-        charizard.set_status_effect(self.get_status_effect())
-        charizard.lose_hp(hp_difference)
-        return charizard
-
-class Squirtle(PokemonBase):
-    """ Class for Squirtle pokemon. All methods in this class have
-    a best/worst case complexity of O(1).
-    """
-    def __init__(self) -> None:
-        """ Initialise a Squirtle object"""
-        self.level = 1
-        self.start_hp = 9 + (2 * self.level)
-        PokemonBase.__init__(self, self.start_hp, PokeType.WATER)
-    
-    def level_up(self) -> None:
-        """ Level up Squirtle"""
-        self.level += 1
-        new_max = 9 + (2 * self.level)
-        self.hp = new_max - (self.max_hp - self.hp)
-        self.max_hp = new_max
-    
-    def get_level(self):
-        """ Get Squirtle's level"""
-        return self.level
+def halve_unless_above(damage: int, threshold: int) -> int:
+    """ Defence rule: the full damage is taken above the threshold, otherwise half of it"""
+    if damage > threshold:
+        return damage
+    return damage // 2
 
-    def get_speed(self) -> int:
-        """ Get Squirtle's speed stat"""
-        speed = 7 
-        if self.status.value == "Paralysis":
-            speed = speed * 0.5 # speed is halved
-        speed = int (speed)
-        return speed
+def block_unless_reaching(damage: int, threshold: int) -> int:
+    """ Defence rule: the full damage is taken when it reaches the threshold, otherwise none of it"""
+    if damage >= threshold:
+        return damage
+    return 0
 
-    def get_attack_damage(self) -> int:
-        """ Get Squirtle's attack stat"""
-        attack = 4 + (self.level // 2)
-        if self.status.value == "Burn":
-            attack = attack * 0.5 # attack is halved
-        return attack
+def double_above(damage: int, threshold: int) -> int:
+    """ Defence rule: double the damage is taken above the threshold, otherwise the full damage"""
+    if damage > threshold:
+        return 2 * damage
+    return damage
 
-    def get_defence(self) -> int:
-        """ Get Squirtle's defence pts stat"""
-        defence_pts = 6 + self.level
-        return defence_pts
+def take_full(damage: int, threshold: int) -> int:
+    """ Defence rule: the full damage is always taken"""
+    return damage
 
-    def defend(self, damage:int) -> int:       
-        """ Squirtle's defend mechanism.
-        :param damage: the other pokemon's effective attack
-        """
-        if damage > (2 * self.get_defence()):
-            lost_hp = damage
-        else:
-            lost_hp = damage // 2
-        return lost_hp
-    
-    def get_poke_name(self) -> str:
-        """ Get pokemon's name"""
-        name = "Squirtle"
-        return name
-    
-    def should_evolve(self) -> bool:
-        """ Indicates if the pokemon should evolve or not"""
-        should_evolve = False
-        if self.level >= 3:
-            should_evolve = True
-        return should_evolve
 
-    def can_evolve(self) -> bool:
-        """ Indicates if the pokemon is capable of evolving"""
-        can_evolve = True
-        return can_evolve
+class Species:
+    """ Stats, defence rule and evolution of one pokemon species.
 
-    def get_evolved_version(self) -> PokemonBase:
-        """ Returns the evolved version of Squirtle"""
-        hp_difference = self.max_hp - self.hp
-        blastoise = Blastoise()
-        blastoise.set_status_effect(self.get_status_effect())
-        blastoise.lose_hp(hp_difference)
-        return blastoise
-
-class Bulbasaur(PokemonBase):
-    """ Class for Bulbasaur pokemon. All methods in this class have
-    a best/worst case complexity of O(1).
+    The speed, attack, defence and defend threshold of every level below TABLE_LEVELS are computed once,
+    when the species is created, and kept in tables that the getters of Pokemon only index. Speed and
+    attack are kept per status effect, with the status modifier already applied. Higher levels, which
+    battles do not reach in practice, fall back to the formulas.
     """
-    def __init__(self) -> None:
-        """ Initialise a Bulbasaur object"""
-        self.level = 1
-        self.start_hp = 12 + (1 * self.level)
-        PokemonBase.__init__(self, self.start_hp, PokeType.GRASS)
-    
-    def level_up(self) -> None:
-        """ Level up Bulbasaur"""
-        self.level += 1
-        new_max = 12 + (1 * self.level)
-        self.hp = new_max - (self.max_hp - self.hp)
-        self.max_hp = new_max
-    
-    def get_level(self):
-        """ Get Bulbasaur's level"""
-        return self.level
-
-    def get_speed(self) -> int:
-        """ Get Bulbasaur's speed stat"""
-        speed = 7 + (self.level // 2) 
-        if self.status.value == "Paralysis":
-            speed = speed * 0.5 # speed is halved
-        speed = int (speed)
-        return speed
-
-    def get_attack_damage(self) -> int:
-        """ Get Bulbasaur's attack stat"""
-        attack = 5
-        if self.status.value == "Burn":
-            attack = attack * 0.5 # attack is halved
-        return attack
-
-    def get_defence(self) -> int:
-        """ Get Bulbasaur's defence pts stat"""
-        defence_pts = 5
-        return defence_pts
-
-    def defend(self, damage:int) -> int:
-        """ Bulbasaur's defend mechanism.
-        :param damage: the other pokemon's effective attack
+    TABLE_LEVELS = 100
+
+    def __init__(self, name: str, poke_type: PokeType, start_level: int, hp: StatFormula, speed: StatFormula, attack: StatFormula,
+                 defence: StatFormula, defend_rule, threshold_scale: int = 1, threshold_offset: int = 0,
+                 evolve_level: int | None = None, evolves_into: str | None = None, evolve_keeps_level: bool = False) -> None:
+        """ Initialise a species
+        :param name: the name of the species
+        :param poke_type: the type of the species
+        :param start_level: the level of a newly created pokemon of this species
+        :param hp: formula of the max hp
+        :param speed: formula of the speed stat
+        :param attack: formula of the attack stat
+        :param defence: formula of the defence stat
+        :param defend_rule: function (damage, threshold) -> lost hp
+        :param threshold_scale: the defend threshold is defence * threshold_scale + threshold_offset
+        :param threshold_offset: the defend threshold is defence * threshold_scale + threshold_offset
+        :param evolve_level: the level from which the pokemon should evolve
+        :param evolves_into: the name of the species it evolves into, None if it cannot evolve
+        :param evolve_keeps_level: if the evolved pokemon is levelled up to the current level
+        :complexity: Best and worst case complexity is O(1)
         """
-        if damage > (self.get_defence() + 5):
-            lost_hp = damage
-        else:
-            lost_hp = damage // 2
-        return lost_hp
-    
-    def get_poke_name(self) -> str:
-        """ Get pokemon's name"""
-        name = "Bulbasaur"
-        return name
-    
-    def should_evolve(self) -> bool:
-        """ Indicates if the pokemon should evolve or not"""
-        should_evolve = False
-        if self.level >= 2:
-            should_evolve = True
-        return should_evolve
-
-    def can_evolve(self) -> bool:
-        """ Indicates if the pokemon is capable of evolving"""
-        can_evolve = True
-        return can_evolve
-
-    def get_evolved_version(self) -> PokemonBase:
-        """ Returns the evolved version of Bulbasaur"""
-        hp_difference = self.max_hp - self.hp
-        venusaur = Venusaur()
-        venusaur.set_status_effect(self.get_status_effect())
-        venusaur.lose_hp(hp_difference)
-        return venusaur
-
-class Gastly(PokemonBase):
-    """ Class for Gastly pokemon. All methods in this class have
-    a best/worst case complexity of O(1).
+        self.name = name
+        self.poke_type = poke_type
+        self.start_level = start_level
+        self.start_hp = hp.at(start_level)
+        self.hp = hp
+        self.speed = speed
+        self.attack = attack
+        self.defence = defence
+        self.defend_rule = defend_rule
+        self.threshold_scale = threshold_scale
+        self.threshold_offset = threshold_offset
+        self.evolve_level = evolve_level
+        self.evolves_into = evolves_into
+        self.evolve_keeps_level = evolve_keeps_level
+
+        levels = range(self.TABLE_LEVELS)
+        self.speed_table = {status: tuple(int(speed.at(level) * modifier.speed_multiplier) for level in levels)
+                            for status, modifier in STATUS_MODIFIERS.items()}
+        self.attack_table = {status: tuple(attack.at(level) * modifier.attack_multiplier for level in levels)
+                             for status, modifier in STATUS_MODIFIERS.items()}
+        self.defence_table = tuple(defence.at(level) for level in levels)
+        self.threshold_table = tuple(defence.at(level) * threshold_scale + threshold_offset for level in levels)
+
+
+# every species by name
+SPECIES = {species.name: species for species in (
+    Species("Charmander", PokeType.FIRE, 1, hp=StatFormula(8, 1), speed=StatFormula(7, 1), attack=StatFormula(6, 1),
+            defence=StatFormula(4), defend_rule=halve_unless_above, evolve_level=3, evolves_into="Charizard"),
+    Species("Squirtle", PokeType.WATER, 1, hp=StatFormula(9, 2), speed=StatFormula(7), attack=StatFormula(4, 1, 2),
+            defence=StatFormula(6, 1), defend_rule=halve_unless_above, threshold_scale=2, evolve_level=3, evolves_into="Blastoise"),
+    Species("Bulbasaur", PokeType.GRASS, 1, hp=StatFormula(12, 1), speed=StatFormula(7, 1, 2), attack=StatFormula(5),
+            defence=StatFormula(5), defend_rule=halve_unless_above, threshold_offset=5, evolve_level=2, evolves_into="Venusaur"),
+    Species("Gastly", PokeType.GHOST, 1, hp=StatFormula(6, 1, 2), speed=StatFormula(2), attack=StatFormula(4),
+            defence=StatFormula(8), defend_rule=take_full, evolve_level=1, evolves_into="Haunter", evolve_keeps_level=True),
+    Species("Eevee", PokeType.NORMAL, 1, hp=StatFormula(10), speed=StatFormula(7, 1), attack=StatFormula(6, 1),
+            defence=StatFormula(4, 1), defend_rule=block_unless_reaching),
+    Species("Charizard", PokeType.FIRE, 3, hp=StatFormula(12, 1), speed=StatFormula(9, 1), attack=StatFormula(10, 2),
+            defence=StatFormula(4), defend_rule=double_above),
+    Species("Blastoise", PokeType.WATER, 3, hp=StatFormula(15, 2), speed=StatFormula(10), attack=StatFormula(8, 1, 2),
+            defence=StatFormula(8, 1), defend_rule=halve_unless_above, threshold_scale=2),
+    Species("Venusaur", PokeType.GRASS, 2, hp=StatFormula(20, 1, 2), speed=StatFormula(3, 1, 2), attack=StatFormula(5),
+            defence=StatFormula(10), defend_rule=halve_unless_above, threshold_offset=5),
+    Species("Haunter", PokeType.GHOST, 1, hp=StatFormula(9, 1, 2), speed=StatFormula(6), attack=StatFormula(8),
+            defence=StatFormula(6), defend_rule=take_full, evolve_level=3, evolves_into="Gengar"),
+    Species("Gengar", PokeType.GHOST, 3, hp=StatFormula(12, 1, 2), speed=StatFormula(12), attack=StatFormula(18),
+            defence=StatFormula(3), defend_rule=take_full),
+)}
+
+
+class Pokemon(PokemonBase):
+    """ A pokemon whose formulas are looked up in its species. Subclasses set the species
+    class attribute. All methods in this class have a best/worst case complexity of O(1),
+    apart from get_evolved_version which is O(L) for a species that keeps L levels when evolving.
     """
-    def __init__(self) -> None:
-        """ Initialise a Gastly object"""
-        self.level = 1
-        self.start_hp = 6 + (self.level // 2)
-        PokemonBase.__init__(self, self.start_hp, PokeType.GHOST)
-    
-    def level_up(self) -> None:
-        """ Level up Gastly"""
-        self.level += 1
-        new_max = 6 + (self.level // 2)
-        self.hp = new_max - (self.max_hp - self.hp)
-        self.max_hp = new_max
-    
-    def get_level(self):
-        """ Get Gastly's level"""
-        return self.level
+    __slots__ = ('level', 'start_hp')
 
-    def get_speed(self) -> int:
-        """ Get Gastly's speed stat"""
-        speed = 2
-        if self.status.value == "Paralysis":
-            speed = speed * 0.5 # speed is halved
-        speed = int (speed)
-        return speed
-
-    def get_attack_damage(self) -> int:
-        """ Get Gastly's attack stat"""
-        attack = 4
-        if self.status.value == "Burn":
-            attack = attack * 0.5 # attack is halved
-        return attack
+    species: Species = None
 
-    def get_defence(self) -> int:
-        """ Get Gastly's defence pts stat"""
-        defence_pts = 8
-        return defence_pts
-
-    def defend(self, damage:int) -> int:
-        """ Gastly's defend mechanism.
-        :param damage: the other pokemon's effective attack
+    def __init__(self) -> None:
+        """ Initialise a pokemon of the species at its starting level. The attributes of
+        PokemonBase are set here directly as the start hp of every species is positive.
         """
-        lost_hp = damage
-        return lost_hp
-    
-    def get_poke_name(self) -> str:
-        """ Get pokemon's name"""
-        name = "Gastly"
-        return name
-    
-    def should_evolve(self) -> bool:
-        """ Indicates if the pokemon should evolve or not"""
-        should_evolve = False
-        if self.level >= 1:
-            should_evolve = True
-        return should_evolve
+        species = self.species
+        self.level = species.start_level
+        self.start_hp = self.hp = self.max_hp = species.start_hp
+        self.poke_type = species.poke_type
+        self.status = StatusEffect.NONE
 
-    def can_evolve(self) -> bool:
-        """ Indicates if the pokemon is capable of evolving"""
-        can_evolve = True
-        return can_evolve
+    def reset(self) -> None:
+        """ Puts the pokemon back in the state of a new pokemon of its species"""
+        Pokemon.__init__(self)
 
-    def get_evolved_version(self) -> PokemonBase:
-        """ Returns the evolved version of Gastly"""
-        hp_difference = self.max_hp - self.hp
-        haunter = Haunter()
-        haunter.set_status_effect(self.get_status_effect())
-        haunter.lose_hp(hp_difference)
-        # Hauter should have the same level as gastly. as they both start from level 1
-        for i in range(self.get_level() - 1):
-            haunter.level_up()
-            
-        return haunter
-
-class Eevee(PokemonBase):
-    """ Class for Eevee pokemon. All methods in this class have
-    a best/worst case complexity of O(1).
-    """
-    def __init__(self) -> None:
-        """ Initialise a Eevee object"""
-        self.level = 1
-        self.start_hp = 10
-        PokemonBase.__init__(self, self.start_hp, PokeType.NORMAL)
-    
     def level_up(self) -> None:
-        """ Level up Eevee"""
+        """ Level up the pokemon, keeping the hp it has lost"""
         self.level += 1
-        new_max = 10
+        new_max = self.species.hp.at(self.level)
         self.hp = new_max - (self.max_hp - self.hp)
         self.max_hp = new_max
-    
-    def get_level(self):
-        """ Get Eevee's level"""
-        return self.level
-
-    def get_speed(self) -> int:
-        """ Get Eevee's speed stat"""
-        speed = 7 + self.level
-        if self.status.value == "Paralysis":
-            speed = speed * 0.5 # speed is halved
-        speed = int (speed)
-        return speed
-
-    def get_attack_damage(self) -> int:
-        """ Get Eevee's attack stat"""
-        attack = 6 + self.level
-        if self.status.value == "Burn":
-            attack = attack * 0.5 # attack is halved
-        return attack
-
-    def get_defence(self) -> int:
-        """ Get Eevee's defence pts stat"""
-        defence_pts = 4 + self.level
-        return defence_pts
-
-    def defend(self, damage:int) -> int:
-        """ Eevee's defend mechanism.
-        :param damage: the other pokemon's effective attack
-        """
-        if damage >= self.get_defence():
-            lost_hp = damage
-        else:
-            lost_hp = 0
-        return lost_hp
-    
-    def get_poke_name(self) -> str:
-        """ Get pokemon's name"""
-        name = "Eevee"
-        return name
-    
-    def should_evolve(self) -> bool:
-        """ Indicates if the pokemon should evolve or not"""
-        should_evolve = False
-        return should_evolve
-
-    def can_evolve(self) -> bool:
-        """ Indicates if the pokemon is capable of evolving"""
-        can_evolve = False
-        return can_evolve
-
-    def get_evolved_version(self) -> PokemonBase:
-        """ Returns the evolved version of Eevee"""
-        return self
 
-class Charizard(PokemonBase):
-    """ Class for Charizard pokemon. All methods in this class have
-    a best/worst case complexity of O(1).
-    """
-    def __init__(self) -> None:
-        """ Initialise a Charizard object"""
-        self.level = 3
-        self.start_hp = 12 + (1 * self.level)
-        PokemonBase.__init__(self, self.start_hp, PokeType.FIRE)
-    
-    def level_up(self) -> None:
-        """ Level up Charizard"""
-        self.level += 1
-        new_max = 12 + (1 * self.level)
-        self.hp = new_max - (self.max_hp -self.hp)
-        self.max_hp = new_max
-    
     def get_level(self):
-        """ Get Charizard's level"""
+        """ Get the pokemon's level"""
         return self.level
 
     def get_speed(self) -> int:
-        """ Get Charizard's speed stat"""
-        speed = 9 + (1 * self.level)
-        if self.status.value == "Paralysis":
-            speed = speed * 0.5 # speed is halved
-        speed = int (speed)
-        return speed
+        """ Get the pokemon's speed stat, halved when paralysed"""
+        if self.level < Species.TABLE_LEVELS:
+            return self.species.speed_table[self.status][self.level]
+        return int(self.species.speed.at(self.level) * STATUS_MODIFIERS[self.status].speed_multiplier)
 
     def get_attack_damage(self) -> int:
-        """ Get Charizard's attack stat"""
-        attack = 10 + (2 * self.level)
-        if self.status.value == "Burn":
-            attack = attack * 0.5 # attack is halved
-        return attack
+        """ Get the pokemon's attack stat, halved when burnt"""
+        if self.level < Species.TABLE_LEVELS:
+            return self.species.attack_table[self.status][self.level]
+        return self.species.attack.at(self.level) * STATUS_MODIFIERS[self.status].attack_multiplier
 
     def get_defence(self) -> int:
-        """ Get Charizard's defence pts stat"""
-        defence_pts = 4
-        return defence_pts
+        """ Get the pokemon's defence pts stat"""
+        if self.level < Species.TABLE_LEVELS:
+            return self.species.defence_table[self.level]
+        return self.species.defence.at(self.level)
 
     def defend(self, damage:int) -> int:
-        """ Charizard's defend mechanism.
+        """ The pokemon's defend mechanism, given by the defence rule of its species.
         :param damage: the other pokemon's effective attack
         """
-        if damage > self.get_defence():
-            lost_hp = 2 * damage
+        species = self.species
+        if self.level < Species.TABLE_LEVELS:
+            threshold = species.threshold_table[self.level]
         else:
-            lost_hp = damage
-        return lost_hp
-    
-    def get_poke_name(self) -> str:
-        """ Get pokemon's name"""
-        name = "Charizard"
-        return name
-    
-    def should_evolve(self) -> bool:
-        """ Indicates if the pokemon should evolve or not"""
-        should_evolve = False
-        return should_evolve
-
-    def can_evolve(self) -> bool:
-        """ Indicates if the pokemon is capable of evolving"""
-        can_evolve = False
-        return can_evolve
-
-    def get_evolved_version(self) -> PokemonBase:
-        """ Returns the evolved version of Charizard"""
-        return self
-
-class Blastoise(PokemonBase):
-    """ Class for Blastoise pokemon. All methods in this class have
-    a best/worst case complexity of O(1).
-    """
-    def __init__(self) -> None:
-        """ Initialise a Blastoise object"""
-        self.level = 3
-        self.start_hp = 15 + (2 * self.level)
-        PokemonBase.__init__(self, self.start_hp, PokeType.WATER)
-    
-    def level_up(self) -> None:
-        """ Level up Blastoise"""
-        self.level += 1
-        new_max = 15 + (2 * self.level)
-        self.hp = new_max - (self.max_hp -self.hp)
-        self.max_hp = new_max
-    
-    def get_level(self):
-        """ Get Blastoise's level"""
-        return self.level
-
-    def get_speed(self) -> int:
-        """ Get Blastoise's speed stat"""
-        speed = 10
-        if self.status.value == "Paralysis":
-            speed = speed * 0.5 # speed is halved
-        speed = int (speed)
-        return speed
-
-    def get_attack_damage(self) -> int:
-        """ Get Blastoise's attack stat"""
-        attack = 8 + (self.level // 2)
-        if self.status.value == "Burn":
-            attack = attack * 0.5 # attack is halved
-        return attack
+            threshold = self.get_defence() * species.threshold_scale + species.threshold_offset
+        return species.defend_rule(damage, threshold)
 
-    def get_defence(self) -> int:
-        """ Get Blastoise's defence pts stat"""
-        defence_pts = 8 + (1 * self.level)
-        return defence_pts
-
-    def defend(self, damage:int) -> int:
-        """ Blastoise's defend mechanism.
-        :param damage: the other pokemon's effective attack
-        """
-        if damage > (2 * self.get_defence()):
-            lost_hp = damage
-        else:
-            lost_hp = damage // 2
-        return lost_hp
-    
     def get_poke_name(self) -> str:
         """ Get pokemon's name"""
-        name = "Blastoise"
-        return name
-    
-    def should_evolve(self) -> bool:
-        """ Indicates if the pokemon should evolve or not"""
-        should_evolve = False
-        return should_evolve
+        return self.species.name
 
-    def can_evolve(self) -> bool:
-        """ Indicates if the pokemon is capable of evolving"""
-        can_evolve = False
-        return can_evolve
-
-    def get_evolved_version(self) -> PokemonBase:
-        """ Returns the evolved version of Blastoise"""
-        return self
-
-class Venusaur(PokemonBase):
-    """ Class for Venusaur pokemon. All methods in this class have
-    a best/worst case complexity of O(1).
-    """
-    def __init__(self) -> None:
-        """ Initialise a Venusaur object"""
-        self.level = 2
-        self.start_hp = 20 + (self.level // 2)
-        PokemonBase.__init__(self, self.start_hp, PokeType.GRASS)
-    
-    def level_up(self) -> None:
-        """ Level up Venusaur"""
-        self.level += 1
-        new_max = 20 + (self.level // 2)
-        self.hp = new_max - (self.max_hp -self.hp)
-        self.max_hp = new_max
-    
-    def get_level(self):
-        """ Get Venusaur's level"""
-        return self.level
-
-    def get_speed(self) -> int:
-        """ Get Venusaur's speed stat"""
-        speed = 3 + (self.level // 2)
-        if self.status.value == "Paralysis":
-            speed = speed * 0.5 # speed is halved
-        speed = int (speed)
-        return speed
-
-    def get_attack_damage(self) -> int:
-        """ Get Venusaur's attack stat"""
-        attack = 5
-        if self.status.value == "Burn":
-            attack = attack * 0.5 # attack is halved
-        return attack
-
-    def get_defence(self) -> int:
-        """ Get Venusaur's defence pts stat"""
-        defence_pts = 10
-        return defence_pts
-
-    def defend(self, damage:int) -> int:
-        """ Venusaur's defend mechanism.
-        :param damage: the other pokemon's effective attack
-        """
-        if damage > (self.get_defence() + 5):
-            lost_hp = damage
-        else:
-            lost_hp = damage // 2
-        return lost_hp
-    
-    def get_poke_name(self) -> str:
-        """ Get pokemon's name"""
-        name = "Venusaur"
-        return name
-    
     def should_evolve(self) -> bool:
         """ Indicates if the pokemon should evolve or not"""
-        should_evolve = False
-        return should_evolve
+        evolve_level = self.species.evolve_level
+        return evolve_level is not None and self.level >= evolve_level
 
     def can_evolve(self) -> bool:
         """ Indicates if the pokemon is capable of evolving"""
-        can_evolve = False
-        return can_evolve
+        return self.species.evolves_into is not None
 
     def get_evolved_version(self) -> PokemonBase:
-        """ Returns the evolved version of Venusaur"""
-        return self
-
-class Haunter(PokemonBase):
-    """ Class for Haunter pokemon. All methods in this class have
-    a best/worst case complexity of O(1).
-    """
-    def __init__(self) -> None:
-        """ Initialise a Haunter object"""
-        self.level = 1
-        self.start_hp = 9 + (self.level // 2)
-        PokemonBase.__init__(self, self.start_hp, PokeType.GHOST)
-    
-    def level_up(self) -> None:
-        """ Level up Haunter"""
-        self.level += 1
-        new_max = 9 + (self.level // 2)
-        self.hp = new_max - (self.max_hp -self.hp)
-        self.max_hp = new_max
-    
-    def get_level(self):
-        """ Get Haunter's level"""
-        return self.level
-
-    def get_speed(self) -> int:
-        """ Get Haunter's speed stat"""
-        speed = 6
-        if self.status.value == "Paralysis":
-            speed = speed * 0.5 # speed is halved
-        speed = int (speed)
-        return speed
-
-    def get_attack_damage(self) -> int:
-        """ Get Haunter's attack stat"""
-        attack = 8
-        if self.status.value == "Burn":
-            attack = attack * 0.5 # attack is halved
-        return attack
-
-    def get_defence(self) -> int:
-        """ Get Haunter's defence pts stat"""
-        defence_pts = 6
-        return defence_pts
-
-    def defend(self, damage:int) -> int:
-        """ Haunter's defend mechanism.
-        :param damage: the other pokemon's effective attack
+        """ Returns the evolved version of the pokemon, with the same lost hp and status.
+        Returns the pokemon itself if its species does not evolve.
         """
-        lost_hp = damage 
-        return lost_hp
-    
-    def get_poke_name(self) -> str:
-        """ Get pokemon's name"""
-        name = "Haunter"
-        return name
-    
-    def should_evolve(self) -> bool:
-        """ Indicates if the pokemon should evolve or not"""
-        should_evolve = False
-        if self.level >= 3:
-            should_evolve = True
-        return should_evolve
-
-    def can_evolve(self) -> bool:
-        """ Indicates if the pokemon is capable of evolving"""
-        can_evolve = True
-        return can_evolve
-
-    def get_evolved_version(self) -> PokemonBase:
-        """ Returns the evolved version of Haunter"""
+        species = self.species
+        if species.evolves_into is None:
+            return self
         hp_difference = self.max_hp - self.hp
-        gengar = Gengar()
-        gengar.set_status_effect(self.get_status_effect())
-        gengar.lose_hp(hp_difference)
-        return gengar
-
-class Gengar(PokemonBase):
-    """ Class for Gengar pokemon. All methods in this class have
-    a best/worst case complexity of O(1).
-    """
-    def __init__(self) -> None:
-        """ Initialise a Gengar object"""
-        self.level = 3
-        self.start_hp = 12 + (self.level // 2)
-        PokemonBase.__init__(self, self.start_hp, PokeType.GHOST)
-    
-    def level_up(self) -> None:
-        """ Level up Gengar"""
-        self.level += 1
-        new_max = 12 + (self.level // 2)
-        self.hp = new_max - (self.max_hp -self.hp)
-        self.max_hp = new_max
-    
-    def get_level(self):
-        """ Get Gengar's level"""
-        return self.level
-
-    def get_speed(self) -> int:
-        """ Get Gengar's speed stat"""
-        speed = 12
-        if self.status.value == "Paralysis":
-            speed = speed * 0.5 # speed is halved
-        speed = int (speed)
-        return speed
-
-    def get_attack_damage(self) -> int:
-        """ Get Gengar's attack stat"""
-        attack = 18
-        if self.status.value == "Burn":
-            attack = attack * 0.5 # attack is halved
-        return attack
-
-    def get_defence(self) -> int:
-        """ Get Gengar's defence pts stat"""
-        defence_pts = 3
-        return defence_pts
-
-    def defend(self, damage:int) -> int:
-        """ Gengar's defend mechanism.
-        :param damage: the other pokemon's effective attack
-        """
-        lost_hp = damage 
-        return lost_hp
-    
-    def get_poke_name(self) -> str:
-        """ Get pokemon's name"""
-        name = "Gengar"
-        return name
-    
-    def should_evolve(self) -> bool:
-        """ Indicates if the pokemon should evolve or not"""
-        should_evolve = False
-        return should_evolve
-
-    def can_evolve(self) -> bool:
-        """ Indicates if the pokemon is capable of evolving"""
-        can_evolve = False
-        return can_evolve
-
-    def get_evolved_version(self) -> PokemonBase:
-        """ Returns the evolved version of Gengar"""
-        return self
-
-
+        evolved = POKEMON_CLASSES[species.evolves_into]()
+        evolved.set_status_effect(self.get_status_effect())
+        evolved.lose_hp(hp_difference)
+        if species.evolve_keeps_level:
+            # the evolved pokemon starts from level 1 like this one, so it is levelled up to the same level
+            for i in range(self.level - evolved.level):
+                evolved.level_up()
+        return evolved
+
+
+class Charmander(Pokemon):
+    """ Class for Charmander pokemon."""
+    __slots__ = ()
+    species = SPECIES["Charmander"]
+
+class Squirtle(Pokemon):
+    """ Class for Squirtle pokemon."""
+    __slots__ = ()
+    species = SPECIES["Squirtle"]
+
+class Bulbasaur(Pokemon):
+    """ Class for Bulbasaur pokemon."""
+    __slots__ = ()
+    species = SPECIES["Bulbasaur"]
+
+class Gastly(Pokemon):
+    """ Class for Gastly pokemon."""
+    __slots__ = ()
+    species = SPECIES["Gastly"]
+
+class Eevee(Pokemon):
+    """ Class for Eevee pokemon."""
+    __slots__ = ()
+    species = SPECIES["Eevee"]
+
+class Charizard(Pokemon):
+    """ Class for Charizard pokemon."""
+    __slots__ = ()
+    species = SPECIES["Charizard"]
+
+class Blastoise(Pokemon):
+    """ Class for Blastoise pokemon."""
+    __slots__ = ()
+    species = SPECIES["Blastoise"]
+
+class Venusaur(Pokemon):
+    """ Class for Venusaur pokemon."""
+    __slots__ = ()
+    species = SPECIES["Venusaur"]
+
+class Haunter(Pokemon):
+    """ Class for Haunter pokemon."""
+    __slots__ = ()
+    species = SPECIES["Haunter"]
+
+class Gengar(Pokemon):
+    """ Class for Gengar pokemon."""
+    __slots__ = ()
+    species = SPECIES["Gengar"]
+
+
+# the class of every species by name, used to create evolved pokemon
+POKEMON_CLASSES = {cls.species.name: cls for cls in (Charmander, Squirtle, Bulbasaur, Gastly, Eevee, Charizard, Blastoise, Venusaur, Haunter, Gengar)}
@@ -8,7 +8,8 @@ __docformat__ = 'reStructuredText'
 
 import unittest
 from abc import ABC, abstractmethod 
-from typing import TypeVar, Generic
+from array import array
+from typing import TypeVar, Generic, Iterator
 from referential_array import ArrayR, T
 from stack_adt import ArrayStack
 
@@ -55,13 +56,17 @@ class CircularQueue(Queue[T]):
          array (ArrayR[T]): array storing the elements of the queue
 
     ArrayR cannot create empty arrays. So MIN_CAPCITY used to avoid this.
+
+    A growable queue is never full: when its array is full it moves to one
+    twice as long, so appending is amortised O(1).
     """
     MIN_CAPACITY = 1 
 
-    def __init__(self,max_capacity:int) -> None:
+    def __init__(self,max_capacity:int, growable: bool = False) -> None:
         Queue.__init__(self)
         self.front = 0
         self.rear = 0
+        self.growable = growable
         self.array = ArrayR(max(self.MIN_CAPACITY,max_capacity))
 
 
@@ -69,9 +74,12 @@ class CircularQueue(Queue[T]):
         """ Adds an element to the rear of the queue.
         :pre: queue is not full
         :raises Exception: if the queueu is full
+        :complexity: O(1), amortised O(1) when the queue grows
         """
-        if self.is_full():
-            raise Exception("Queue is full")
+        if self.length == len(self.array):
+            if not self.growable:
+                raise Exception("Queue is full")
+            self._grow(self.length + 1)
 
         self.array[self.rear] = item
         self.length += 1
@@ -90,9 +98,74 @@ class CircularQueue(Queue[T]):
         self.front = (self.front+1) % len(self.array)
         return item 
 
+    def __iter__(self) -> Iterator[T]:
+        """ Iterates over the elements from the front to the rear, in the order serve would
+        return them, without changing the queue.
+        :pre: the queue does not change during the iteration
+        """
+        array = self.array
+        capacity = len(array)
+        for i in range(self.length):
+            yield array[(self.front + i) % capacity]
+
+    def extend(self, items) -> None:
+        """ Appends the items of a list or ArrayR in order, copying them in at most two blocks.
+        :raises Exception: if the queue is not growable and the items do not fit
+        :complexity: O(n) where n is the number of items, amortised when the queue grows
+        """
+        count = len(items)
+        if len(self) + count > len(self.array):
+            if not self.growable:
+                raise Exception("Queue is full")
+            self._grow(len(self) + count)
+
+        first = min(count, len(self.array) - self.rear)
+        self.array.copy_block(self.rear, items, 0, first)
+        self.array.copy_block(0, items, first, count - first)
+        self.length += count
+        self.rear = (self.rear + count) % len(self.array)
+
+    def reset_from(self, items: list[T]) -> None:
+        """ Empties the queue, then holds the items with items[0] at the front, in the order the
+        queue iterates in, so queue.reset_from(list(queue)) leaves the same elements in the same order.
+        :raises Exception: if the queue is not growable and the items do not fit
+        :complexity: O(n) where n is the number of items
+        """
+        CircularQueue.clear(self)
+        CircularQueue.extend(self, items)
+
+    def serve_many(self, count: int) -> list[T]:
+        """ Deletes and returns the count elements at the queue's front, in order, as a list.
+        :pre: the queue has at least count elements
+        :raises Exception: if the queue has fewer than count elements
+        :complexity: O(count)
+        """
+        if count > len(self):
+            raise Exception("Queue has fewer elements than requested")
+
+        first = min(count, len(self.array) - self.front)
+        items = self.array.get_block(self.front, first) + self.array.get_block(0, count - first)
+        self.length -= count
+        self.front = (self.front + count) % len(self.array)
+        return items
+
+    def _grow(self, capacity: int) -> None:
+        """ Moves the elements, from the front, to the start of a new array of at least the given capacity
+        and at least twice as long as the current one.
+        :complexity: O(n) where n is the number of elements
+        """
+        old_array = self.array
+        self.array = ArrayR(max(capacity, 2 * len(old_array)))
+        first = min(len(self), len(old_array) - self.front)
+        self.array.copy_block(0, old_array, self.front, first)
+        self.array.copy_block(first, old_array, 0, len(self) - first)
+        old_array.release()
+        self.front = 0
+        self.rear = len(self)
+
     def is_full(self) -> bool:
         """ True if the queue is full and no element can be appended. """
-        return len(self) == len(self.array)
+        return not self.growable and len(self) == len(self.array)
  
     def clear(self) -> None:
         """ Clears all elements from the queue. """
@@ -101,6 +174,97 @@ class CircularQueue(Queue[T]):
         self.rear = 0
 
 
+class PairedCircularQueue(CircularQueue[T]):
+    """ Circular queue where every element is paired with an integer value, such as
+    the lives of a team. The values are kept in an integer array next to the array of
+    elements (a struct of arrays) and share its front and rear, instead of being in a
+    second queue that has to be served in lockstep.
+
+    Attributes:
+         values (array): value of the element in the same position of array
+         served_value (int): value of the element served last
+    """
+
+    def __init__(self, max_capacity: int, growable: bool = False) -> None:
+        CircularQueue.__init__(self, max_capacity, growable)
+        self.values = array('q', [0]) * len(self.array)
+        self.served_value = 0
+
+    def append(self, item: T, value: int = None) -> None:
+        """ Adds an element and its value to the rear of the queue. The value defaults
+        to the value of the element served last, so that serving an element and
+        appending it back keeps its value.
+        :pre: queue is not full
+        :raises Exception: if the queueu is full
+        :complexity: O(1), amortised O(1) when the queue grows
+        """
+        CircularQueue.append(self, item)
+        self.values[self.rear - 1] = self.served_value if value is None else value
+
+    def serve(self) -> T:
+        """ Deletes and returns the element at the queue's front, keeping its value in served_value.
+        :pre: queue is not empty
+        :raises Exception: if the queue is empty
+        """
+        item = CircularQueue.serve(self)
+        self.served_value = self.values[self.front - 1]
+        return item
+
+    def serve_pair(self) -> tuple[T, int]:
+        """ Deletes and returns the element at the queue's front together with its value.
+        :pre: queue is not empty
+        :raises Exception: if the queue is empty
+        """
+        item = self.serve()
+        return item, self.served_value
+
+    def extend(self, items, values: list[int] = None) -> None:
+        """ Appends the items of a list or ArrayR and their values (0 by default) in order.
+        :pre: values, if given, has one value per item
+        :raises Exception: if the queue is not growable and the items do not fit
+        :complexity: O(n) where n is the number of items, amortised when the queue grows
+        """
+        CircularQueue.extend(self, items)
+        count = len(items)
+        values = array('q', [0]) * count if values is None else array('q', values)
+        start = (self.rear - count) % len(self.array)
+        first = min(count, len(self.array) - start)
+        self.values[start:start + first] = values[:first]
+        self.values[:count - first] = values[first:]
+
+    def reset_from(self, items: list[T], values: list[int] = None) -> None:
+        """ Empties the queue, then holds the items and their values (0 by default), with items[0] at the front.
+        :pre: values, if given, has one value per item
+        :raises Exception: if the queue is not growable and the items do not fit
+        :complexity: O(n) where n is the number of items
+        """
+        self.clear()
+        self.extend(items, values)
+
+    def serve_many(self, count: int) -> list[T]:
+        """ Deletes and returns the count elements at the queue's front, keeping the value
+        of the last one in served_value.
+        :pre: the queue has at least count elements
+        :raises Exception: if the queue has fewer than count elements
+        :complexity: O(count)
+        """
+        items = CircularQueue.serve_many(self, count)
+        if count > 0:
+            self.served_value = self.values[self.front - 1]
+        return items
+
+    def _grow(self, capacity: int) -> None:
+        """ Moves the elements and their values to the start of new arrays.
+        :complexity: O(n) where n is the number of elements
+        """
+        old_values, front = self.values, self.front
+        CircularQueue._grow(self, capacity)
+        self.values = array('q', [0]) * len(self.array)
+        first = min(len(self), len(old_values) - front)
+        self.values[:first] = old_values[front:front + first]
+        self.values[first:len(self)] = old_values[:len(self) - first]
+
+
 class TestQueue(unittest.TestCase):
     """ Tests for the above class."""
     EMPTY = 0
@@ -5,45 +5,147 @@ __author__ = "Jackson Goerner"
 
 import time
 
-class RandomGen():
+class RandomStream:
     """
-    Class used to generate (seeded) random numbers for interesting outcomes and repeatable tests.
-    
-    Uses LCG method. All methods are O(1) best/worst case time complexity.
-    
+    A (seeded) stream of random numbers, using the LCG method. All methods are O(1) best/worst case
+    time complexity, apart from the fill methods, jump, jump_coefficients and split.
+
+    Streams are independent of each other, so several simulations can each own one. RandomGen is
+    the default stream that the game draws from.
+
     Usage:
     ```
-    RandomGen.set_seed(123)
-    RandomGen.random()           # Random number from 0 to 2^32-1
-    RandomGen.randint(1, 10)     # Random number from 1 to 10
-    RandomGen.random_chance(0.33) # True 33% of the time, False 67% of the time.
+    stream = RandomStream(123)
+    stream.random()              # Random number from 0 to 2^32-1
+    stream.randint(1, 10)        # Random number from 1 to 10
+    stream.random_chance(0.33)   # True 33% of the time, False 67% of the time.
+    stream.fill_randint(array('i', [0] * 8), 1, 10)  # The next 8 randint(1, 10), in a buffer
+    stream.jump(1000)            # Skip the next 1000 numbers
+    first, second = stream.split(2)  # Two streams that do not overlap for 2^32 numbers each
     ```
     """
-    
+
     MOD = pow(2, 48)
     A = 25214903917
     C = 11
-    
-    seed = time.time_ns()
-    
-    @classmethod
-    def set_seed(cls, seed=None):
+    # numbers each substream of split() can draw before reaching the next one
+    SPLIT_STRIDE = 1 << 32
+
+    def __init__(self, seed=None):
+        """Creates a stream, seeded like `set_seed`."""
+        self.set_seed(seed)
+
+    def set_seed(self, seed=None):
         """Seed all future calls to `random`."""
-        seed = time.time_ns() if seed is None else seed
-        cls.seed = seed
-    
-    @classmethod
-    def random(cls):
+        self.seed = time.time_ns() if seed is None else seed
+
+    def random(self):
         """Returns a random integer from 0 to 2^32-1"""
-        cls.seed = (cls.A * cls.seed + cls.C) % cls.MOD
-        return cls.seed >> 16
+        self.seed = (self.A * self.seed + self.C) % self.MOD
+        return self.seed >> 16
 
-    @classmethod
-    def randint(cls, lo, hi):
+    def randint(self, lo, hi):
         """Returns a random integer from `lo` to `hi` inclusive on both ends."""
-        return (cls.random() % (hi - lo + 1)) + lo
+        return (self.random() % (hi - lo + 1)) + lo
 
-    @classmethod
-    def random_chance(cls, ratio):
+    def random_chance(self, ratio):
         """Returns random()/2^32 < ratio"""
-        return cls.random()/(1 << 32) < ratio
+        return self.random()/(1 << 32) < ratio
+
+    def fill(self, buffer):
+        """Fills `buffer` (an array, list or any mutable sequence) with the next len(buffer) numbers of
+        `random`, in order, and returns it. O(len(buffer))."""
+        seed, a, c, mask = self.seed, self.A, self.C, self.MOD - 1
+        for i in range(len(buffer)):
+            seed = (a * seed + c) & mask  # the same as % MOD, as MOD is a power of 2
+            buffer[i] = seed >> 16
+        self.seed = seed
+        return buffer
+
+    def fill_randint(self, buffer, lo, hi):
+        """Fills `buffer` with the next len(buffer) numbers of `randint(lo, hi)` and returns it. O(len(buffer))."""
+        seed, a, c, mask = self.seed, self.A, self.C, self.MOD - 1
+        span = hi - lo + 1
+        for i in range(len(buffer)):
+            seed = (a * seed + c) & mask
+            buffer[i] = (seed >> 16) % span + lo
+        self.seed = seed
+        return buffer
+
+    def fill_chance(self, buffer, ratio):
+        """Fills `buffer` with the next len(buffer) results of `random_chance(ratio)` (as 1 or 0 in an
+        integer array) and returns it. O(len(buffer))."""
+        seed, a, c, mask = self.seed, self.A, self.C, self.MOD - 1
+        for i in range(len(buffer)):
+            seed = (a * seed + c) & mask
+            buffer[i] = (seed >> 16)/(1 << 32) < ratio
+        self.seed = seed
+        return buffer
+
+    def jump(self, n):
+        """Skips the next `n` numbers in O(log n), by composing the LCG step with itself."""
+        multiplier, increment = self.jump_coefficients(n)
+        self.seed = (multiplier * self.seed + increment) % self.MOD
+
+    @classmethod
+    def jump_coefficients(cls, n):
+        """Returns (multiplier, increment) such that skipping `n` numbers maps the seed x to
+        (multiplier * x + increment) % MOD. O(log n)."""
+        multiplier, increment = 1, 0
+        a, c = cls.A, cls.C
+        while n > 0:
+            if n & 1:
+                multiplier, increment = (a * multiplier) % cls.MOD, (a * increment + c) % cls.MOD
+            # the step applied twice: x -> a(ax + c) + c
+            a, c = (a * a) % cls.MOD, (a * c + c) % cls.MOD
+            n >>= 1
+        return multiplier, increment
+
+    def split(self, count, stride=None):
+        """Returns `count` new streams. Stream i starts `i * stride` numbers ahead of this one, so the
+        streams do not overlap while each draws less than `stride` numbers. This stream then skips
+        past all of them. O(count + log stride)."""
+        multiplier, increment = self.jump_coefficients(self.SPLIT_STRIDE if stride is None else stride)
+        streams = []
+        for _ in range(count):
+            streams.append(RandomStream(self.seed))
+            self.seed = (multiplier * self.seed + increment) % self.MOD
+        return streams
+
+
+# the stream RandomGen draws from
+DEFAULT_STREAM = RandomStream()
+
+
+class RandomGen():
+    """
+    Class used to generate (seeded) random numbers for interesting outcomes and repeatable tests.
+
+    The methods of the class are the bound methods of one default RandomStream, DEFAULT_STREAM, so
+    calling them costs the same as calling the stream.
+
+    Usage:
+    ```
+    RandomGen.set_seed(123)
+    RandomGen.random()           # Random number from 0 to 2^32-1
+    RandomGen.randint(1, 10)     # Random number from 1 to 10
+    RandomGen.random_chance(0.33) # True 33% of the time, False 67% of the time.
+    RandomGen.fill_randint(array('i', [0] * 8), 1, 10)  # The next 8 randint(1, 10), in a buffer
+    first, second = RandomGen.split(2)  # Two independent RandomStreams split from the default stream
+    ```
+    """
+
+    MOD = RandomStream.MOD
+    A = RandomStream.A
+    C = RandomStream.C
+    SPLIT_STRIDE = RandomStream.SPLIT_STRIDE
+
+    set_seed = DEFAULT_STREAM.set_seed
+    random = DEFAULT_STREAM.random
+    randint = DEFAULT_STREAM.randint
+    random_chance = DEFAULT_STREAM.random_chance
+    fill = DEFAULT_STREAM.fill
+    fill_randint = DEFAULT_STREAM.fill_randint
+    fill_chance = DEFAULT_STREAM.fill_chance
+    jump = DEFAULT_STREAM.jump
+    split = DEFAULT_STREAM.split
@@ -12,25 +12,79 @@ space to hold the references.
 Note that while I do check the precondition in __init__ (noone else
 would), I do not check that of getitem or setitem, since that is already
 checked by self.array[index].
+
+The space is filled with None by one slice assignment of a list of None,
+which ctypes does in C. ctypes keeps the object last stored in a slot
+alive until another object that is not None is stored there, so the
+space of a released array is reset with a slice of PLACEHOLDER, which
+drops the objects it referred to, then a slice of None. It is then kept
+in a freelist per length, up to FREELIST_BYTES in total, so containers
+that are created and dropped over and over reuse the same memory. A released array gives up its space, so using it afterwards
+raises instead of reaching a reused space.
 """
 __author__ = "Julian Garcia for the __init__ code, Maria Garcia de la Banda for the rest"
 __docformat__ = 'reStructuredText'
 
-from ctypes import py_object
+from ctypes import py_object, sizeof
 from typing import TypeVar, Generic
 
 T = TypeVar('T')
 
+class ReleasedSpace:
+    """ Stands in for the space of a released array, so that using the array raises """
+
+    def released(self, *args) -> None:
+        raise ValueError("The array was released.")
+
+    __len__ = __getitem__ = __setitem__ = released
+
+
+RELEASED = ReleasedSpace()
+# stored in the slots of a released space before None, so that ctypes stops keeping their objects alive
+PLACEHOLDER = object()
+
+
 class ArrayR(Generic[T]):
+    # longest array kept in the freelist once released
+    MAX_REUSED_LENGTH = 4096
+    # most bytes of released spaces kept for reuse, over all lengths
+    FREELIST_BYTES = 1 << 20
+
+    freelist = {}       # released spaces by length
+    freelist_bytes = 0  # bytes of the spaces in the freelist
+
     def __init__(self, length: int) -> None:
         """ Creates an array of references to objects of the given length
-        :complexity: O(length) for best/worst case to initialise to None
+        :complexity: O(length) for best/worst case to initialise to None, done in C
         :pre: length > 0
         """
         if length <= 0:
             raise ValueError("Array length should be larger than 0.")
+        released = ArrayR.freelist.get(length)
+        if released:
+            self.array = released.pop()
+            ArrayR.freelist_bytes -= sizeof(self.array)
+            return
         self.array = (length * py_object)() # initialises the space
-        self.array[:] =  [None for _ in range(length)]
+        self.array[:] = [None] * length
+
+    def release(self) -> None:
+        """ Gives the space of the array back for reuse by a later array of the same length, if it is
+        no longer than MAX_REUSED_LENGTH and the freelist has room for it. The space is reset to None
+        first, so the objects it referred to can be freed. Using the array afterwards raises ValueError.
+        :complexity: O(length) for best/worst case, done in C
+        """
+        space = self.array
+        if space is RELEASED:
+            return
+        self.array = RELEASED
+        size = sizeof(space)
+        if len(space) > ArrayR.MAX_REUSED_LENGTH or ArrayR.freelist_bytes + size > ArrayR.FREELIST_BYTES:
+            return
+        space[:] = [PLACEHOLDER] * len(space)
+        space[:] = [None] * len(space)
+        ArrayR.freelist.setdefault(len(space), []).append(space)
+        ArrayR.freelist_bytes += size
 
     def __len__(self) -> int:
         """ Returns the length of the array
@@ -51,3 +105,33 @@ class ArrayR(Generic[T]):
         :pre: index in between 0 and length - self.array[] checks it
         """
         self.array[index] = value
+
+    def copy_block(self, index: int, source, source_index: int, count: int) -> None:
+        """ Copies count references from source[source_index:] to positions index onwards, with one slice
+        read and one slice write on the ctypes buffers. The source can be this array (overlapping blocks
+        are copied as if through a temporary, like memmove), another ArrayR or a Python list.
+        :complexity: O(count), done in C
+        :pre: both blocks are within the bounds of their arrays
+        """
+        if count <= 0:
+            return
+        data = source.array if isinstance(source, ArrayR) else source
+        self.array[index:index + count] = data[source_index:source_index + count]
+
+    def get_block(self, index: int, count: int) -> list[T]:
+        """ Returns the references in positions index to index + count - 1 as a Python list, with one
+        slice read on the ctypes buffer.
+        :complexity: O(count), done in C
+        :pre: the block is within the bounds of the array
+        """
+        if count <= 0:
+            return []
+        return self.array[index:index + count]
+
+    def move_block(self, index: int, source_index: int, count: int) -> None:
+        """ Moves count references from position source_index onwards to position index onwards within
+        this array. The positions left behind keep their old references.
+        :complexity: O(count), done in C
+        :pre: both blocks are within the bounds of the array
+        """
+        self.copy_block(index, self, source_index, count)
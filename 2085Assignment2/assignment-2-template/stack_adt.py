@@ -8,7 +8,7 @@ __docformat__ = 'reStructuredText'
 
 import unittest
 from abc import ABC, abstractmethod 
-from typing import TypeVar, Generic
+from typing import TypeVar, Generic, Iterator
 from referential_array import ArrayR, T
 
 class Stack(ABC, Generic[T]):
@@ -99,6 +99,26 @@ class ArrayStack(Stack[T]):
             raise Exception("Stack is empty")
         return self.array[self.length-1]
 
+    def __iter__(self) -> Iterator[T]:
+        """ Iterates over the elements from the top to the bottom, in the order pop would
+        return them, without changing the stack.
+        :pre: the stack does not change during the iteration
+        """
+        array = self.array
+        for i in range(self.length - 1, -1, -1):
+            yield array[i]
+
+    def reset_from(self, items: list[T]) -> None:
+        """ Empties the stack, then holds the items with items[0] on top, in the order the stack
+        iterates in, so stack.reset_from(list(stack)) leaves it as it was.
+        :raises Exception: if the items do not fit in the stack
+        :complexity: O(n) where n is the number of items
+        """
+        if len(items) > len(self.array):
+            raise Exception("Stack is full")
+        self.array.copy_block(0, items[::-1], 0, len(items))
+        self.length = len(items)
+
 class TestStack(unittest.TestCase):
     """ Tests for the above class."""
     EMPTY = 0
@@ -183,6 +203,16 @@ class TestStack(unittest.TestCase):
             self.assertEqual(len(stack), 0)
             self.assertTrue(stack.is_empty())
 
+    def test_reset_from(self):
+        """ Tests that a stack reset from its own items is unchanged, and from too many items raises."""
+        for stack in self.stacks:
+            items = list(stack)
+            stack.reset_from(items)
+            self.assertEqual(list(stack), items)
+            stack.reset_from([1, 2])
+            self.assertEqual(stack.pop(), 1)
+            self.assertRaises(Exception, lambda: stack.reset_from([0] * (self.CAPACITY + 1)))
+
 if __name__ == '__main__':
     testtorun = TestStack()
     suite = unittest.TestLoader().loadTestsFromModule(testtorun)
@@ -0,0 +1,564 @@
+"""
+Struct-of-arrays storage for many poke teams, and a batch kernel that plays many battles at once.
+
+A TeamStore keeps the species, type, status, level, hp and max hp of every pokemon of N teams in
+parallel typed arrays (one slot per pokemon, MAX_TEAM_SIZE slots per team) instead of one Python
+object per pokemon. BatchBattle plays N independent Battle.battle matches between ALWAYS_ATTACK
+teams on top of such a store, advancing every unfinished match by one turn per step.
+
+With NumPy installed, a step is a fixed sequence of operations on whole columns of the unfinished
+matches: masks of the pokemon that fainted and are replaced, the speed order, the sleeping,
+confused and status-inflicting attackers, the damage of each attack, the end of round hp loss,
+the pokemon that faint, level up and evolve, and the matches that end. NumPy is optional: without
+it the matches play their turns one after the other with the scalar methods of TeamStore.
+
+Both paths follow the scalar rules exactly: PokemonBase.attack with its status modifiers,
+the speed ordering of Battle.both_attack, the 1 hp lost by both pokemon at the end of a round,
+level up of the pokemon that made its opponent faint, and evolution using the SPECIES formulas.
+"""
+from __future__ import annotations
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # BatchBattle then plays the matches one at a time
+    np = None
+
+from poke_team import PokeTeam
+from pokemon import POKEMON_CLASSES, SPECIES, Species, block_unless_reaching, double_above, halve_unless_above, take_full
+from pokemon_base import INFLICTED_STATUS, POKE_TYPE_INDEX, STATUS_MODIFIERS, TYPE_EFFECTIVENESS, PokemonBase, PokeType, StatusEffect
+from random_gen import RandomGen, RandomStream
+
+__author__ = "Code by Jun Yu Tan, Shyam Kamalesh Borkar, Rachit Bhatia and Jobin Dan"
+
+# species, status effects and their modifiers, indexed by the small integers kept in the store
+SPECIES_ORDER = tuple(SPECIES.values())
+SPECIES_INDEX = {species.name: index for index, species in enumerate(SPECIES_ORDER)}
+STATUS_ORDER = tuple(StatusEffect)
+STATUS_INDEX = {status: index for index, status in enumerate(STATUS_ORDER)}
+MODIFIERS = tuple(STATUS_MODIFIERS[status] for status in STATUS_ORDER)
+# status index inflicted by an attacker of each type index
+INFLICTED = tuple(STATUS_INDEX[INFLICTED_STATUS[poke_type]] for poke_type in PokeType)
+NO_STATUS = STATUS_INDEX[StatusEffect.NONE]
+# how each defence rule scales the damage (multiplier reaching the threshold, numerator and divisor below it)
+# and if damage equal to the threshold reaches it
+DEFEND_RULE_COLUMNS = {
+    halve_unless_above: (1, 1, 2, False),
+    block_unless_reaching: (1, 0, 1, True),
+    double_above: (2, 1, 1, False),
+    take_full: (1, 1, 1, False),
+}
+
+
+class TeamStore:
+    """ The pokemon of many teams kept in parallel arrays. The pokemon of team t are in
+    slots t * MAX_TEAM_SIZE onwards, in the order the team would send them into battle.
+    """
+    MAX_TEAM_SIZE = 6
+
+    def __init__(self, teams: list[PokeTeam]) -> None:
+        """ Copies the current state of the pokemon of every team into the store
+        :param teams: the teams to store, team t is stored at index t
+        :complexity: Best and worst case complexity is O(n) where n is the number of teams
+        """
+        slots = len(teams) * self.MAX_TEAM_SIZE
+        self.num_teams = len(teams)
+        self.size = array('b', bytes(len(teams)))
+        self.species = array('b', bytes(slots))
+        self.poke_type = array('b', bytes(slots))
+        self.status = array('b', bytes(slots))
+        self.level = array('i', bytes(4 * slots))
+        self.hp = array('i', bytes(4 * slots))
+        self.max_hp = array('i', bytes(4 * slots))
+        for index, team in enumerate(teams):
+            self.load(index, team)
+
+    def load(self, index: int, team: PokeTeam) -> None:
+        """ Copies the pokemon of team into the slots of team index
+        :raises ValueError: if the team has more than MAX_TEAM_SIZE pokemon
+        :complexity: Best and worst case complexity is O(n) where n is the number of pokemon in the team
+        """
+        pokemon_list = team.snapshot()
+        if len(pokemon_list) > self.MAX_TEAM_SIZE:
+            raise ValueError("Number of pokemons exceeds team limit")
+        self.size[index] = len(pokemon_list)
+        slot = index * self.MAX_TEAM_SIZE
+        for pokemon in pokemon_list:
+            self.species[slot] = SPECIES_INDEX[pokemon.get_poke_name()]
+            self.poke_type[slot] = POKE_TYPE_INDEX[pokemon.poke_type]
+            self.status[slot] = STATUS_INDEX[pokemon.status]
+            self.level[slot] = pokemon.level
+            self.hp[slot] = pokemon.hp
+            self.max_hp[slot] = pokemon.max_hp
+            slot += 1
+
+    def pokemon(self, slot: int) -> PokemonBase:
+        """ returns a pokemon object with the state kept in a slot
+        :complexity: Best and worst case complexity is O(1)
+        """
+        pokemon = POKEMON_CLASSES[SPECIES_ORDER[self.species[slot]].name]()
+        pokemon.level = self.level[slot]
+        pokemon.hp = self.hp[slot]
+        pokemon.max_hp = self.max_hp[slot]
+        pokemon.status = STATUS_ORDER[self.status[slot]]
+        return pokemon
+
+    def get_speed(self, slot: int) -> int:
+        """ Speed of the pokemon in a slot, as Pokemon.get_speed
+        :complexity: Best and worst case complexity is O(1)
+        """
+        speed = SPECIES_ORDER[self.species[slot]].speed.at(self.level[slot])
+        return int(speed * MODIFIERS[self.status[slot]].speed_multiplier)
+
+    def attack(self, attacker: int, other: int, rng=RandomGen) -> None:
+        """ The pokemon in slot attacker attacks the one in slot other, as PokemonBase.attack
+        :param rng: the random stream to draw from, the global RandomGen by default
+        :complexity: Best and worst case complexity is O(1)
+        """
+        status = self.status
+        modifier = MODIFIERS[status[attacker]]
+        if modifier.skip_turn:
+            return
+        if modifier.confusion_chance and rng.random_chance(modifier.confusion_chance):
+            other = attacker
+
+        level = self.level
+        poke_type = self.poke_type
+        attacker_species = SPECIES_ORDER[self.species[attacker]]
+        other_species = SPECIES_ORDER[self.species[other]]
+        attack = attacker_species.attack.at(level[attacker]) * modifier.attack_multiplier
+        effective_attack = int(attack * TYPE_EFFECTIVENESS[poke_type[attacker]][poke_type[other]])
+        threshold = other_species.defence.at(level[other]) * other_species.threshold_scale + other_species.threshold_offset
+        self.hp[other] -= other_species.defend_rule(effective_attack, threshold)
+
+        if modifier.attack_hp_loss:
+            self.hp[attacker] -= modifier.attack_hp_loss
+
+        if rng.random_chance(0.2):
+            status[other] = INFLICTED[poke_type[attacker]]
+
+    def both_attack(self, first: int, second: int, rng=RandomGen) -> None:
+        """ Both pokemon attack each other, the faster one first, as Battle.both_attack
+        :param rng: the random stream to draw from, the global RandomGen by default
+        :complexity: Best and worst case complexity is O(1)
+        """
+        first_speed = self.get_speed(first)
+        second_speed = self.get_speed(second)
+        if first_speed > second_speed:
+            self.attack(first, second, rng)
+            if self.hp[second] > 0:
+                self.attack(second, first, rng)
+        elif second_speed > first_speed:
+            self.attack(second, first, rng)
+            if self.hp[first] > 0:
+                self.attack(first, second, rng)
+        else:
+            self.attack(first, second, rng)
+            self.attack(second, first, rng)
+
+    def level_up(self, slot: int) -> None:
+        """ Levels up the pokemon in a slot keeping the hp it has lost, as Pokemon.level_up
+        :complexity: Best and worst case complexity is O(1)
+        """
+        self.level[slot] += 1
+        new_max = SPECIES_ORDER[self.species[slot]].hp.at(self.level[slot])
+        self.hp[slot] = new_max - (self.max_hp[slot] - self.hp[slot])
+        self.max_hp[slot] = new_max
+
+    def evolve_if_ready(self, slot: int) -> None:
+        """ Replaces the pokemon in a slot by its evolved version if it should evolve, as Pokemon.get_evolved_version
+        :complexity: Best and worst case complexity is O(L) where L is the number of levels kept by the evolution
+        """
+        species = SPECIES_ORDER[self.species[slot]]
+        if species.evolves_into is None or self.level[slot] < species.evolve_level:
+            return
+        evolved = SPECIES[species.evolves_into]
+        hp_difference = self.max_hp[slot] - self.hp[slot]
+        level = self.level[slot]
+        self.species[slot] = SPECIES_INDEX[evolved.name]
+        self.poke_type[slot] = POKE_TYPE_INDEX[evolved.poke_type]
+        self.level[slot] = evolved.start_level
+        self.max_hp[slot] = evolved.start_hp
+        self.hp[slot] = evolved.start_hp - hp_difference
+        if species.evolve_keeps_level:
+            for _ in range(level - evolved.start_level):
+                self.level_up(slot)
+
+
+class SpeciesColumns:
+    """ The SPECIES tables as NumPy arrays, indexed by the species, type, status and level indices kept in a
+    TeamStore, so that the column kernel of BatchBattle looks up the stats of many pokemon at once.
+    """
+
+    def __init__(self) -> None:
+        """ Builds the arrays from the tables of every species
+        :complexity: Best and worst case complexity is O(S * K * L) where S is the number of species, K the
+                     number of status effects and L is Species.TABLE_LEVELS
+        """
+        levels = range(Species.TABLE_LEVELS)
+        species_list = SPECIES_ORDER
+        self.speed = np.array([[species.speed_table[status] for status in STATUS_ORDER] for species in species_list], dtype=np.int64)
+        self.attack = np.array([[species.attack_table[status] for status in STATUS_ORDER] for species in species_list], dtype=np.float64)
+        self.threshold = np.array([species.threshold_table for species in species_list], dtype=np.int64)
+        self.max_hp = np.array([[species.hp.at(level) for level in levels] for species in species_list], dtype=np.int64)
+        self.effectiveness = np.array(TYPE_EFFECTIVENESS, dtype=np.float64)
+        self.inflicted = np.array(INFLICTED, dtype=np.int8)
+
+        rules = [DEFEND_RULE_COLUMNS[species.defend_rule] for species in species_list]
+        self.above_multiplier = np.array([rule[0] for rule in rules], dtype=np.int64)
+        self.below_numerator = np.array([rule[1] for rule in rules], dtype=np.int64)
+        self.below_divisor = np.array([rule[2] for rule in rules], dtype=np.int64)
+        self.inclusive = np.array([rule[3] for rule in rules], dtype=bool)
+
+        self.skip_turn = np.array([modifier.skip_turn for modifier in MODIFIERS], dtype=bool)
+        self.confusion_chance = np.array([modifier.confusion_chance for modifier in MODIFIERS], dtype=np.float64)
+        self.attack_hp_loss = np.array([modifier.attack_hp_loss for modifier in MODIFIERS], dtype=np.int64)
+
+        # species that cannot evolve never reach their evolve level
+        self.evolve_level = np.array([Species.TABLE_LEVELS if species.evolves_into is None else species.evolve_level
+                                      for species in species_list], dtype=np.int64)
+        self.evolves_into = np.array([index if species.evolves_into is None else SPECIES_INDEX[species.evolves_into]
+                                      for index, species in enumerate(species_list)], dtype=np.int8)
+        self.keeps_level = np.array([species.evolve_keeps_level for species in species_list], dtype=bool)
+        self.start_level = np.array([species.start_level for species in species_list], dtype=np.int64)
+        self.poke_type = np.array([POKE_TYPE_INDEX[species.poke_type] for species in species_list], dtype=np.int8)
+
+
+SPECIES_COLUMNS = SpeciesColumns() if np is not None else None
+
+
+class BatchBattle:
+    """ Plays match m between teams1[m] and teams2[m] for every m, as Battle.battle would.
+
+    Every match draws from its own RandomStream, so match m plays as Battle.battle seeded like its
+    stream, whatever the other matches of the batch and whichever path plays it. Without given
+    streams, the streams are split from RandomGen, so a batch of one match plays as Battle.battle
+    under the seed RandomGen had.
+    """
+    # MOD is a power of 2, so the column kernel keeps the seeds below it with this mask
+    SEED_MASK = RandomStream.MOD - 1
+
+    def __init__(self, teams1: list[PokeTeam], teams2: list[PokeTeam], streams: list[RandomStream] = None,
+                 use_numpy: bool = True) -> None:
+        """ Stores both sides of every match and sends out their first pokemon
+        :param streams: the random stream of every match, split from RandomGen if None
+        :param use_numpy: if the column kernel plays the matches when NumPy is installed
+        :pre: teams1 and teams2 have the same length and every team is ALWAYS_ATTACK
+        :raises ValueError: if the team lists or the streams have different lengths, a team is not ALWAYS_ATTACK,
+                            or a pokemon has a level that could go past the levels of the species tables
+        :complexity: Best and worst case complexity is O(n) where n is the number of matches
+        """
+        if len(teams1) != len(teams2):
+            raise ValueError("Both team lists must have the same length.")
+        if streams is not None and len(streams) != len(teams1):
+            raise ValueError("Every match needs its own stream.")
+        for team in teams1 + teams2:
+            if team.ai_type != PokeTeam.AI.ALWAYS_ATTACK:
+                raise ValueError("Batch battles only support ALWAYS_ATTACK teams.")
+
+        # side s of match m is team 2 * m + s of the store
+        self.store = TeamStore([team for pair in zip(teams1, teams2) for team in pair])
+        # a pokemon levels up at most once per pokemon of the other team
+        if len(teams1) and max(self.store.level) + TeamStore.MAX_TEAM_SIZE >= Species.TABLE_LEVELS:
+            raise ValueError("Levels are too high for batch battles.")
+        sides = 2 * len(teams1)
+        self.num_matches = len(teams1)
+        self.streams = RandomGen.split(len(teams1)) if streams is None else streams
+        self.active = array('i', [-1]) * sides       # slot on the battlefield, -1 if none
+        self.taken = array('b', bytes(sides))        # number of pokemon retrieved from the team
+        self.remaining = array('b', self.store.size) # number of pokemon left in the team
+        self.returned = array('i', [-1]) * sides     # slot of the winner returned to its team, -1 if none
+        self.result = array('b', [-1]) * self.num_matches
+        self.running = []
+
+        remaining = self.remaining
+        for match in range(self.num_matches):
+            first, second = 2 * match, 2 * match + 1
+            if remaining[first] and remaining[second]:
+                self.retrieve(first)
+                self.retrieve(second)
+                self.running.append(match)
+            else:
+                self.finish(match)
+
+        self.columns = use_numpy and np is not None
+        if self.columns:
+            self.running = np.array(self.running, dtype=np.int64)
+            self.seeds = np.array([stream.seed for stream in self.streams], dtype=np.uint64)
+            store = self.store
+            # views sharing the memory of the arrays, so the scalar methods see what the kernel writes
+            self.hp, self.max_hp, self.level = (np.frombuffer(column, dtype=np.int32) for column in (store.hp, store.max_hp, store.level))
+            self.species, self.poke_type, self.status = (np.frombuffer(column, dtype=np.int8) for column in (store.species, store.poke_type, store.status))
+            self.active_column = np.frombuffer(self.active, dtype=np.int32)
+            self.taken_column, self.remaining_column = (np.frombuffer(column, dtype=np.int8) for column in (self.taken, self.remaining))
+            self.returned_column = np.frombuffer(self.returned, dtype=np.int32)
+            self.result_column = np.frombuffer(self.result, dtype=np.int8)
+
+    def retrieve(self, side: int) -> None:
+        """ Sends the next pokemon of a side onto the battlefield, or none if its team is empty
+        :complexity: Best and worst case complexity is O(1)
+        """
+        if self.remaining[side] == 0:
+            self.active[side] = -1
+            return
+        self.active[side] = (side * TeamStore.MAX_TEAM_SIZE) + self.taken[side]
+        self.taken[side] += 1
+        self.remaining[side] -= 1
+
+    def return_winner(self, side: int) -> None:
+        """ Returns the pokemon of a side that won the match to its team, clearing its status
+        :complexity: Best and worst case complexity is O(1)
+        """
+        slot = self.active[side]
+        self.store.status[slot] = NO_STATUS
+        self.returned[side] = slot
+        self.remaining[side] += 1
+        # the team now holds this pokemon, so it is not evolved on the battlefield any more
+        self.active[side] = -1
+
+    def finish(self, match: int) -> None:
+        """ Decides the result of a match from the teams that are left, as Battle.battle
+        :complexity: Best and worst case complexity is O(1)
+        """
+        first_empty = self.remaining[2 * match] == 0
+        second_empty = self.remaining[2 * match + 1] == 0
+        if first_empty and second_empty:
+            self.result[match] = 0
+        elif second_empty:
+            self.result[match] = 1
+        else:
+            self.result[match] = 2
+
+    def play_turn(self, match: int) -> bool:
+        """ Plays one turn of a match
+        :return: True if the match goes on, False once it has been decided
+        :complexity: Best and worst case complexity is O(1)
+        """
+        store = self.store
+        hp = store.hp
+        active = self.active
+        remaining = self.remaining
+        first, second = 2 * match, 2 * match + 1
+        carry_on = False
+
+        if hp[active[first]] <= 0:
+            self.retrieve(first)
+        if hp[active[second]] <= 0:
+            self.retrieve(second)
+        slot1, slot2 = active[first], active[second]
+
+        store.both_attack(slot1, slot2, self.streams[match])
+
+        if hp[slot1] > 0 and hp[slot2] > 0:
+            hp[slot1] -= 1
+            hp[slot2] -= 1
+            carry_on = hp[slot1] > 0 and hp[slot2] > 0
+
+        if hp[slot1] <= 0 and hp[slot2] > 0:
+            store.level_up(slot2)
+            if remaining[first] == 0:
+                self.return_winner(second)
+            if remaining[second] == 0:
+                carry_on = True
+        elif hp[slot2] <= 0 and hp[slot1] > 0:
+            store.level_up(slot1)
+            if remaining[second] == 0:
+                self.return_winner(first)
+            if remaining[first] == 0:
+                carry_on = True
+
+        for side in (first, second):
+            slot = active[side]
+            if slot != -1 and hp[slot] > 0:
+                store.evolve_if_ready(slot)
+
+        if (remaining[first] and remaining[second]) or carry_on:
+            return True
+        self.finish(match)
+        return False
+
+    def draw_chances(self, matches, ratio):
+        """ Draws the next number of the stream of every given match, as random_chance
+        :param matches: NumPy array of distinct matches
+        :param ratio: the chance, or a NumPy array with the chance of every match
+        :return: NumPy array of the result of every match
+        :complexity: Best and worst case complexity is O(n) where n is the number of matches, in NumPy operations
+        """
+        seeds = (self.seeds[matches] * np.uint64(RandomStream.A) + np.uint64(RandomStream.C)) & np.uint64(self.SEED_MASK)
+        self.seeds[matches] = seeds
+        return (seeds >> np.uint64(16)) / (1 << 32) < ratio
+
+    def attack_columns(self, matches, attacker, other) -> None:
+        """ In every given match, the pokemon in slot attacker attacks the one in slot other, as TeamStore.attack
+        :param matches: NumPy array of distinct matches
+        :param attacker: NumPy array of the slot of the attacker of every match
+        :param other: NumPy array of the slot of the pokemon attacked in every match
+        :complexity: Best and worst case complexity is O(n) where n is the number of matches, in NumPy operations
+        """
+        columns = SPECIES_COLUMNS
+        species, level, poke_type, hp = self.species, self.level, self.poke_type, self.hp
+        status = self.status[attacker]
+        awake = ~columns.skip_turn[status]
+        matches, attacker, other, status = matches[awake], attacker[awake], other[awake], status[awake]
+
+        chance = columns.confusion_chance[status]
+        confused = np.flatnonzero(chance > 0)
+        if len(confused):
+            attacks_itself = confused[self.draw_chances(matches[confused], chance[confused])]
+            other[attacks_itself] = attacker[attacks_itself]
+
+        attack = columns.attack[species[attacker], status, level[attacker]]
+        damage = (attack * columns.effectiveness[poke_type[attacker], poke_type[other]]).astype(np.int64)
+        defender = species[other]
+        threshold = columns.threshold[defender, level[other]]
+        reaches = (damage > threshold) | (columns.inclusive[defender] & (damage == threshold))
+        hp[other] -= np.where(reaches, damage * columns.above_multiplier[defender],
+                              damage * columns.below_numerator[defender] // columns.below_divisor[defender])
+        hp[attacker] -= columns.attack_hp_loss[status]
+
+        inflicts = self.draw_chances(matches, 0.2)
+        self.status[other[inflicts]] = columns.inflicted[poke_type[attacker[inflicts]]]
+
+    def retrieve_columns(self, sides) -> None:
+        """ Sends the next pokemon of every given side onto the battlefield, as retrieve
+        :complexity: Best and worst case complexity is O(n) where n is the number of sides, in NumPy operations
+        """
+        active, taken, remaining = self.active_column, self.taken_column, self.remaining_column
+        empty = remaining[sides] == 0
+        active[sides[empty]] = -1
+        sides = sides[~empty]
+        active[sides] = sides * TeamStore.MAX_TEAM_SIZE + taken[sides]
+        taken[sides] += 1
+        remaining[sides] -= 1
+
+    def return_winner_columns(self, sides) -> None:
+        """ Returns the pokemon of every given side to its team, as return_winner
+        :complexity: Best and worst case complexity is O(n) where n is the number of sides, in NumPy operations
+        """
+        slots = self.active_column[sides]
+        self.status[slots] = NO_STATUS
+        self.returned_column[sides] = slots
+        self.remaining_column[sides] += 1
+        self.active_column[sides] = -1
+
+    def level_up_columns(self, slots) -> None:
+        """ Levels up the pokemon in every given slot, as TeamStore.level_up
+        :complexity: Best and worst case complexity is O(n) where n is the number of slots, in NumPy operations
+        """
+        hp, max_hp, level = self.hp, self.max_hp, self.level
+        level[slots] += 1
+        new_max = SPECIES_COLUMNS.max_hp[self.species[slots], level[slots]]
+        hp[slots] = new_max - (max_hp[slots] - hp[slots])
+        max_hp[slots] = new_max
+
+    def evolve_columns(self, slots) -> None:
+        """ Evolves the pokemon in every given slot that should evolve, as TeamStore.evolve_if_ready.
+        Keeping the level is the same as levelling up the evolved pokemon, as the lost hp does not change.
+        :complexity: Best and worst case complexity is O(n) where n is the number of slots, in NumPy operations
+        """
+        columns = SPECIES_COLUMNS
+        slots = slots[self.level[slots] >= columns.evolve_level[self.species[slots]]]
+        species = self.species[slots]
+        evolved = columns.evolves_into[species]
+        lost = self.max_hp[slots] - self.hp[slots]
+        start_level = columns.start_level[evolved]
+        level = np.where(columns.keeps_level[species], np.maximum(self.level[slots], start_level), start_level)
+        self.species[slots] = evolved
+        self.poke_type[slots] = columns.poke_type[evolved]
+        self.level[slots] = level
+        self.max_hp[slots] = columns.max_hp[evolved, level]
+        self.hp[slots] = columns.max_hp[evolved, level] - lost
+
+    def finish_columns(self, matches) -> None:
+        """ Decides the result of every given match, as finish, and leaves its stream where the match left it
+        :complexity: Best and worst case complexity is O(n) where n is the number of matches
+        """
+        first_empty = self.remaining_column[2 * matches] == 0
+        second_empty = self.remaining_column[2 * matches + 1] == 0
+        self.result_column[matches] = np.where(first_empty & second_empty, 0, np.where(second_empty, 1, 2))
+        for match, seed in zip(matches.tolist(), self.seeds[matches].tolist()):
+            self.streams[match].seed = seed
+
+    def step_columns(self) -> int:
+        """ Plays one turn of every unfinished match at once, as play_turn, with one column operation per rule
+        :return: the number of matches that are still unfinished
+        :complexity: Best and worst case complexity is O(n) where n is the number of unfinished matches, in NumPy operations
+        """
+        running = self.running
+        if len(running) == 0:
+            return 0
+        hp, active, remaining = self.hp, self.active_column, self.remaining_column
+        first_sides = 2 * running
+        second_sides = first_sides + 1
+        for sides in (first_sides, second_sides):
+            self.retrieve_columns(sides[hp[active[sides]] <= 0])
+        first, second = active[first_sides], active[second_sides]
+
+        # the faster pokemon attacks first, the other one answers if it is alive or as fast
+        speed, species, status, level = SPECIES_COLUMNS.speed, self.species, self.status, self.level
+        first_speed = speed[species[first], status[first], level[first]]
+        second_speed = speed[species[second], status[second], level[second]]
+        second_faster = second_speed > first_speed
+        leader = np.where(second_faster, second, first)
+        follower = np.where(second_faster, first, second)
+        self.attack_columns(running, leader, follower)
+        answers = (first_speed == second_speed) | (hp[follower] > 0)
+        self.attack_columns(running[answers], follower[answers], leader[answers])
+
+        both_alive = (hp[first] > 0) & (hp[second] > 0)
+        hp[first[both_alive]] -= 1
+        hp[second[both_alive]] -= 1
+        carry_on = both_alive & (hp[first] > 0) & (hp[second] > 0)
+
+        # the pokemon that made the other one faint levels up, and goes back to its team if the other team is empty
+        second_won = (hp[first] <= 0) & (hp[second] > 0)
+        first_won = (hp[second] <= 0) & (hp[first] > 0)
+        for won, winner, winner_sides, loser_sides in ((second_won, second, second_sides, first_sides),
+                                                       (first_won, first, first_sides, second_sides)):
+            self.level_up_columns(winner[won])
+            self.return_winner_columns(winner_sides[won & (remaining[loser_sides] == 0)])
+            carry_on |= won & (remaining[winner_sides] == 0)
+
+        for sides in (first_sides, second_sides):
+            slots = active[sides]
+            slots = slots[slots != -1]
+            self.evolve_columns(slots[hp[slots] > 0])
+
+        going_on = ((remaining[first_sides] > 0) & (remaining[second_sides] > 0)) | carry_on
+        self.finish_columns(running[~going_on])
+        self.running = running[going_on]
+        return len(self.running)
+
+    def step(self) -> int:
+        """ Plays one turn of every unfinished match, all at once with NumPy, one match after the other otherwise
+        :return: the number of matches that are still unfinished
+        :complexity: Best and worst case complexity is O(n) where n is the number of unfinished matches
+        """
+        if self.columns:
+            return self.step_columns()
+        play_turn = self.play_turn
+        self.running = [match for match in self.running if play_turn(match)]
+        return len(self.running)
+
+    def run(self) -> array:
+        """ Plays every match to the end
+        :return: the result of every match (0 for a draw, 1 or 2 for the winning side), as Battle.battle
+        :complexity: Best and worst case complexity is O(n * T) where n is the number of matches and T the
+        number of turns of the longest match
+        """
+        while self.step():
+            pass
+        return self.result
+
+    def team_pokemon(self, match: int, side: int) -> list[PokemonBase]:
+        """ returns the pokemon left in a team after the match, the ones that were never sent out in
+        battle order, followed by the winner that was returned to the team
+        :param side: 1 for the first team of the match, 2 for the second one
+        :complexity: Best and worst case complexity is O(n) where n is the number of pokemon in the team
+        """
+        index = 2 * match + side - 1
+        start = index * TeamStore.MAX_TEAM_SIZE
+        slots = list(range(start + self.taken[index], start + self.store.size[index]))
+        if self.returned[index] != -1:
+            slots.append(self.returned[index])
+        return [self.store.pokemon(slot) for slot in slots]
@@ -0,0 +1,139 @@
+from random_gen import RandomGen
+from array_sorted_list import ArraySortedList
+from sorted_list import ListItem
+from tests.base_test import BaseTest
+
+class LegacySortedList:
+    """ Copy of the ArraySortedList algorithms from before the orientation flag, on a Python list"""
+
+    def __init__(self):
+        self.items = []
+        self.order = "increasing"
+
+    def bubble(self, out_of_order):
+        n = len(self.items)
+        for j in range(n - 1, 0, -1):
+            swapped = False
+            for i in range(j):
+                if out_of_order(self.items[i].key, self.items[i + 1].key):
+                    self.items[i], self.items[i + 1] = self.items[i + 1], self.items[i]
+                    swapped = True
+            if not swapped:
+                break
+
+    def add(self, item):
+        if self.order == "decreasing":
+            self.bubble(lambda a, b: a >= b)
+            index = -1
+            for i in range(len(self.items) - 1, -1, -1):
+                if item.key >= self.items[i].key:
+                    index = i
+                    break
+            self.items.insert(index + 1, item)
+            self.bubble(lambda a, b: a <= b)
+        else:
+            low, high = 0, len(self.items) - 1
+            while low <= high:
+                mid = (low + high) // 2
+                if self.items[mid].key < item.key:
+                    low = mid + 1
+                elif self.items[mid].key > item.key:
+                    high = mid - 1
+                else:
+                    low = mid
+                    break
+            self.items.insert(low, item)
+
+    def reverse_order(self):
+        if self.order == "increasing":
+            self.order = "decreasing"
+            self.bubble(lambda a, b: a <= b)
+        else:
+            self.order = "increasing"
+            self.bubble(lambda a, b: a >= b)
+
+
+class TestArraySortedList(BaseTest):
+
+    def test_reverse_order(self):
+        """Test that reversing flips the order in which the items are indexed"""
+        sorted_list = ArraySortedList(2)
+        for key in [5, 1, 3, 4]:
+            sorted_list.add(ListItem(str(key), key))
+        sorted_list.reverse_order()
+        self.assertEqual([sorted_list[i].key for i in range(len(sorted_list))], [5, 4, 3, 1])
+        sorted_list.add(ListItem("2", 2))
+        self.assertEqual(sorted_list.delete_at_index(0).key, 5)
+        self.assertEqual(sorted_list.index(sorted_list[3]), 3)
+        sorted_list.reverse_order()
+        self.assertEqual([sorted_list[i].key for i in range(len(sorted_list))], [1, 2, 3, 4])
+        self.assertRaises(IndexError, lambda: sorted_list.__setitem__(0, ListItem("9", 9)))
+
+    def test_ties_match_reference(self):
+        """Seeded differential test of adds, reversals and deletions with many ties against the bubble sort version"""
+        for seed in range(300):
+            RandomGen.set_seed(seed)
+            sorted_list = ArraySortedList(RandomGen.randint(1, 4))
+            reference = LegacySortedList()
+            for step in range(40):
+                operation = RandomGen.randint(0, 9)
+                if operation < 5:
+                    item = ListItem(step, RandomGen.randint(0, 3))
+                    sorted_list.add(item)
+                    reference.add(item)
+                elif operation < 7:
+                    sorted_list.reverse_order()
+                    reference.reverse_order()
+                elif len(reference.items) > 0:
+                    index = RandomGen.randint(0, len(reference.items) - 1) if operation == 9 else 0
+                    self.assertIs(sorted_list.delete_at_index(index), reference.items.pop(index))
+                self.assertEqual([sorted_list[i] for i in range(len(sorted_list))], reference.items, seed)
+                self.assertEqual(sorted_list.order, reference.order)
+
+    def test_from_items_matches_add(self):
+        """Test that bulk loading places every item, ties included, where adding them one by one would"""
+        for seed in range(200):
+            RandomGen.set_seed(seed)
+            items = [ListItem(i, RandomGen.randint(0, RandomGen.randint(0, 8))) for i in range(RandomGen.randint(0, 12))]
+            one_by_one = ArraySortedList(len(items))
+            for item in items:
+                one_by_one.add(item)
+            one_by_one.reverse_order()
+            loaded = ArraySortedList.from_items(items, "decreasing")
+            self.assertEqual([loaded[i] for i in range(len(loaded))], [one_by_one[i] for i in range(len(one_by_one))], seed)
+            loaded.add(ListItem(None, 4))
+            self.assertEqual(len(loaded), len(items) + 1)
+
+    def test_from_items_many_ties(self):
+        """Test that bulk loading long runs of equal keys, as the LV, DEF and HP criteria give, matches add"""
+        for seed, distinct in ((1, 1), (2, 3), (3, 10)):
+            RandomGen.set_seed(seed)
+            items = [ListItem(i, RandomGen.randint(1, distinct)) for i in range(600)]
+            one_by_one = ArraySortedList(1)
+            for item in items:
+                one_by_one.add(item)
+            loaded = ArraySortedList.from_items(items)
+            self.assertEqual([item.value for item in loaded], [item.value for item in one_by_one], seed)
+
+    def test_reset_from(self):
+        """Test that a list reset from its own items, in either order, is indexed as before"""
+        for order in ("increasing", "decreasing"):
+            sorted_list = ArraySortedList.from_items([ListItem(i, key) for i, key in enumerate([3, 1, 2, 2])], order)
+            items = list(sorted_list)
+            sorted_list.reset_from(items, order)
+            self.assertEqual(list(sorted_list), items)
+            self.assertEqual(sorted_list.order, order)
+            sorted_list.reset_from([ListItem(i, i) for i in range(8)])
+            self.assertEqual([item.key for item in sorted_list], list(range(8)))
+            self.assertRaises(ValueError, lambda: sorted_list.reset_from([ListItem(0, 2), ListItem(1, 1)]))
+
+    def test_merge(self):
+        """Test that merging keeps the keys sorted, the items of the first list before equal ones of the second"""
+        first = ArraySortedList.from_items([ListItem("a", key) for key in [1, 3, 3, 7]])
+        second = ArraySortedList.from_items([ListItem("b", key) for key in [0, 3, 8]], "decreasing")
+        merged = ArraySortedList.merge(first, second)
+        self.assertEqual([(merged[i].value, merged[i].key) for i in range(len(merged))],
+                         [("b", 0), ("a", 1), ("a", 3), ("a", 3), ("b", 3), ("a", 7), ("b", 8)])
+        first.reverse_order()
+        merged = ArraySortedList.merge(first, ArraySortedList(1))
+        self.assertEqual([merged[i].key for i in range(len(merged))], [7, 3, 3, 1])
@@ -1,6 +1,6 @@
 from random_gen import RandomGen
-from battle import Battle
-from poke_team import Criterion, PokeTeam
+from battle import Battle, BattleStats, LimitPolicy
+from poke_team import Action, Criterion, PokeTeam
 from pokemon import Bulbasaur, Charizard, Charmander, Eevee, Gastly, Haunter, Squirtle, Venusaur
 from tests.base_test import BaseTest
 
@@ -212,3 +212,126 @@ class TestBattle(BaseTest):
         self.assertEqual(len(remaining), 1)
         self.assertEqual(remaining[0].get_hp(), 6)
         self.assertIsInstance(remaining[0], Venusaur)
+
+
+    def test_action_precedence(self):
+        """
+        Test that the precedence table matches the precedence order SWAP, SPECIAL, HEAL, ATTACK
+        """
+        b = Battle(verbosity=0)
+        order = [Action.ATTACK, Action.HEAL, Action.SPECIAL, Action.SWAP]
+        actions1 = []
+        actions2 = []
+        for action1 in order:
+            for action2 in order:
+                if order.index(action1) == order.index(action2):
+                    expected = 0
+                elif order.index(action1) > order.index(action2):
+                    expected = 1
+                else:
+                    expected = 2
+                self.assertEqual(b.check_action_precedence(action1, action2), expected)
+                actions1.append(action1)
+                actions2.append(action2)
+        self.assertEqual(b.check_action_precedences(actions1, actions2),
+                         [b.check_action_precedence(a1, a2) for a1, a2 in zip(actions1, actions2)])
+        self.assertRaises(ValueError, lambda: b.check_action_precedences([Action.SWAP], []))
+
+    def test_both_teams_heal_until_max(self):
+        """
+        Test that both teams running out of heals on the same turn is a draw, and that neither heals a fourth time
+        """
+        RandomGen.set_seed(1)
+        team1 = PokeTeam("Ash", [1, 0, 0, 0, 0], 0, PokeTeam.AI.ALWAYS_ATTACK)
+        team2 = PokeTeam("Gary", [0, 1, 0, 0, 0], 0, PokeTeam.AI.ALWAYS_ATTACK)
+        team1.choose_battle_option = lambda my_pokemon, their_pokemon: Action.HEAL
+        team2.choose_battle_option = lambda my_pokemon, their_pokemon: Action.HEAL
+        b = Battle(verbosity=0)
+        self.assertEqual(b.battle(team1, team2), 0)
+        self.assertEqual(team1.num_of_heals, 0)
+        self.assertEqual(team2.num_of_heals, 0)
+
+    def test_custom_action_handler(self):
+        """
+        Test that a subclass can replace the handler of an action without changing the turn loop
+        """
+        class CountingBattle(Battle):
+            def __init__(self, verbosity=0) -> None:
+                Battle.__init__(self, verbosity)
+                self.attacks = 0
+
+            def attack_action(self, team, pokemon, other_pokemon):
+                self.attacks += 1
+                return Battle.attack_action(self, team, pokemon, other_pokemon)
+
+        RandomGen.set_seed(1337)
+        team1 = PokeTeam("Ash", [1, 1, 1, 0, 0], 0, PokeTeam.AI.ALWAYS_ATTACK)
+        team2 = PokeTeam("Gary", [0, 0, 0, 0, 3], 0, PokeTeam.AI.ALWAYS_ATTACK)
+        team2.choose_battle_option = lambda my_pokemon, their_pokemon: Action.SWAP
+        b = CountingBattle(verbosity=0)
+        self.assertEqual(b.battle(team1, team2), 1)
+        self.assertGreater(b.attacks, 0)
+
+    def test_battle_stats(self):
+        """
+        Test that collecting stats does not change the battle, and that the stats match test_basic_battle
+        """
+        b = Battle(verbosity=0)
+        self.assertIsNone(b.last_stats)
+        b.battle(PokeTeam("Ash", [1, 0, 0, 0, 0], 0, PokeTeam.AI.ALWAYS_ATTACK), PokeTeam("Gary", [0, 1, 0, 0, 0], 0, PokeTeam.AI.ALWAYS_ATTACK))
+        self.assertIsNone(b.last_stats)
+
+        RandomGen.set_seed(1337)
+        team1 = PokeTeam("Ash", [1, 1, 1, 0, 0], 0, PokeTeam.AI.ALWAYS_ATTACK)
+        team2 = PokeTeam("Gary", [0, 0, 0, 0, 3], 0, PokeTeam.AI.ALWAYS_ATTACK)
+        b = Battle(verbosity=0, collect_stats=True)
+        self.assertEqual(b.battle(team1, team2), 1)
+        stats = b.last_stats
+        self.assertIsInstance(stats, BattleStats)
+        self.assertEqual(stats.result, 1)
+        self.assertEqual(stats.turns, 7)
+        self.assertEqual(stats.actions[0][Action.ATTACK], 7)
+        self.assertEqual(stats.actions[1][Action.ATTACK], 7)
+        self.assertEqual([stats.swaps(1), stats.specials(1), stats.heals(1)], [0, 0, 0])
+        self.assertEqual(stats.faints, [1, 3])
+        self.assertEqual(stats.evolutions, [1, 0])
+        self.assertGreaterEqual(stats.elapsed, 0)
+
+    def test_turn_cap(self):
+        """
+        Test that a capped battle follows the limit policy and gives the pokemons on the field back to their teams
+        """
+        for policy, expected in ((LimitPolicy.DRAW, 0), (LimitPolicy.HP, 1)):
+            RandomGen.set_seed(1337)
+            team1 = PokeTeam("Ash", [1, 1, 1, 0, 0], 0, PokeTeam.AI.ALWAYS_ATTACK)
+            team2 = PokeTeam("Gary", [0, 0, 0, 0, 3], 0, PokeTeam.AI.ALWAYS_ATTACK)
+            b = Battle(verbosity=0, collect_stats=True, max_turns=2, limit_policy=policy)
+            self.assertEqual(b.battle(team1, team2), expected)
+            self.assertEqual(b.last_stats.turns, 2)
+            self.assertEqual(b.last_stats.ended_early, "turns")
+            self.assertEqual(len(team1.snapshot()), 3)
+            self.assertEqual(len(team2.snapshot()), 3 - b.last_stats.faints[1])
+
+        # a cap the battle does not reach changes nothing, test_basic_battle ends after 7 turns
+        RandomGen.set_seed(1337)
+        team1 = PokeTeam("Ash", [1, 1, 1, 0, 0], 0, PokeTeam.AI.ALWAYS_ATTACK)
+        team2 = PokeTeam("Gary", [0, 0, 0, 0, 3], 0, PokeTeam.AI.ALWAYS_ATTACK)
+        b = Battle(verbosity=0, collect_stats=True, max_turns=7)
+        self.assertEqual(b.battle(team1, team2), 1)
+        self.assertIsNone(b.last_stats.ended_early)
+        self.assertRaises(ValueError, lambda: Battle(max_turns=0))
+
+    def test_stall_detection(self):
+        """
+        Test that teams healing back to full hp every turn are stopped once the total hp stops changing
+        """
+        RandomGen.set_seed(1)
+        team1 = PokeTeam("Ash", [1, 0, 0, 0, 0], 0, PokeTeam.AI.ALWAYS_ATTACK)
+        team2 = PokeTeam("Gary", [0, 1, 0, 0, 0], 0, PokeTeam.AI.ALWAYS_ATTACK)
+        team1.choose_battle_option = lambda my_pokemon, their_pokemon: Action.HEAL
+        team2.choose_battle_option = lambda my_pokemon, their_pokemon: Action.HEAL
+        b = Battle(verbosity=0, collect_stats=True, stall_turns=1)
+        self.assertEqual(b.battle(team1, team2), 0)
+        self.assertEqual(b.last_stats.ended_early, "stall")
+        self.assertEqual(b.last_stats.turns, 2)
+        self.assertEqual(team1.num_of_heals, 1)
@@ -0,0 +1,37 @@
+from random_gen import RandomGen
+from bset import BSet
+from tests.base_test import BaseTest
+
+
+class TestBSet(BaseTest):
+
+    def test_matches_python_set(self):
+        """Seeded test of size, iteration and the in-place operations against python sets"""
+        RandomGen.set_seed(1054)
+        for _ in range(200):
+            items = [[RandomGen.randint(1, 80) for _ in range(RandomGen.randint(0, 12))] for _ in range(2)]
+            first, second = (BSet.from_iterable(values) for values in items)
+            expected_first, expected_second = (set(values) for values in items)
+            self.assertEqual(len(first), len(expected_first))
+            self.assertEqual(list(first), sorted(expected_first))
+
+            for operation in ["__ior__", "__iand__", "__isub__"]:
+                target = BSet.from_iterable(first)
+                result = getattr(target, operation)(second)
+                self.assertIs(result, target)
+                self.assertEqual(list(result), sorted(getattr(set(expected_first), operation)(expected_second)))
+            self.assertEqual(list(first), sorted(expected_first))
+
+    def test_operators_and_errors(self):
+        """Test the augmented assignment operators, the string form and the checks of from_iterable"""
+        s = BSet.from_iterable([1, 4])
+        t = BSet.from_iterable([4, 2, 2])
+        s |= t
+        self.assertEqual(str(s), "{1, 2, 4}")
+        s -= BSet.from_iterable([1])
+        self.assertEqual(str(s), "{2, 4}")
+        s &= BSet.from_iterable([4, 5])
+        self.assertEqual((str(s), len(s)), ("{4}", 1))
+        self.assertEqual((str(BSet()), len(BSet())), ("{}", 0))
+        self.assertRaises(TypeError, lambda: BSet.from_iterable([1, 0]))
+        self.assertRaises(TypeError, lambda: BSet.from_iterable(["1"]))
@@ -0,0 +1,43 @@
+from random_gen import RandomGen
+from leaderboard import Tally, leaderboard
+from poke_team import PokeTeam
+from tests.base_test import BaseTest
+
+def tally_of(results):
+    """ Tally of a list of match results"""
+    tally = Tally()
+    for result in results:
+        tally.add(result)
+    return tally
+
+
+class TestLeaderboard(BaseTest):
+
+    def test_tally_extend(self):
+        """Test that joining the tallies of two consecutive runs gives the tally of the whole run"""
+        RandomGen.set_seed(42)
+        for _ in range(100):
+            results = [RandomGen.randint(0, 2) for _ in range(RandomGen.randint(0, 12))]
+            whole = tally_of(results)
+            for split in range(len(results) + 1):
+                joined = tally_of(results[:split])
+                joined.extend(tally_of(results[split:]))
+                self.assertEqual(vars(joined), vars(whole), results)
+
+    def test_streak_across_draws(self):
+        """Test that draws do not break a streak, as in the sequential leaderboard"""
+        tally = tally_of([1, 1, 2, 1, 0, 1, 1, 0, 2, 1])
+        self.assertEqual((tally.won, tally.lost, tally.draw, tally.max_streak), (6, 2, 2, 3))
+        self.assertEqual(tally.played(), 10)
+
+    def test_parallel_reproducible(self):
+        """Test that the parallel leaderboard gives the same results for the same number of workers"""
+        def team():
+            return PokeTeam("Leaderboard", [1, 1, 1, 1, 1], 0, PokeTeam.AI.SWAP_ON_SUPER_EFFECTIVE)
+
+        first = leaderboard(workers=2, leaderboard_team=team(), num_teams=40)
+        second = leaderboard(workers=2, leaderboard_team=team(), num_teams=40)
+        self.assertEqual(first, second)
+        percentages = [float(row["value"][:-1]) for row in first[:3]]
+        self.assertAlmostEqual(sum(percentages), 100, places=1)
+        self.assertRaises(ValueError, lambda: leaderboard(workers=0, leaderboard_team=team()))
@@ -0,0 +1,58 @@
+from random_gen import RandomGen
+from linked_list import IndexedLinkedList
+from tests.base_test import BaseTest
+
+
+class TestIndexedLinkedList(BaseTest):
+
+    def test_matches_python_list(self):
+        """Seeded test of random inserts, deletions, reads, writes and searches against a python list"""
+        RandomGen.set_seed(2085)
+        linked = IndexedLinkedList()
+        expected = []
+        for _ in range(3000):
+            operation = RandomGen.randint(0, 5)
+            item = RandomGen.randint(0, 9)
+            if operation <= 1 or not expected:
+                index = RandomGen.randint(0, len(expected))
+                linked.insert(index, item)
+                expected.insert(index, item)
+            elif operation == 2:
+                index = RandomGen.randint(0, len(expected) - 1)
+                self.assertEqual(linked.delete_at_index(index), expected.pop(index))
+            elif operation == 3:
+                index = RandomGen.randint(0, len(expected) - 1)
+                linked[index] = item
+                expected[index] = item
+            elif operation == 4:
+                start = RandomGen.randint(0, len(expected) - 1)
+                if item in expected[start:]:
+                    self.assertEqual(linked.index(item, start), expected.index(item, start))
+                else:
+                    self.assertRaises(ValueError, lambda: linked.index(item, start))
+            else:
+                index = RandomGen.randint(0, len(expected) - 1)
+                self.assertEqual(linked[index], expected[index])
+            self.assertEqual(item in linked, item in expected)
+            self.assertEqual(len(linked), len(expected))
+        self.assertEqual([linked[i] for i in range(len(linked))], expected)
+        self.assertEqual([linked[i] for i in range(len(linked) - 1, -1, -1)], expected[::-1])
+
+    def test_errors_and_clear(self):
+        """Test the errors on bad positions and absent items, and that clear forgets every item"""
+        linked = IndexedLinkedList()
+        self.assertRaises(ValueError, lambda: linked.delete_at_index(0))
+        self.assertRaises(ValueError, lambda: linked.insert(1, "a"))
+        for item in "abca":
+            linked.append(item)
+        self.assertRaises(ValueError, lambda: linked[4])
+        self.assertRaises(ValueError, lambda: linked[-1])
+        self.assertRaises(ValueError, lambda: linked.index("d"))
+        self.assertRaises(ValueError, lambda: linked.index("b", 2))
+        linked.remove("a")
+        self.assertEqual(str(linked), "['b', 'c', 'a']")
+        linked.clear()
+        self.assertTrue(linked.is_empty())
+        self.assertFalse("a" in linked)
+        linked.append("d")
+        self.assertEqual((linked[0], linked.index("d")), ("d", 0))
@@ -0,0 +1,56 @@
+from matchup import MAX_BATTLES, MatchupEstimate, estimate_matchup, wilson_interval
+from poke_team import Criterion, PokeTeam
+from tests.base_test import BaseTest
+
+SPEC1 = ([1, 1, 1, 1, 1], 0, PokeTeam.AI.SWAP_ON_SUPER_EFFECTIVE, None)
+SPEC2 = ([0, 2, 2, 0, 2], 2, PokeTeam.AI.RANDOM, Criterion.HP)
+
+
+class TestMatchup(BaseTest):
+
+    def test_wilson_interval(self):
+        """Test the Wilson score interval against known values"""
+        low, high = wilson_interval(5, 10)
+        self.assertAlmostEqual(low, 0.2366, places=4)
+        self.assertAlmostEqual(high, 0.7634, places=4)
+        low, high = wilson_interval(0, 10)
+        self.assertEqual(low, 0)
+        self.assertAlmostEqual(high, 0.2775, places=4)
+        self.assertEqual(wilson_interval(0, 0), (0, 1))
+
+    def test_estimate_counts(self):
+        """Test that the counts of an estimate add up and give probabilities that sum to 1"""
+        estimate = MatchupEstimate()
+        for result in [1, 1, 2, 0, 1]:
+            estimate.add(result)
+        self.assertEqual((estimate.won, estimate.draw, estimate.lost, estimate.played()), (3, 1, 1, 5))
+        self.assertEqual(estimate.probabilities(), (0.6, 0.2, 0.2))
+        for (low, high), probability in zip(estimate.intervals(), estimate.probabilities()):
+            self.assertTrue(low <= probability <= high)
+        self.assertRaises(ValueError, lambda: MatchupEstimate().probabilities())
+
+    def test_reproducible(self):
+        """Test that the counts only depend on the seed and the number of battles, not on batches or workers"""
+        serial = estimate_matchup(SPEC1, SPEC2, battles=60, batch_size=60)
+        batched = estimate_matchup(SPEC1, SPEC2, battles=60, batch_size=7)
+        parallel = estimate_matchup(SPEC1, SPEC2, battles=60, batch_size=20, workers=2)
+        self.assertEqual(serial.played(), 60)
+        self.assertEqual(vars(serial), vars(batched))
+        self.assertEqual(vars(serial), vars(parallel))
+
+    def test_early_stop(self):
+        """Test that the estimate stops at the end of the first batch within the margin"""
+        estimate = estimate_matchup(SPEC1, SPEC2, battles=5000, margin=0.04, batch_size=50)
+        self.assertLess(estimate.played(), 5000)
+        self.assertEqual(estimate.played() % 50, 0)
+        self.assertLessEqual(estimate.margin(), 0.04)
+        shorter = estimate_matchup(SPEC1, SPEC2, battles=estimate.played() - 50, margin=0.04, batch_size=50)
+        self.assertGreater(shorter.margin(), 0.04)
+
+    def test_invalid(self):
+        """Test the arguments that cannot be estimated"""
+        user_spec = ([1, 0, 0, 0, 0], 0, PokeTeam.AI.USER_INPUT, None)
+        self.assertRaises(ValueError, lambda: estimate_matchup(SPEC1, user_spec))
+        self.assertRaises(ValueError, lambda: estimate_matchup(SPEC1, SPEC2, battles=0))
+        self.assertRaises(ValueError, lambda: estimate_matchup(SPEC1, SPEC2, battles=MAX_BATTLES + 1))
+        self.assertRaises(ValueError, lambda: estimate_matchup(SPEC1, SPEC2, workers=0))
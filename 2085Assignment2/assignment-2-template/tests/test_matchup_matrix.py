@@ -0,0 +1,69 @@
+import os
+import tempfile
+
+from matchup import MATCHUP_SEED, play_seeds
+from matchup_matrix import DATA_FILE, MAX_STREAMS, MatchupMatrix, all_specs, build_matrix, compositions, pair_seeds
+from poke_team import Criterion, PokeTeam
+from tests.base_test import BaseTest
+
+SPECS = [
+    ([1, 0, 0, 0, 0], 0, PokeTeam.AI.ALWAYS_ATTACK, None),
+    ([0, 2, 0, 0, 1], 1, PokeTeam.AI.SWAP_ON_SUPER_EFFECTIVE, None),
+    ([0, 0, 2, 1, 0], 2, PokeTeam.AI.RANDOM, Criterion.HP),
+]
+
+
+class TestMatchupMatrix(BaseTest):
+
+    def test_compositions(self):
+        """Test that every team of 1 to 6 pokemons is listed once"""
+        teams = compositions()
+        self.assertEqual(len(teams), 461)
+        self.assertEqual(len({tuple(team) for team in teams}), 461)
+        self.assertTrue(all(1 <= sum(team) <= 6 and len(team) == 5 for team in teams))
+        self.assertEqual(len(all_specs(max_pokemons=1)), 5 * (3 + 3 + 3 * 4))
+
+    def test_build_and_lookup(self):
+        """Test that the cells of a written matrix are the results of the seeded battles of each pair"""
+        with tempfile.TemporaryDirectory() as directory:
+            build_matrix(SPECS, directory, battles=8)
+            matrix = MatchupMatrix(directory)
+            self.assertEqual(len(matrix), 3)
+            for row, spec1 in enumerate(SPECS):
+                for column, spec2 in enumerate(SPECS):
+                    expected = play_seeds(spec1, spec2, pair_seeds(MATCHUP_SEED, row * 3 + column, 8))
+                    estimate = matrix.lookup(spec1, spec2)
+                    self.assertEqual((estimate.won, estimate.draw, estimate.lost), (expected.won, expected.draw, expected.lost))
+
+            team1 = PokeTeam("Ash", *SPECS[2])
+            team2 = PokeTeam("Gary", *SPECS[0])
+            self.assertEqual(matrix.expected(team1, team2), matrix.lookup(SPECS[2], SPECS[0]).probabilities())
+            # the criterion does not count outside battle mode 2
+            self.assertIn(([1, 0, 0, 0, 0], 0, PokeTeam.AI.ALWAYS_ATTACK, Criterion.LV), matrix)
+            self.assertNotIn(([1, 0, 0, 0, 0], 1, PokeTeam.AI.ALWAYS_ATTACK, None), matrix)
+            self.assertRaises(KeyError, lambda: matrix.lookup(SPECS[0], ([6, 0, 0, 0, 0], 0, PokeTeam.AI.RANDOM, None)))
+            matrix.close()
+
+    def test_parallel_build(self):
+        """Test that the matrix does not depend on the number of workers"""
+        with tempfile.TemporaryDirectory() as directory:
+            build_matrix(SPECS, os.path.join(directory, "serial"), battles=4)
+            build_matrix(SPECS, os.path.join(directory, "parallel"), battles=4, workers=2)
+            with open(os.path.join(directory, "serial", DATA_FILE), "rb") as serial, \
+                    open(os.path.join(directory, "parallel", DATA_FILE), "rb") as parallel:
+                self.assertEqual(serial.read(), parallel.read())
+
+    def test_invalid(self):
+        """Test the matrices that cannot be built or read"""
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertRaises(ValueError, lambda: build_matrix(SPECS, directory, battles=0))
+            # more battles than the substreams that fit in the period of RandomGen
+            self.assertRaises(ValueError, lambda: build_matrix(SPECS, directory, battles=MAX_STREAMS // 9 + 1))
+            self.assertRaises(ValueError, lambda: build_matrix(SPECS + SPECS[:1], directory))
+            self.assertRaises(ValueError, lambda: build_matrix([([1, 0, 0, 0, 0], 0, PokeTeam.AI.USER_INPUT, None)], directory))
+
+            build_matrix(SPECS[:2], directory, battles=1)
+            with open(os.path.join(directory, DATA_FILE), "ab") as data:
+                data.write(b"\0\0")
+            self.assertRaises(ValueError, lambda: MatchupMatrix(directory))
+
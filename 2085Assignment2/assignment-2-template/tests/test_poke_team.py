@@ -1,8 +1,32 @@
 from poke_team import Action, Criterion, PokeTeam
 from random_gen import RandomGen
+from battle import Battle
 from pokemon import Bulbasaur, Charizard, Charmander, Gastly, Squirtle, Eevee
+from stack_adt import ArrayStack
 from tests.base_test import BaseTest
 
+def legacy_special(team):
+    """ Copy of PokeTeam.special for battle modes 0 and 1 from before it worked in place """
+    if team.battle_mode == 0:
+        if len(team.team) > 1:
+            temp_stack = ArrayStack(len(team.team) - 2)
+            first_pokemon = team.team.pop()
+            while len(team.team) > 1:
+                temp_stack.push(team.team.pop())
+            last_pokemon = team.team.pop()
+            team.team.push(first_pokemon)
+            while len(temp_stack) > 0:
+                team.team.push(temp_stack.pop())
+            team.team.push(last_pokemon)
+
+    if team.battle_mode == 1:
+        half_number = len(team.team) // 2
+        temp_stack = ArrayStack(half_number)
+        for _ in range(half_number):
+            temp_stack.push(team.team.serve())
+        for _ in range(half_number):
+            team.team.append(temp_stack.pop())
+
 class TestPokeTeam(BaseTest):
 
     def test_random(self):
@@ -135,3 +159,91 @@ class TestPokeTeam(BaseTest):
         self.assertEqual(len(pokemon), len(expected_classes))
         for p, e in zip(pokemon, expected_classes):
             self.assertIsInstance(p, e)
+
+    def test_regenerate_in_place(self):
+        """Test that regenerating a team after battles restores it exactly as a fresh set_team would, reusing the same objects"""
+        def members(team):
+            items = [team.team.array[i] for i in range(len(team.team))]
+            return [item.value for item in items] if team.battle_mode == 2 else items
+
+        def layout(team):
+            container = team.team
+            if team.battle_mode == 2:
+                keys = [container.array[i].key for i in range(len(container))]
+                extra = container.order
+            else:
+                keys = [None] * len(container)
+                extra = (container.front, container.rear) if team.battle_mode == 1 else None
+            pokemon = [(type(p), p.level, p.hp, p.max_hp, p.status) for p in members(team)]
+            return list(zip(keys, pokemon)), extra, team.num_of_heals
+
+        for seed in range(100):
+            RandomGen.set_seed(seed)
+            teams = [PokeTeam.random_team(f"Team {i}", RandomGen.randint(0, 2), ai_mode=PokeTeam.AI(RandomGen.randint(1, 3)),
+                                          criterion=Criterion(RandomGen.randint(1, len(Criterion)))) for i in range(2)]
+            containers = [team.team for team in teams]
+            pokemon = [set(map(id, members(team))) for team in teams]
+            for _ in range(3):
+                Battle().battle(teams[0], teams[1])
+                for team in teams:
+                    team.regenerate_team()
+                    fresh = PokeTeam(team.team_name, team.team_numbers, team.battle_mode, team.ai_type, team.criterion)
+                    self.assertEqual(layout(team), layout(fresh), seed)
+            for team, container, ids in zip(teams, containers, pokemon):
+                self.assertIs(team.team, container)
+                self.assertEqual(set(map(id, members(team))), ids)
+
+    def test_special_matches_reference(self):
+        """Seeded test of the in place special against the old one on stacks and queues of every size, after
+        retrieving and returning pokemon so that queues wrap around and do not fill their arrays"""
+        def order(team):
+            positions = {id(team.roster[i]): i for i in range(team.num_of_pokemons)}
+            return [positions[id(team.retrieve_pokemon())] for _ in range(len(team.team))]
+
+        for seed in range(300):
+            RandomGen.set_seed(seed)
+            battle_mode = seed % 2
+            team_size = RandomGen.randint(1, 6)
+            steps = [(RandomGen.randint(0, 3), RandomGen.randint(0, 2)) for _ in range(RandomGen.randint(0, 12))]
+
+            orders = []
+            for special in (PokeTeam.special, legacy_special):
+                RandomGen.set_seed(seed)
+                team = PokeTeam.random_team("Cynthia", battle_mode, team_size=team_size)
+                for action, keep in steps:
+                    if action == 0:
+                        special(team)
+                    elif not team.is_empty():
+                        pokemon = team.retrieve_pokemon()
+                        if keep:
+                            team.return_pokemon(pokemon)
+                special(team)
+                orders.append(order(team))
+            self.assertEqual(orders[0], orders[1], seed)
+
+    def test_iteration_is_read_only(self):
+        """Test that iterating over a team, and printing it, follows the battle order without changing the team"""
+        def state(team):
+            container = team.team
+            slots = [container.array[i] for i in range(len(container.array))]
+            return slots, len(container), getattr(container, "front", None), getattr(container, "rear", None), getattr(container, "order", None)
+
+        for seed in range(60):
+            RandomGen.set_seed(seed)
+            team = PokeTeam.random_team("Cynthia", seed % 3, team_size=RandomGen.randint(1, 6), criterion=Criterion.SPD)
+            for _ in range(RandomGen.randint(0, 6)):
+                if RandomGen.random_chance(0.3):
+                    team.special()
+                elif not team.is_empty():
+                    pokemon = team.retrieve_pokemon()
+                    if RandomGen.random_chance(0.7):
+                        team.return_pokemon(pokemon)
+
+            before = state(team)
+            snapshot = team.snapshot()
+            self.assertEqual(list(team), snapshot)
+            self.assertEqual(str(team), "Cynthia (" + str(seed % 3) + "): [" + ", ".join(map(str, snapshot)) + "]")
+            self.assertEqual(state(team), before, seed)
+            retrieved = [team.retrieve_pokemon() for _ in range(len(team.team))]
+            self.assertEqual(retrieved, snapshot, seed)
+
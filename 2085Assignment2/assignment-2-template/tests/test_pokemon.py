@@ -1,5 +1,5 @@
-from pokemon import Blastoise, Bulbasaur, Charizard, Charmander, Eevee, Gastly, Gengar, Haunter, Squirtle, Venusaur
-from pokemon_base import StatusEffect
+from pokemon import Blastoise, Bulbasaur, Charizard, Charmander, Eevee, Gastly, Gengar, Haunter, Squirtle, Venusaur, POKEMON_CLASSES, SPECIES, Species
+from pokemon_base import StatusEffect, STATUS_MODIFIERS
 from tests.base_test import BaseTest
 
 class TestPokemon(BaseTest):
@@ -149,3 +149,56 @@ class TestPokemon(BaseTest):
 
         
 
+    def test_species_table(self):
+        """ Test that every species in the table has a class and evolves into a species of the same type"""
+        self.assertEqual(set(SPECIES), set(POKEMON_CLASSES))
+        for name, species in SPECIES.items():
+            pokemon = POKEMON_CLASSES[name]()
+            self.assertEqual(pokemon.get_poke_name(), name)
+            self.assertEqual(pokemon.get_level(), species.start_level)
+            self.assertEqual(pokemon.get_hp(), species.start_hp)
+            self.assertEqual(pokemon.can_evolve(), species.evolves_into is not None)
+            if species.evolves_into is not None:
+                self.assertEqual(SPECIES[species.evolves_into].poke_type, species.poke_type)
+            else:
+                self.assertIs(pokemon.get_evolved_version(), pokemon)
+
+    def test_stat_tables_match_formulas(self):
+        """ Test the tabled stats of every species and status against the formulas, past the last tabled level"""
+        for name, species in SPECIES.items():
+            pokemon = POKEMON_CLASSES[name]()
+            for level in range(species.start_level, Species.TABLE_LEVELS + 3):
+                pokemon.level = level
+                defence = species.defence.at(level)
+                threshold = defence * species.threshold_scale + species.threshold_offset
+                self.assertEqual(pokemon.get_defence(), defence)
+                for damage in (threshold - 1, threshold, threshold + 1):
+                    self.assertEqual(pokemon.defend(damage), species.defend_rule(damage, threshold))
+                for status, modifier in STATUS_MODIFIERS.items():
+                    pokemon.status = status
+                    speed = pokemon.get_speed()
+                    attack = pokemon.get_attack_damage()
+                    self.assertEqual((speed, type(speed)), (int(species.speed.at(level) * modifier.speed_multiplier), int))
+                    expected_attack = species.attack.at(level) * modifier.attack_multiplier
+                    self.assertEqual((attack, type(attack)), (expected_attack, type(expected_attack)))
+
+    def test_evolution_keeps_lost_hp(self):
+        """ Test that evolving keeps the hp lost, the status and for Gastly the level"""
+        c = Charmander()
+        c.level_up()
+        c.level_up()
+        c.lose_hp(4)
+        c.set_status_effect(StatusEffect.POISON)
+        self.assertTrue(c.should_evolve())
+        evolved = c.get_evolved_version()
+        self.assertIsInstance(evolved, Charizard)
+        self.assertEqual(evolved.get_hp(), 15 - 4)
+        self.assertEqual(evolved.get_status_effect(), StatusEffect.POISON)
+
+        g = Gastly()
+        g.level_up()
+        g.level_up()
+        h = g.get_evolved_version()
+        self.assertIsInstance(h, Haunter)
+        self.assertEqual(h.get_level(), 3)
+        self.assertEqual(h.get_hp(), 10)
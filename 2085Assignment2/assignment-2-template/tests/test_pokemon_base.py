@@ -1,8 +1,35 @@
 from random_gen import RandomGen
-from pokemon_base import PokemonBase, PokeType, StatusEffect
-from pokemon import Blastoise, Bulbasaur, Charmander, Eevee, Gastly, Gengar, Haunter, Squirtle, Venusaur
+from pokemon_base import PokemonBase, PokeType, StatusEffect, effective_multiplier, effective_multipliers
+from pokemon import Blastoise, Bulbasaur, Charizard, Charmander, Eevee, Gastly, Gengar, Haunter, Squirtle, Venusaur
 from tests.base_test import BaseTest
 
+def legacy_stat(pokemon, getter, status_name):
+    """ Stat of the pokemon computed with the string comparisons used before STATUS_MODIFIERS """
+    status = pokemon.status
+    pokemon.status = StatusEffect.NONE
+    stat = getter(pokemon)
+    pokemon.status = status
+    if status.value == status_name:
+        stat = stat * 0.5
+    return stat
+
+def legacy_attack(attacker, other):
+    """ Copy of PokemonBase.attack from before the status effects were table driven """
+    if attacker.status.value == "Sleep":
+        return
+    if attacker.status.value == "Confusion" and RandomGen.random_chance(0.5):
+        other = attacker
+    effective_attack = legacy_stat(attacker, type(attacker).get_attack_damage, "Burn") * attacker.get_effective_multiplier(other)
+    effective_attack = int(effective_attack)
+    other.lose_hp(other.defend(effective_attack))
+    if attacker.status.value == "Burn":
+        attacker.lose_hp(1)
+    elif attacker.status.value == "Poison":
+        attacker.lose_hp(3)
+    if RandomGen.random_chance(0.2):
+        other.status = attacker.get_inflict_status()
+
+
 class TestPokemonBase(BaseTest):
 
     def test_cannot_init(self):
@@ -130,3 +157,77 @@ class TestPokemonBase(BaseTest):
         self.assertEqual(str(b), "LV. 3 Blastoise: 21 HP")
 
 
+
+
+    def test_effective_multipliers(self):
+        """Test the type effectiveness matrix for single pairs and for vectors of pairs"""
+        # every pair that is not neutral (multiplier of 1)
+        expected = {
+            (PokeType.FIRE, PokeType.GRASS): 2,
+            (PokeType.FIRE, PokeType.WATER): 0.5,
+            (PokeType.GRASS, PokeType.FIRE): 0.5,
+            (PokeType.GRASS, PokeType.WATER): 2,
+            (PokeType.WATER, PokeType.FIRE): 2,
+            (PokeType.WATER, PokeType.GRASS): 0.5,
+            (PokeType.GHOST, PokeType.FIRE): 1.25,
+            (PokeType.GHOST, PokeType.GRASS): 1.25,
+            (PokeType.GHOST, PokeType.WATER): 1.25,
+            (PokeType.GHOST, PokeType.GHOST): 2,
+            (PokeType.GHOST, PokeType.NORMAL): 0,
+            (PokeType.NORMAL, PokeType.FIRE): 1.25,
+            (PokeType.NORMAL, PokeType.GRASS): 1.25,
+            (PokeType.NORMAL, PokeType.WATER): 1.25,
+            (PokeType.NORMAL, PokeType.GHOST): 0,
+        }
+        for (attacker, defender), multiplier in expected.items():
+            self.assertEqual(effective_multiplier(attacker, defender), multiplier)
+
+        attackers = [Charmander(), Bulbasaur(), Squirtle(), Gastly(), Eevee()]
+        attacker_types = []
+        defender_types = []
+        for attacker in attackers:
+            for defender in attackers:
+                self.assertEqual(attacker.get_effective_multiplier(defender),
+                                 expected.get((attacker.poke_type, defender.poke_type), 1))
+                attacker_types.append(attacker.poke_type)
+                defender_types.append(defender.poke_type)
+
+        self.assertEqual(effective_multipliers(attacker_types, defender_types),
+                         [effective_multiplier(a, d) for a, d in zip(attacker_types, defender_types)])
+        self.assertRaises(ValueError, lambda: effective_multipliers([PokeType.FIRE], []))
+
+
+    def test_status_effects_match_reference(self):
+        """Seeded differential test of the status effect table against the old string comparisons"""
+        species = [Charmander, Bulbasaur, Squirtle, Gastly, Eevee, Charizard, Venusaur, Blastoise, Haunter, Gengar]
+        statuses = list(StatusEffect)
+        for seed in range(300):
+            RandomGen.set_seed(seed)
+            kinds = [species[RandomGen.randint(0, len(species) - 1)] for _ in range(2)]
+            initial_statuses = [statuses[RandomGen.randint(0, len(statuses) - 1)] for _ in range(2)]
+            levels = [RandomGen.randint(0, 3) for _ in range(2)]
+
+            outcomes = []
+            for attack in (PokemonBase.attack, legacy_attack):
+                pair = [kind() for kind in kinds]
+                for pokemon, status, level in zip(pair, initial_statuses, levels):
+                    for _ in range(level):
+                        pokemon.level_up()
+                    pokemon.status = status
+                    self.assertEqual(pokemon.get_speed(), int(legacy_stat(pokemon, type(pokemon).get_speed, "Paralysis")))
+                    self.assertEqual(pokemon.get_attack_damage(), legacy_stat(pokemon, type(pokemon).get_attack_damage, "Burn"))
+
+                RandomGen.set_seed(seed)
+                states = []
+                for turn in range(6):
+                    attack(pair[turn % 2], pair[(turn + 1) % 2])
+                    states.append([(pokemon.get_hp(), pokemon.get_status_effect()) for pokemon in pair])
+                outcomes.append((states, RandomGen.random()))
+
+            self.assertEqual(outcomes[0], outcomes[1], seed)
+
+    def test_compact_instances(self):
+        """Test that pokemon keep their state in slots and not in a per instance dict"""
+        for pokemon in [Charmander(), Charizard(), Gastly().get_evolved_version()]:
+            self.assertFalse(hasattr(pokemon, "__dict__"))
+            self.assertRaises(AttributeError, lambda: setattr(pokemon, "nickname", "Sparky"))
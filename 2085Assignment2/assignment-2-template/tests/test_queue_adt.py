@@ -0,0 +1,71 @@
+from random_gen import RandomGen
+from queue_adt import CircularQueue, PairedCircularQueue
+from tests.base_test import BaseTest
+
+
+class TestCircularQueue(BaseTest):
+
+    def test_growable(self):
+        """Test that a growable queue keeps its order when it grows with its elements wrapped around"""
+        queue = CircularQueue(4, growable=True)
+        for i in range(3):
+            queue.append(i)
+        self.assertEqual(queue.serve_many(2), [0, 1])
+        for i in range(3, 20):
+            queue.append(i)
+        self.assertFalse(queue.is_full())
+        self.assertEqual(len(queue.array), 32)
+        self.assertEqual(queue.serve_many(len(queue)), list(range(2, 20)))
+
+    def test_bulk_matches_single(self):
+        """Seeded test of extend and serve_many, wrapping around a fixed array, against append and serve"""
+        RandomGen.set_seed(2085)
+        queue = CircularQueue(16)
+        expected = []
+        for step in range(500):
+            count = RandomGen.randint(0, 16 - len(expected)) if step % 2 else RandomGen.randint(0, len(expected))
+            if step % 2:
+                items = [RandomGen.random() for _ in range(count)]
+                queue.extend(items)
+                expected += items
+            else:
+                self.assertEqual(queue.serve_many(count), expected[:count])
+                expected = expected[count:]
+            self.assertEqual(len(queue), len(expected))
+        self.assertRaises(Exception, lambda: queue.extend([0] * (17 - len(queue))))
+        self.assertRaises(Exception, lambda: queue.serve_many(len(queue) + 1))
+
+    def test_reset_from(self):
+        """Test that a wrapped around queue reset from its own items serves them in the same order"""
+        queue = CircularQueue(5)
+        for i in range(4):
+            queue.append(i)
+        queue.serve_many(3)
+        queue.extend([4, 5, 6])
+        items = list(queue)
+        queue.reset_from(items)
+        self.assertEqual(queue.serve_many(len(items)), items)
+        self.assertRaises(Exception, lambda: queue.reset_from(list(range(6))))
+        growable = CircularQueue(1, growable=True)
+        growable.reset_from(list(range(6)))
+        self.assertEqual(list(growable), list(range(6)))
+
+        paired = PairedCircularQueue(3)
+        paired.append("a", 1)
+        paired.reset_from(["b", "c"], [2, 3])
+        self.assertEqual([paired.serve_pair(), paired.serve_pair()], [("b", 2), ("c", 3)])
+
+    def test_paired_values(self):
+        """Test that values travel with their elements through growth, bulk operations and rotation"""
+        queue = PairedCircularQueue(2, growable=True)
+        queue.append("a", 3)
+        queue.extend(["b", "c", "d"], [4, 5, 6])
+        self.assertEqual(queue.serve_pair(), ("a", 3))
+        queue.append("e", 7)
+        self.assertEqual(queue.serve_many(2), ["b", "c"])
+        self.assertEqual(list(queue), ["d", "e"])
+        self.assertEqual(queue.served_value, 5)
+        # rotating with serve and append keeps the values
+        for _ in range(len(queue)):
+            queue.append(queue.serve())
+        self.assertEqual([queue.serve_pair() for _ in range(len(queue))], [("d", 6), ("e", 7)])
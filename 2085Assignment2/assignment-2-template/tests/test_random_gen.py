@@ -0,0 +1,82 @@
+from array import array
+from random_gen import DEFAULT_STREAM, RandomGen, RandomStream
+from tests.base_test import BaseTest
+
+class TestRandomGen(BaseTest):
+
+    def test_instance_matches_class(self):
+        """Test that a stream produces the same numbers as the class seeded with the same value"""
+        RandomGen.set_seed(2085)
+        expected = [RandomGen.random() for _ in range(20)] + [RandomGen.randint(3, 9) for _ in range(20)] + \
+                   [RandomGen.random_chance(0.3) for _ in range(20)]
+        stream = RandomStream(2085)
+        actual = [stream.random() for _ in range(20)] + [stream.randint(3, 9) for _ in range(20)] + \
+                 [stream.random_chance(0.3) for _ in range(20)]
+        self.assertEqual(actual, expected)
+
+    def test_streams_are_independent(self):
+        """Test that drawing from a stream leaves the class and other streams untouched"""
+        RandomGen.set_seed(7)
+        first = RandomStream(7)
+        second = RandomStream(7)
+        for _ in range(10):
+            first.random()
+        self.assertEqual(DEFAULT_STREAM.seed, 7)
+        self.assertEqual(second.seed, 7)
+        second.set_seed(8)
+        reference = RandomStream(7)
+        for _ in range(10):
+            reference.random()
+        self.assertEqual(first.random(), reference.random())
+        self.assertEqual(second.random(), RandomStream(8).random())
+
+    def test_jump(self):
+        """Test that jumping ahead n numbers is the same as drawing them"""
+        for n in [0, 1, 2, 3, 10, 255, 1000]:
+            RandomGen.set_seed(n + 99)
+            for _ in range(n):
+                RandomGen.random()
+            expected = RandomGen.random()
+
+            RandomGen.set_seed(n + 99)
+            RandomGen.jump(n)
+            self.assertEqual(RandomGen.random(), expected, n)
+            stream = RandomStream(n + 99)
+            stream.jump(n)
+            self.assertEqual(stream.random(), expected, n)
+
+    def test_split(self):
+        """Test that split streams are consecutive blocks of the parent stream"""
+        stride = 5
+        sequence = RandomStream(12345)
+        expected = [sequence.random() for _ in range(4 * stride)]
+
+        parent = RandomStream(12345)
+        streams = parent.split(3, stride)
+        for i, stream in enumerate(streams):
+            self.assertEqual([stream.random() for _ in range(stride)], expected[i * stride:(i + 1) * stride])
+        self.assertEqual([parent.random() for _ in range(stride)], expected[3 * stride:])
+
+        RandomGen.set_seed(12345)
+        first, second = RandomGen.split(2)
+        skipped = RandomStream(12345)
+        skipped.jump(RandomGen.SPLIT_STRIDE)
+        self.assertEqual((first.random(), second.random()), (RandomStream(12345).random(), skipped.random()))
+        skipped.jump(RandomGen.SPLIT_STRIDE - 1)
+        self.assertEqual(RandomGen.random(), skipped.random())
+
+    def test_bulk_matches_scalar(self):
+        """Test that filling buffers gives the same numbers as the same number of scalar calls"""
+        for seed in [0, 1, 2085, (1 << 48) + 5]:
+            RandomGen.set_seed(seed)
+            expected = [RandomGen.random() for _ in range(50)], [RandomGen.randint(-3, 4) for _ in range(50)], \
+                       [int(RandomGen.random_chance(0.25)) for _ in range(50)], RandomGen.random()
+
+            RandomGen.set_seed(seed)
+            actual = list(RandomGen.fill(array('L', [0] * 50))), list(RandomGen.fill_randint(array('i', [0] * 50), -3, 4)), \
+                     list(RandomGen.fill_chance(array('b', [0] * 50), 0.25)), RandomGen.random()
+            self.assertEqual(actual, expected, seed)
+
+            stream = RandomStream(seed)
+            actual = stream.fill([0] * 50), stream.fill_randint([0] * 50, -3, 4), stream.fill_chance([0] * 50, 0.25), stream.random()
+            self.assertEqual(actual, expected, seed)
@@ -0,0 +1,83 @@
+import gc
+import weakref
+from ctypes import sizeof
+from referential_array import ArrayR
+from tests.base_test import BaseTest
+
+def array_of(values):
+    """ ArrayR holding the values"""
+    array = ArrayR(len(values))
+    for i, value in enumerate(values):
+        array[i] = value
+    return array
+
+
+class TestArrayR(BaseTest):
+
+    def setUp(self):
+        ArrayR.freelist.clear()
+        ArrayR.freelist_bytes = 0
+
+    tearDown = setUp
+
+    def test_move_block(self):
+        """Test that overlapping block moves in both directions behave like list slice assignment"""
+        for index, source_index, count in [(1, 0, 5), (0, 1, 5), (2, 2, 3), (0, 3, 3), (4, 0, 0)]:
+            values = list(range(6))
+            array = array_of(values)
+            array.move_block(index, source_index, count)
+            values[index:index + count] = values[source_index:source_index + count]
+            self.assertEqual([array[i] for i in range(len(array))], values)
+
+    def test_copy_block(self):
+        """Test copying blocks from another array and from a list"""
+        array = ArrayR(5)
+        array.copy_block(1, array_of(["a", "b", "c"]), 1, 2)
+        array.copy_block(3, ["x", "y"], 0, 2)
+        self.assertEqual([array[i] for i in range(len(array))], [None, "b", "c", "x", "y"])
+
+    def test_new_arrays_hold_none(self):
+        """Test that arrays of any length, including ones longer than any created before, start as None"""
+        for length in [1, 2, 7, 100, 5000, 3]:
+            array = ArrayR(length)
+            self.assertEqual(len(array), length)
+            self.assertEqual([array[i] for i in range(length)], [None] * length)
+        self.assertRaises(ValueError, lambda: ArrayR(0))
+
+    def test_release(self):
+        """Test that releasing an array frees what it referred to, that it cannot be used afterwards,
+        and that its space comes back cleared"""
+        class Thing:
+            pass
+
+        array = ArrayR(37)
+        things = [Thing() for _ in range(3)]
+        references = [weakref.ref(thing) for thing in things]
+        for i in range(len(array)):
+            array[i] = things[i % 3]
+        space = array.array
+        array.release()
+        del things
+        gc.collect()
+        self.assertEqual([reference() for reference in references], [None] * 3)
+        self.assertRaises(ValueError, lambda: array[0])
+        self.assertRaises(ValueError, lambda: len(array))
+        self.assertRaises(ValueError, lambda: ArrayR(1).copy_block(0, array, 0, 1))
+
+        reused = ArrayR(37)
+        self.assertIs(reused.array, space)
+        self.assertEqual([reused[i] for i in range(37)], [None] * 37)
+        array.release()
+        self.assertIsNot(ArrayR(37).array, space)
+
+    def test_freelist_limits(self):
+        """Test that the freelist keeps neither arrays longer than MAX_REUSED_LENGTH nor more than its byte limit"""
+        long_array = ArrayR(ArrayR.MAX_REUSED_LENGTH + 1)
+        long_array.release()
+        self.assertNotIn(ArrayR.MAX_REUSED_LENGTH + 1, ArrayR.freelist)
+
+        arrays = [ArrayR(ArrayR.MAX_REUSED_LENGTH) for _ in range(2 * ArrayR.FREELIST_BYTES // sizeof(ArrayR(ArrayR.MAX_REUSED_LENGTH).array))]
+        for array in arrays:
+            array.release()
+        self.assertLessEqual(ArrayR.freelist_bytes, ArrayR.FREELIST_BYTES)
+        self.assertEqual(ArrayR.freelist_bytes, sum(sizeof(space) for spaces in ArrayR.freelist.values() for space in spaces))
@@ -0,0 +1,119 @@
+from random_gen import RandomGen, RandomStream
+from battle import Battle
+from poke_team import Criterion, PokeTeam
+from pokemon import Gastly, Haunter
+import team_store
+from team_store import BatchBattle, TeamStore
+from tests.base_test import BaseTest
+
+def team_state(pokemon_list):
+    """ Comparable state of a list of pokemon, ignoring their order"""
+    return sorted((p.get_poke_name(), p.get_level(), p.get_hp(), p.max_hp, p.get_status_effect().value) for p in pokemon_list)
+
+def empty_team(team):
+    """ Retrieves every pokemon left in the team"""
+    pokemon_list = []
+    while not team.is_empty():
+        pokemon_list.append(team.retrieve_pokemon())
+    return pokemon_list
+
+
+class TestTeamStore(BaseTest):
+
+    def test_store_keeps_battle_order(self):
+        """Test that the store holds the pokemon of every team in the order they are retrieved"""
+        RandomGen.set_seed(11)
+        teams = [PokeTeam.random_team("Team", mode, criterion=Criterion.HP) for mode in range(3)]
+        store = TeamStore(teams)
+        for index, team in enumerate(teams):
+            order = team.snapshot()
+            self.assertEqual(store.size[index], len(order))
+            stored = [store.pokemon(index * TeamStore.MAX_TEAM_SIZE + i) for i in range(len(order))]
+            self.assertEqual([str(p) for p in stored], [str(p) for p in order])
+            self.assertEqual([str(p) for p in empty_team(team)], [str(p) for p in order])
+
+    def test_evolution_in_store(self):
+        """Test that evolving a stored pokemon keeps its lost hp and level like Pokemon.get_evolved_version"""
+        gastly = Gastly()
+        gastly.level_up()
+        gastly.lose_hp(2)
+        team = PokeTeam("Ghosts", [0, 0, 0, 1, 0], 1, PokeTeam.AI.ALWAYS_ATTACK)
+        team.team.serve()
+        team.team.append(gastly)
+        store = TeamStore([team])
+        store.evolve_if_ready(0)
+        evolved = gastly.get_evolved_version()
+        self.assertIsInstance(evolved, Haunter)
+        self.assertEqual(str(store.pokemon(0)), str(evolved))
+
+    def test_single_match_matches_battle(self):
+        """Seeded differential test of a batch of one match, with and without NumPy, against Battle.battle"""
+        for seed in range(300):
+            RandomGen.set_seed(seed)
+            teams = [PokeTeam.random_team("Team", RandomGen.randint(0, 2), ai_mode=PokeTeam.AI.ALWAYS_ATTACK,
+                                          criterion=Criterion(RandomGen.randint(1, len(Criterion)))) for _ in range(2)]
+
+            batch_states = []
+            for use_numpy in (True, False):
+                RandomGen.set_seed(seed)
+                batch = BatchBattle([teams[0]], [teams[1]], use_numpy=use_numpy)
+                result = batch.run()[0]
+                batch_states.append((result, [team_state(batch.team_pokemon(0, side)) for side in (1, 2)], batch.streams[0].random()))
+
+            RandomGen.set_seed(seed)
+            result = Battle().battle(teams[0], teams[1])
+            expected = (result, [team_state(empty_team(team)) for team in teams], RandomGen.random())
+            self.assertEqual(batch_states, [expected, expected], seed)
+
+    def test_many_matches(self):
+        """Test that a batch plays every match to a result and rejects teams it cannot play"""
+        RandomGen.set_seed(5)
+        teams1 = [PokeTeam.random_team("A", 0, ai_mode=PokeTeam.AI.ALWAYS_ATTACK) for _ in range(50)]
+        teams2 = [PokeTeam.random_team("B", 1, ai_mode=PokeTeam.AI.ALWAYS_ATTACK) for _ in range(50)]
+        batch = BatchBattle(teams1, teams2)
+        self.assertEqual(batch.step(), len(batch.running))
+        results = batch.run()
+        self.assertEqual(len(results), 50)
+        self.assertTrue(all(result in (0, 1, 2) for result in results))
+        self.assertEqual(batch.step(), 0)
+
+        self.assertRaises(ValueError, lambda: BatchBattle(teams1, teams2[1:]))
+        random_team = PokeTeam("C", [1, 0, 0, 0, 0], 0, PokeTeam.AI.RANDOM)
+        self.assertRaises(ValueError, lambda: BatchBattle([random_team], [teams2[0]]))
+
+    def test_streams_per_match(self):
+        """Test that a match with its own stream plays as Battle.battle seeded with that stream, whatever the batch"""
+        RandomGen.set_seed(77)
+        pairs = [[PokeTeam.random_team("Team", RandomGen.randint(0, 2), ai_mode=PokeTeam.AI.ALWAYS_ATTACK,
+                                       criterion=Criterion.LV) for _ in range(2)] for _ in range(30)]
+        streams = RandomStream(77).split(len(pairs))
+        seeds = [stream.seed for stream in streams]
+        results = BatchBattle([pair[0] for pair in pairs], [pair[1] for pair in pairs], streams).run()
+        self.assertRaises(ValueError, lambda: BatchBattle(pairs[0], pairs[1], streams))
+
+        if team_store.np is not None:
+            self.assertTrue(BatchBattle(pairs[0][:1], pairs[1][:1]).columns)
+        for pair, seed, result in zip(pairs, seeds, results):
+            for team in pair:
+                team.regenerate_team()
+            RandomGen.set_seed(seed)
+            self.assertEqual(Battle().battle(pair[0], pair[1]), result)
+
+    def test_columns_match_one_at_a_time(self):
+        """Seeded differential test of the NumPy column kernel against the matches played one at a time"""
+        if team_store.np is None:
+            self.skipTest("NumPy is not installed")
+        RandomGen.set_seed(2085)
+        pairs = [[PokeTeam.random_team("Team", RandomGen.randint(0, 2), ai_mode=PokeTeam.AI.ALWAYS_ATTACK,
+                                       criterion=Criterion(RandomGen.randint(1, len(Criterion)))) for _ in range(2)] for _ in range(500)]
+        pairs.append([PokeTeam("Empty", [0, 0, 0, 0, 0], 0, PokeTeam.AI.ALWAYS_ATTACK), pairs[0][1]])
+        states = []
+        for use_numpy in (True, False):
+            streams = RandomStream(2085).split(len(pairs))
+            batch = BatchBattle([pair[0] for pair in pairs], [pair[1] for pair in pairs], streams, use_numpy)
+            self.assertEqual(batch.columns, use_numpy)
+            results = list(batch.run())
+            states.append((results, [[team_state(batch.team_pokemon(match, side)) for side in (1, 2)] for match in range(len(pairs))],
+                           [stream.seed for stream in streams]))
+        self.assertEqual(states[0], states[1])
+        self.assertEqual(len(BatchBattle([], []).run()), 0)
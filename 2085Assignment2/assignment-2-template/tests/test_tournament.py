@@ -211,6 +211,31 @@ class TestTournament(BaseTest):
         self.assertTrue(str(team2).startswith("Can"))
 
 
+    def test_bracket_bookkeeping(self):
+        """Test which teams meet, with scripted results, in brackets where the next battle is before,
+        at and after the previous one"""
+        class ScriptedBattle:
+            def __init__(self, results):
+                self.results = iter(results)
+
+            def battle(self, team1, team2):
+                return next(self.results)
+
+        cases = [
+            ("A B C D + + +", [2, 1, 2], ["C D", "B D", "A B"]),
+            ("A B + C D E + + + F +", [1, 2, 1, 2, 1], ["A B", "D E", "C E", "A C", "C F"]),
+            ("A B + C + D + E F + +", [2, 2, 1, 1, 2], ["A B", "B C", "C D", "E F", "C E"]),
+        ]
+        for tournament_str, results, expected in cases:
+            t = Tournament(ScriptedBattle(results))
+            t.set_battle_mode(0)
+            t.start_tournament(tournament_str)
+            games = []
+            while (game := t.advance_tournament()) is not None:
+                games.append(game[0].team_name + " " + game[1].team_name)
+            self.assertEqual(games, expected, tournament_str)
+            self.assertEqual(len(t.tournament_list), 1)
+
     # Test linked_list_with_metas
     def test_metas_1(self):
         RandomGen.set_seed(2468)
@@ -283,4 +308,4 @@ class TestTournament(BaseTest):
             team1, team2, types = l[x]
             self.assertEqual(expected[x], types)
 
-       
\ No newline at end of file
+       
\ No newline at end of file
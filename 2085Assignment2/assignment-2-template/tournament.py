@@ -9,7 +9,7 @@ __author__ = "Scaffold by Jackson Goerner, Code by ______________"
 
 from poke_team import PokeTeam
 from battle import Battle
-from linked_list import LinkedList
+from linked_list import LinkedList, IndexedLinkedList
 from battle import Battle
 
 class Tournament:
@@ -18,7 +18,9 @@ class Tournament:
         '''Constructor for the Tournament class'''
         self.teams = None
         self.battle_mode = None
-        self.tournament_list = LinkedList()
+        self.tournament_list = IndexedLinkedList()
+        # position from which to look for the next "+", no "+" is ever before it
+        self.search_start = 0
 
         if battle is None:
             self.battle = Battle()
@@ -37,11 +39,11 @@ class Tournament:
     def is_valid_tournament(self, tournament_str: str) -> bool:
         '''Checks if the tournament string input represents a valid tournament . Return 
         True if valid, False otherwise.
-        :complexity: O(N*Index) where N is the size of the input (tournament_str) '''
+        :complexity: O(N) where N is the size of the input (tournament_str), excluding the string concatenations '''
         str_split_postfix = tournament_str.split()
 
         # The teams present before converting to infix
-        postfix_operands = LinkedList() 
+        postfix_operands = IndexedLinkedList()
 
         s = LinkedList()
 
@@ -64,7 +66,7 @@ class Tournament:
         str_split_infix = result_infix.split()
 
         # The teams present after converting the tournament_str to infix 
-        infix_operands = LinkedList()
+        infix_operands = IndexedLinkedList()
 
         # Insert the teams present after converting the tournament_str to infix
         for i in str_split_infix:
@@ -86,9 +88,10 @@ class Tournament:
         '''Start a valid tournament by generating random PokeTeams with the names following
         the tournament str (postfix) given 
         :raises TypeError : if the input is not of a string type
-        :complexity : O(N*(Index) + M*Index + N*M*(Index))
+        :complexity : O(N + M*R)
         where N is the size of input tournament str
-        where M is the size of the team_names or self.teams'''      
+        where M is the size of the team_names or self.teams
+        where R is the complexity of generating a random team'''      
         if not type(tournament_str) == str :
             raise TypeError("A string is expected for tournament_str")
 
@@ -96,8 +99,9 @@ class Tournament:
         if self.is_valid_tournament(tournament_str) :
             tournament_str_split = tournament_str.split()
 
-            self.teams = LinkedList()
-            team_names = LinkedList()
+            self.teams = IndexedLinkedList()
+            team_names = IndexedLinkedList()
+            self.search_start = 0
 
             # Retrieve the names of the poketeams given in the tournament_str and insert them into team_names
             for i in tournament_str_split :
@@ -109,24 +113,25 @@ class Tournament:
                 poke_team = PokeTeam.random_team(team_names[j],self.battle_mode)
                 self.teams.insert(len(self.teams),poke_team)
 
+            # The first poketeam with each name
+            teams_by_name = {}
+            for j in range(len(self.teams)):
+                teams_by_name.setdefault(self.teams[j].team_name, self.teams[j])
+
             # Insert the poketeam instances into the tournament_list in the same format as the tournament_str
             for i in range(len(tournament_str_split)):
-                for j in range(len(self.teams)):
-                    if tournament_str_split[i] == self.teams[j].team_name :
-                        self.tournament_list.insert(i,self.teams[j])
-                        break
-                else:
-                    self.tournament_list.insert(i,tournament_str_split[i])
+                self.tournament_list.insert(i, teams_by_name.get(tournament_str_split[i], tournament_str_split[i]))
 
     
     def advance_tournament(self) -> tuple[PokeTeam, PokeTeam, int] | None:
         '''Simulates one battle of the tournament, following the order of the previously given
         tournament string
-        :complexity: O(B + P + Index)'''
+        :complexity: O(B + D) where B is the complexity of a battle and D is the distance from the previous "+" to this one'''
  
-        # Locate the position of the "+"
+        # Locate the position of the "+". Everything before the previous "+" is a poketeam, and only the
+        # winner took its place, so the search resumes next to the last battle
         try: 
-            index = self.tournament_list.index("+")
+            index = self.tournament_list.index("+", self.search_start)
         except ValueError: 
             return None # return None if no more "+" in the tournament_list. Tournament ended
         else:
@@ -138,10 +143,11 @@ class Tournament:
             # Remove the poketeam that lost from the tournament_list
             if result == 1 :
                 self.tournament_list.delete_at_index(index)
-                self.tournament_list.remove(poketeam2)
+                self.tournament_list.delete_at_index(index-1)
             elif result == 2:
                 self.tournament_list.delete_at_index(index)
-                self.tournament_list.remove(poketeam1)
+                self.tournament_list.delete_at_index(index-2)
+            self.search_start = max(index-1, 0)
 
             return (poketeam1,poketeam2,result)
 
@@ -159,14 +165,14 @@ class Tournament:
     def linked_list_with_metas(self) -> LinkedList[tuple[PokeTeam, PokeTeam, list[str]]]:
         '''Seach for poketypes of pokemons that are not present in both the teams in the current battle but exist in the 
         poketeams that have lost before them in the tournament.
-        :complexity: O(M*(N+(J*K*Index)+(K*N)))   where M is the total number of matches played 
+        :complexity: O(M*(N+(J*K)+(K*N)))   where M is the total number of matches played 
                               where N is the size of the team_numbers
                               where J is the size of the battleHistory linkedList
                               where K is size of the temp linkedList '''
         l = LinkedList()
 
         # Store all the teams that lost in the tournament
-        battleHistory = LinkedList()
+        battleHistory = IndexedLinkedList()
 
         while True:
             res = self.advance_tournament()
@@ -179,7 +185,9 @@ class Tournament:
 
 
             # Poketype not present in both the teams battling
-            poketype_not_present_both_teams = BSet()
+            # 1 represents FIRE, 2 GRASS, 3 WATER, 4 GHOST and 5 NORMAL
+            poketype_not_present_both_teams = BSet.from_iterable(
+                i + 1 for i in range(len(team1.team_numbers)) if team1.team_numbers[i] == 0 and team2.team_numbers[i] == 0)
 
             # Poketype present in the teams that lost 
             poketype_present_team_lost = BSet()
@@ -187,20 +195,7 @@ class Tournament:
             
             list_str = []
 
-            for i in range(len(team1.team_numbers)):
-                if team1.team_numbers[i] == 0 and team2.team_numbers[i] == 0:
-                    if i == 0 :
-                        poketype_not_present_both_teams.add(1)  # 1 represents FIRE
-                    elif i == 1 :
-                        poketype_not_present_both_teams.add(2)  # 2 represents GRASS
-                    elif i == 2 :
-                        poketype_not_present_both_teams.add(3)  # 3 represents WATER
-                    elif i == 3 :
-                        poketype_not_present_both_teams.add(4)  # 4 represents GHOST
-                    elif i == 4 :
-                        poketype_not_present_both_teams.add(5)  # 5 represents NORMAL
-
-            temp = LinkedList()
+            temp = IndexedLinkedList()
             temp.insert(0,team1)
             temp.insert(1,team2)
 
@@ -217,21 +212,12 @@ class Tournament:
 
             # Find the poketypes present in the teams that lost 
             for i in range(len(temp)):
-                for j in range(len(temp[i].team_numbers)) :
-                    if temp[i].team_numbers[j] != 0 :
-                        if j == 0 :
-                            poketype_present_team_lost.add(1)
-                        elif j == 1 :
-                            poketype_present_team_lost.add(2)
-                        elif j == 2 :
-                            poketype_present_team_lost.add(3)
-                        elif j == 3 :
-                            poketype_present_team_lost.add(4)
-                        elif j == 4 :
-                            poketype_present_team_lost.add(5)
+                team_numbers = temp[i].team_numbers
+                poketype_present_team_lost |= BSet.from_iterable(j + 1 for j in range(len(team_numbers)) if team_numbers[j] != 0)
 
             # Poketype not present in both the teams battling but present in the teams that lost 
-            result = poketype_not_present_both_teams.intersection(poketype_present_team_lost)
+            result = poketype_not_present_both_teams
+            result &= poketype_present_team_lost
 
             if (1 in result):
                 list_str.append("FIRE")
@@ -3,7 +3,7 @@ from typing import Tuple
 
 from poke_team import PokeTeam
 from battle import Battle
-from queue_adt import CircularQueue
+from queue_adt import PairedCircularQueue
 from random_gen import RandomGen
 
 __author__ = "Scaffold by Jackson Goerner and code by Shyam Kamalesh Borkar"
@@ -28,7 +28,6 @@ class BattleTower:
         self.battle = battle
         self.fighting_team = None
         self.teams = None
-        self.teams_lives = None
 
     def set_my_team(self, team: PokeTeam) -> None:
         """ Sets the team that is going to battle through the tower.
@@ -53,40 +52,37 @@ class BattleTower:
         elif n <= 0:
             raise ValueError("An integer greater than zero (0) is expected for number of teams to generate.")
 
-        self.teams = CircularQueue(n)
-        self.teams_lives = CircularQueue(n)
+        # the teams, each paired with its lives
+        self.teams = PairedCircularQueue(n)
         for i in range(n):
             team_name = "Team " + str(i)
             battle_mode = RandomGen.randint(0, 1)
             random_team = PokeTeam.random_team(team_name, battle_mode)
             lives = RandomGen.randint(2, 10)
-            self.teams.append(random_team)
-            self.teams_lives.append(lives)
+            self.teams.append(random_team, lives)
 
     def __iter__(self) -> BattleTowerIterator:
         """ Magic method that returns a seperate iterator class to iterate 
         through the battle tower.
         :complexity: Best and worst case complexity is O(1)
         """
-        return BattleTowerIterator(self.battle, self.fighting_team, self.teams, self.teams_lives)
+        return BattleTowerIterator(self.battle, self.fighting_team, self.teams)
     
 
 """ Class for creating an iterator for the Battle Tower.
 """
 class BattleTowerIterator:
 
-    def __init__(self, battle: Battle, fighting_team: PokeTeam, teams: CircularQueue, teams_lives: CircularQueue) -> None:
+    def __init__(self, battle: Battle, fighting_team: PokeTeam, teams: PairedCircularQueue) -> None:
         """ Method that initialises the BattleTowerIterator
         :param battle: a battle object
         :param fighting_team: the team that will fight through the tower
-        :param teams: the teams in the tower 
-        :param teams_lives: the lives of the respective teams in the tower
+        :param teams: the teams in the tower, each paired with its lives
         :complexity: Best and worst case complexity is O(1)
         """
         self.battle = battle
         self.fighting_team = fighting_team
         self.teams = teams
-        self.teams_lives = teams_lives
         self.prev_res = 0
 
     def __iter__(self) -> BattleTowerIterator:
@@ -107,8 +103,7 @@ class BattleTowerIterator:
         if len(self.teams) == 0 or self.prev_res == 2:
             raise StopIteration
         
-        tower_team = self.teams.serve()
-        lives = self.teams_lives.serve()
+        tower_team, lives = self.teams.serve_pair()
 
         # Regenerate both teams
         self.fighting_team.regenerate_team()
@@ -128,8 +123,7 @@ class BattleTowerIterator:
         
         # add tower team back into the tower if they have lives left
         if lives != 0:
-            self.teams.append(tower_team)
-            self.teams_lives.append(lives)
+            self.teams.append(tower_team, lives)
     
         result = (res, me, other, lives)
 
@@ -148,8 +142,7 @@ class BattleTowerIterator:
         """
         tower_length = len(self.teams)
         for i in range(tower_length):
-            team = self.teams.serve()
-            lives = self.teams_lives.serve()
+            team, lives = self.teams.serve_pair()
             team_numbers = team.get_team_numbers()
             duplicate = False
 
@@ -161,8 +154,7 @@ class BattleTowerIterator:
             
             # add team back to the tower if they are not duplicate
             if not duplicate:
-                self.teams.append(team)
-                self.teams_lives.append(lives)
+                self.teams.append(team, lives)
             
 
     def sort_by_lives(self):